@@ -32,6 +32,7 @@
 
 from dll_sentinel import DLLSentinel
 from adjacency_matrix_graph import AdjacencyMatrixGraph
+from csr_graph import CSRGraph
 
 
 class Edge:
@@ -74,7 +75,7 @@ class Edge:
 
 class AdjacencyListGraph:
 
-	def __init__(self, card_V, directed=True, weighted=False):
+	def __init__(self, card_V, directed=True, weighted=False, edge_index=False):
 		"""Initialize a graph implemented by an adjacency list. Vertices are
 		numbered from 0, so that adj_list[i] corresponds to adjacency list of vertex i.
 
@@ -82,6 +83,9 @@ class AdjacencyListGraph:
 		card_V -- number of vertices in this graph
 		directed -- boolean indicating whether the graph is directed
 		weighted -- boolean indicating whether edges are weighted
+		edge_index -- boolean indicating whether to keep, for each vertex, a dictionary
+		from neighbours to linked-list nodes, so that has_edge, find_edge and
+		delete_edge take O(1) expected time instead of searching the adjacency list
 		"""
 		self.directed = directed
 		self.weighted = weighted
@@ -89,9 +93,72 @@ class AdjacencyListGraph:
 		for i in range(card_V):
 			# Each adjacency list is implemented as a linked list.
 			self.adj_lists[i] = DLLSentinel(get_key_func=Edge.get_v)  # will be a list of Edge objects
+		if edge_index:
+			# edge_index[u][v] is the node holding edge (u, v) in u's adjacency list.
+			self.edge_index = [{} for i in range(card_V)]
+		else:
+			self.edge_index = None
 		self.card_V = card_V
 		self.card_E = 0
 
+	@staticmethod
+	def from_edge_list(card_V, edges, directed=True, weighted=False, on_duplicate="error", edge_index=False):
+		"""Build a graph from a list of edges in a single pass, without a duplicate check per insertion.
+
+		Arguments:
+		card_V -- number of vertices in the graph
+		edges -- iterable of (u, v) pairs, or of (u, v, weight) triples for a weighted graph
+		directed -- boolean indicating whether the graph is directed
+		weighted -- boolean indicating whether edges are weighted
+		on_duplicate -- what to do when an edge appears more than once (in either
+		direction, for an undirected graph): "error" raises a RuntimeError, "first" or
+		"last" keeps the first or last occurrence, "min" or "max" keeps the occurrence
+		with the minimum or maximum weight
+		edge_index -- passed on to the constructor
+
+		Returns:
+		The graph.  Edges appear in each adjacency list in the order of their first occurrence.
+		"""
+		if on_duplicate not in ("error", "first", "last", "min", "max"):
+			raise RuntimeError("Unknown on_duplicate policy " + str(on_duplicate) + ".")
+		if not weighted and on_duplicate in ("min", "max"):
+			raise RuntimeError("Policy " + on_duplicate + " needs a weighted graph.")
+
+		# Map each edge, normalized so that u <= v in an undirected graph, to its weight.
+		# Python dictionaries keep insertion order, so edges keep their first position.
+		unique = {}
+		for edge in edges:
+			if weighted:
+				if len(edge) != 3:
+					raise RuntimeError("Inserting unweighted edge " + str(tuple(edge)) + " in weighted graph.")
+				u, v, weight = edge
+			else:
+				if len(edge) != 2:
+					raise RuntimeError("Inserting weighted edge " + str(tuple(edge)) + " in unweighted graph.")
+				u, v = edge
+				weight = None
+			if not directed:
+				if u == v:
+					raise RuntimeError("Cannot insert self-loop (" + str(u) + ", " + str(v) + ") into undirected graph")
+				if v < u:
+					u, v = v, u
+			key = (u, v)
+			if key not in unique:
+				unique[key] = weight
+			elif on_duplicate == "error":
+				raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
+			elif on_duplicate == "last" or (on_duplicate == "min" and weight < unique[key]) \
+					or (on_duplicate == "max" and weight > unique[key]):
+				unique[key] = weight
+
+		G = AdjacencyListGraph(card_V, directed, weighted, edge_index)
+		for (u, v), weight in unique.items():
+			G._append_edge(u, v, weight)
+			if not directed:
+				G._append_edge(v, u, weight)
+		G.card_E = len(unique)
+		return G
+
 	def get_card_V(self):
 		"""Return the number of vertices in this graph."""
 		return self.card_V
@@ -138,7 +205,7 @@ class AdjacencyListGraph:
 		# Cannot insert multiple edges between two vertices.
 		if self.has_edge(u, v):
 			raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
-		self.adj_lists[u].append(Edge(v, weight))
+		self._append_edge(u, v, weight)
 		self.card_E += 1
 
 		# If this graph is undirected, insert an edge from v to u.
@@ -146,11 +213,23 @@ class AdjacencyListGraph:
 			# Cannot insert multiple edges between two vertices.
 			if self.has_edge(v, u):
 				raise RuntimeError("An edge (" + str(v) + ", " + str(u) + ") already exists.")
-			self.adj_lists[v].append(Edge(u, weight))
+			self._append_edge(v, u, weight)
+
+	def _append_edge(self, u, v, weight):
+		"""Append edge (u, v) to u's adjacency list without any checks, keeping the edge index up to date."""
+		node = self.adj_lists[u].append(Edge(v, weight))
+		if self.edge_index is not None:
+			self.edge_index[u][v] = node
+
+	def _find_node(self, u, v):
+		"""Return the linked-list node holding edge (u, v), or None if (u, v) is not in this graph."""
+		if self.edge_index is not None:
+			return self.edge_index[u].get(v)
+		return self.adj_lists[u].search(v)
 
 	def find_edge(self, u, v):
 		"""Return the edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
-		edge = self.adj_lists[u].search(v)
+		edge = self._find_node(u, v)
 		if edge is None:
 			return None
 		else:
@@ -163,22 +242,31 @@ class AdjacencyListGraph:
 	def delete_edge(self, u, v, delete_undirected=True):
 		"""Delete edge (u, v) if it exists.  No error if it does not exist.
 			Delete both directions if the graph is undirected and delete_undirected is True."""
-		edge = self.adj_lists[u].search(v)
+		edge = self._find_node(u, v)
 		if edge is not None:
 			self.adj_lists[u].delete(edge)
+			if self.edge_index is not None:
+				del self.edge_index[u][v]
 			self.card_E -= 1
 
 		if not self.directed and delete_undirected:
-			edge = self.adj_lists[v].search(u)
+			edge = self._find_node(v, u)
 			if edge is not None:
 				self.adj_lists[v].delete(edge)
+				if self.edge_index is not None:
+					del self.edge_index[v][u]
 
 	def copy(self):
 		"""Return a copy of this graph."""
-		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.edge_index is not None)
 		copy.card_E = self.card_E
 		for u in range(self.card_V):
 			copy.adj_lists[u] = self.adj_lists[u].copy()
+			if copy.edge_index is not None:
+				x = copy.adj_lists[u].sentinel.next
+				while x is not copy.adj_lists[u].sentinel:
+					copy.edge_index[u][x.data.get_v()] = x
+					x = x.next
 		return copy
 
 	def get_edge_list(self):
@@ -217,6 +305,24 @@ class AdjacencyListGraph:
 				matrix.insert_edge(u, edge.get_v(), weight_func(edge))
 		return matrix
 
+	def to_csr(self):
+		"""Return a read-only compressed-sparse-row copy of this graph, keeping the
+		order of every adjacency list."""
+		offsets = [0] * (self.card_V + 1)
+		targets = []
+		weights = [] if self.weighted else None
+		for u in range(self.card_V):
+			for edge in self.get_adj_list(u):
+				targets.append(edge.get_v())
+				if self.weighted:
+					weights.append(edge.get_weight())
+			offsets[u + 1] = len(targets)
+		return CSRGraph(self.card_V, offsets, targets, weights, self.directed, self.card_E)
+
+	def freeze(self):
+		"""Return a read-only compressed-sparse-row copy of this graph.  Same as to_csr."""
+		return self.to_csr()
+
 	def __str__(self):
 		"""Return the adjacency lists formatted as a string."""
 		return self.strmap()
@@ -311,3 +417,26 @@ if __name__ == "__main__":
 	# Test transpose.
 	xpose1 = graph1.transpose()
 	print(xpose1)
+
+	# Edge index.
+	graph4 = AdjacencyListGraph(10, False, False, edge_index=True)
+	for u, v in graph2.get_edge_list():
+		graph4.insert_edge(u, v)
+	print(sorted(graph4.get_edge_list()) == sorted(graph2.get_edge_list()))
+	try:
+		graph4.insert_edge(*graph2.get_edge_list()[0])
+	except RuntimeError as e:
+		print(e)
+	graph5 = graph4.copy()
+	graph5.delete_edge(*graph2.get_edge_list()[0])
+	print(graph4.get_card_E(), graph5.get_card_E(), graph5.has_edge(*graph2.get_edge_list()[0]))
+
+	# Bulk construction, keeping the minimum weight of duplicate edges.
+	edges = [(0, 1, 5), (1, 2, 3), (1, 0, 2), (2, 3, 7), (3, 2, 9)]
+	graph6 = AdjacencyListGraph.from_edge_list(4, edges, False, True, on_duplicate="min")
+	print(graph6)
+	print(graph6.get_card_E())
+	try:
+		AdjacencyListGraph.from_edge_list(4, edges, False, True)
+	except RuntimeError as e:
+		print(e)
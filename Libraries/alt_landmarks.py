@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# alt_landmarks.py
+
+"""A* search with landmarks and the triangle inequality (ALT).
+
+For a landmark L, the triangle inequality gives two lower bounds on the
+shortest-path weight from v to t:  dist(L, t) - dist(L, v) and
+dist(v, L) - dist(t, L).  Taking the largest bound over all landmarks gives a
+feasible A* heuristic, so that repeated queries against the same graph settle
+far fewer vertices than Dijkstra's algorithm.  A query computes the bound of
+a vertex only when the search first reaches it, in O(k) time.  The distance
+tables are computed once with dijkstra and can be saved and loaded with NumPy,
+together with a checksum of the graph, so that tables for a network that has
+since changed are not loaded by mistake."""
+
+import hashlib
+from heapq import heappush, heappop
+import numpy as np
+from csr_graph import CSRGraph
+from dijkstra import dijkstra
+from single_source_shortest_paths import initialize_single_source
+
+# Version number stored with saved landmark tables.
+FORMAT_VERSION = 2
+
+
+def graph_checksum(G):
+	"""Return a SHA-256 hex digest of the edges and weights of G, which does not
+	depend on the order of the adjacency lists."""
+	csr = G if isinstance(G, CSRGraph) else G.to_csr()
+	sources, targets = csr.get_sources().astype(np.int64), csr.get_targets().astype(np.int64)
+	order = np.lexsort((targets, sources))
+	digest = hashlib.sha256()
+	digest.update(np.array([csr.get_card_V(), int(csr.is_directed())], dtype=np.int64).tobytes())
+	digest.update(sources[order].tobytes())
+	digest.update(targets[order].tobytes())
+	if csr.is_weighted():
+		digest.update(np.asarray(csr.get_weights(), dtype=np.float64)[order].tobytes())
+	return digest.hexdigest()
+
+
+class LandmarkIndex:
+
+	def __init__(self, G, landmarks, from_landmarks, to_landmarks):
+		"""Initialize a landmark index.  Usually built by build_landmark_index or load_landmark_index.
+
+		Arguments:
+		G -- the weighted graph the tables were computed for
+		landmarks -- array of landmark vertices
+		from_landmarks -- k x card_V array; from_landmarks[i, v] is the shortest-path
+		weight from landmark i to v
+		to_landmarks -- k x card_V array; to_landmarks[i, v] is the shortest-path
+		weight from v to landmark i.  Same array as from_landmarks if G is undirected.
+		"""
+		self.G = G
+		self.landmarks = np.asarray(landmarks)
+		self.from_landmarks = from_landmarks
+		self.to_landmarks = to_landmarks
+		# The same tables by vertex, so that the k distances of one vertex are contiguous.
+		self.from_by_vertex = np.ascontiguousarray(from_landmarks.T)
+		self.to_by_vertex = np.ascontiguousarray(to_landmarks.T)
+
+	def get_landmarks(self):
+		"""Return the array of landmark vertices."""
+		return self.landmarks
+
+	def lower_bounds(self, t):
+		"""Return a list giving, for every vertex v, a lower bound on the shortest-path weight
+		from v to t.  Takes O(k V) time; alt_query computes bounds only as it needs them."""
+		with np.errstate(invalid='ignore'):
+			from_bounds = self.from_landmarks[:, t, None] - self.from_landmarks
+			to_bounds = self.to_landmarks - self.to_landmarks[:, t, None]
+		# Infinity minus infinity gives nan, and such a landmark tells nothing.
+		from_bounds[np.isnan(from_bounds)] = -np.inf
+		to_bounds[np.isnan(to_bounds)] = -np.inf
+		return np.maximum(from_bounds.max(axis=0), to_bounds.max(axis=0)).clip(min=0).tolist()
+
+	def lower_bound(self, v, t):
+		"""Return a lower bound on the shortest-path weight from v to t."""
+		return self._bound(v, self.from_by_vertex[t].tolist(), self.to_by_vertex[t].tolist())
+
+	def _bound(self, v, from_t, to_t):
+		"""Return the lower bound on the shortest-path weight from v to t, given the lists
+		from_t and to_t of the distances from the landmarks to t and from t to them.
+		With only k values, a Python loop is faster than NumPy."""
+		bound = 0
+		# Infinity minus infinity gives nan, which compares false and so tells nothing.
+		for x, y in zip(from_t, self.from_by_vertex[v].tolist()):
+			if x - y > bound:
+				bound = x - y
+		for x, y in zip(self.to_by_vertex[v].tolist(), to_t):
+			if x - y > bound:
+				bound = x - y
+		return bound
+
+	def alt_query(self, s, t):
+		"""Find a shortest path from s to t with A* search guided by the landmark bounds.
+
+		Arguments:
+		s -- index of the source vertex
+		t -- index of the target vertex
+
+		Returns:
+		d -- list of distances; d[t] is the shortest-path weight from s to t,
+		infinity if t is unreachable
+		pi -- list of predecessors, so that following pi from t leads back to s
+		"""
+		G = self.G
+		d, pi = initialize_single_source(G, s)
+		finished = [False] * G.get_card_V()
+
+		from_t, to_t = self.from_by_vertex[t].tolist(), self.to_by_vertex[t].tolist()
+		h = {}  # bounds of the vertices reached so far
+		h[s] = self._bound(s, from_t, to_t)
+		if h[s] == float('inf'):  # a landmark proves that t is unreachable
+			return d, pi
+
+		heap = [(h[s], s)]
+		while len(heap) > 0:
+			f_u, u = heappop(heap)
+			if finished[u]:
+				continue
+			finished[u] = True
+			if u == t:
+				break
+			for edge in G.get_adj_list(u):
+				v = edge.get_v()
+				d_v = d[u] + edge.get_weight()
+				if d_v < d[v]:
+					d[v] = d_v
+					pi[v] = u
+					if v not in h:
+						h[v] = self._bound(v, from_t, to_t)
+					heappush(heap, (d_v + h[v], v))
+		return d, pi
+
+	def save(self, filename):
+		"""Save the landmark tables to a NumPy .npz file, with a checksum of the graph."""
+		np.savez(filename, version=FORMAT_VERSION, card_V=self.G.get_card_V(), card_E=self.G.get_card_E(),
+				 directed=self.G.is_directed(), checksum=graph_checksum(self.G), landmarks=self.landmarks,
+				 from_landmarks=self.from_landmarks, to_landmarks=self.to_landmarks)
+
+
+def choose_landmarks(G, k, start=0):
+	"""Choose k landmarks by farthest selection: each new landmark is the vertex whose
+	shortest-path weight to the nearest landmark chosen so far is largest.
+
+	Arguments:
+	G -- a weighted graph
+	k -- number of landmarks
+	start -- vertex from which to find the first landmark
+
+	Returns:
+	landmarks -- list of k landmark vertices
+	from_landmarks -- k x card_V array of shortest-path weights from each landmark
+	"""
+	card_V = G.get_card_V()
+	k = min(k, card_V)
+	landmarks = []
+	from_landmarks = np.empty((k, card_V))
+	nearest = np.array(dijkstra(G, start)[0], dtype=float)
+	for i in range(k):
+		# Prefer reachable vertices, so that the landmarks lie in the same component.
+		reachable = np.where(np.isinf(nearest), -1, nearest)
+		if i > 0:
+			reachable[landmarks] = -1
+		landmark = int(np.argmax(reachable))
+		landmarks.append(landmark)
+		from_landmarks[i] = dijkstra(G, landmark)[0]
+		nearest = from_landmarks[i] if i == 0 else np.minimum(nearest, from_landmarks[i])
+	return landmarks, from_landmarks
+
+
+def build_landmark_index(G, k=8, G_transpose=None):
+	"""Choose k landmarks and compute the distance tables for ALT queries.
+
+	Arguments:
+	G -- a weighted graph with nonnegative weights
+	k -- number of landmarks
+	G_transpose -- optional transpose of a directed G.  Computed if omitted.
+
+	Returns:
+	A LandmarkIndex
+	"""
+	landmarks, from_landmarks = choose_landmarks(G, k)
+	if G.is_directed():
+		if G_transpose is None:
+			G_transpose = G.transpose()
+		# Distances to a landmark in G are distances from it in the transpose.
+		to_landmarks = np.array([dijkstra(G_transpose, landmark)[0] for landmark in landmarks], dtype=float)
+	else:
+		to_landmarks = from_landmarks
+	return LandmarkIndex(G, landmarks, from_landmarks, to_landmarks)
+
+
+def load_landmark_index(G, filename):
+	"""Load landmark tables saved by LandmarkIndex.save for graph G.
+
+	Raises a RuntimeError if the file was saved for a different graph: one of another
+	shape, or with any edge or weight changed.
+	"""
+	with np.load(filename) as data:
+		if int(data["version"]) != FORMAT_VERSION:
+			raise RuntimeError("Unsupported landmark file version " + str(int(data["version"])) + ".")
+		if int(data["card_V"]) != G.get_card_V() or int(data["card_E"]) != G.get_card_E() \
+				or bool(data["directed"]) != G.is_directed():
+			raise RuntimeError("Landmark file " + str(filename) + " was built for a different graph.")
+		if str(data["checksum"]) != graph_checksum(G):
+			raise RuntimeError("Landmark file " + str(filename) + " was built before the graph changed.")
+		from_landmarks = data["from_landmarks"]
+		to_landmarks = from_landmarks if not G.is_directed() else data["to_landmarks"]
+		return LandmarkIndex(G, data["landmarks"], from_landmarks, to_landmarks)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import os
+	import tempfile
+	from generate_random_graph import generate_random_graph
+
+	for directed in [False, True]:
+		card_V = 300
+		graph1 = generate_random_graph(card_V, 0.02, True, directed, True, 1, 14)
+		index = build_landmark_index(graph1, 6)
+		print("Landmarks:", index.get_landmarks())
+
+		# ALT queries agree with Dijkstra's algorithm.
+		all_equal = True
+		for s in range(0, card_V, 17):
+			dijkstra_d, dijkstra_pi = dijkstra(graph1, s)
+			for t in range(0, card_V, 11):
+				if index.lower_bound(s, t) > dijkstra_d[t]:
+					print("Bound too large for pair", s, t)
+					all_equal = False
+				if index.alt_query(s, t)[0][t] != dijkstra_d[t]:
+					print("Distance mismatch for pair", s, t)
+					all_equal = False
+		print(("Directed" if directed else "Undirected") + ": ALT distances are " +
+			  ("not " if not all_equal else "") + "equal")
+
+		# Save and reload.
+		filename = os.path.join(tempfile.mkdtemp(), "landmarks.npz")
+		index.save(filename)
+		loaded = load_landmark_index(graph1, filename)
+		print(loaded.alt_query(0, card_V - 1)[0][card_V - 1] == index.alt_query(0, card_V - 1)[0][card_V - 1])
+		try:
+			load_landmark_index(generate_random_graph(card_V, 0.01, True, directed, True, 1, 14), filename)
+		except RuntimeError as e:
+			print(e)
+		# A changed weight with the same number of edges is caught too.
+		u = next(u for u in range(card_V) if len(list(graph1.get_adj_list(u))) > 0)
+		edge = next(iter(graph1.get_adj_list(u)))
+		changed = graph1.copy()
+		changed.find_edge(u, edge.get_v()).set_weight(edge.get_weight() + 1)
+		try:
+			load_landmark_index(changed, filename)
+		except RuntimeError as e:
+			print(e)
+
+	# Repeated queries on the London Underground, with bounds computed as needed.
+	from time import perf_counter
+	from london_underground import load_london_underground
+	stations, G = load_london_underground()
+	index = build_landmark_index(G, 8)
+	pairs = [(s, (s * 37 + 11) % G.get_card_V()) for s in range(0, G.get_card_V(), 3)]
+	start = perf_counter()
+	for s, t in pairs:
+		index.alt_query(s, t)
+	alt_time = (perf_counter() - start) / len(pairs)
+	start = perf_counter()
+	for s, t in pairs:
+		dijkstra(G, s, t)
+	dijkstra_time = (perf_counter() - start) / len(pairs)
+	print("Per query: ALT", round(alt_time * 1e6), "us, Dijkstra", round(dijkstra_time * 1e6), "us")
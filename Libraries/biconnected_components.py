@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# biconnected_components.py
+
+"""Bridges, articulation points, and biconnected components of an undirected graph.
+
+One depth-first search in the manner of Tarjan computes, for each vertex u,
+its discovery time and low[u], the earliest discovery time reachable from the
+subtree of u by following tree edges down and then at most one back edge.  A
+tree edge (p, u) is a bridge if low[u] > p's discovery time, a nonroot vertex p
+is an articulation point if some child u has low[u] >= p's discovery time, and
+the root is an articulation point if it has two or more children.  The edges
+are also pushed onto a stack as they are explored, so that each time a child u
+satisfies low[u] >= p's discovery time, the edges above (p, u) form one
+biconnected component.  The search keeps its own stack instead of recursing, so
+it runs in O(V + E) time on graphs of any depth."""
+
+
+def biconnectivity(G):
+	"""Find the bridges, articulation points, and biconnected components of G.
+
+	Arguments:
+	G -- an undirected graph.  Parallel edges between two vertices are not bridges.
+	Self-loops are ignored.
+
+	Returns:
+	bridges -- list of the bridges (u, v), with u < v
+	articulation_points -- sorted list of the articulation points
+	components -- list of the biconnected components, each a list of edges (u, v)
+	"""
+	if G.is_directed():
+		raise RuntimeError("Graph should be undirected.")
+	card_V = G.get_card_V()
+	neighbors = [[edge.get_v() for edge in G.get_adj_list(u)] for u in range(card_V)]
+	disc = [-1] * card_V        # discovery times, -1 if undiscovered
+	low = [0] * card_V
+	parent = [-1] * card_V
+	next_index = [0] * card_V   # index of the next neighbour to examine
+	parent_skipped = [False] * card_V  # has the edge back to the parent been skipped once?
+	time = 0
+
+	bridges = []
+	articulation = set()
+	components = []
+	edge_stack = []
+
+	for root in range(card_V):
+		if disc[root] != -1:
+			continue
+		disc[root] = low[root] = time
+		time += 1
+		root_children = 0
+		stack = [root]
+		while len(stack) > 0:
+			u = stack[-1]
+			if next_index[u] < len(neighbors[u]):
+				v = neighbors[u][next_index[u]]
+				next_index[u] += 1
+				if v == parent[u] and not parent_skipped[u]:
+					parent_skipped[u] = True  # a parallel edge to the parent is a back edge
+				elif disc[v] == -1:  # tree edge
+					parent[v] = u
+					disc[v] = low[v] = time
+					time += 1
+					edge_stack.append((u, v))
+					stack.append(v)
+					if u == root:
+						root_children += 1
+				elif disc[v] < disc[u]:  # back edge to an ancestor
+					low[u] = min(low[u], disc[v])
+					edge_stack.append((u, v))
+			else:  # u is finished
+				stack.pop()
+				p = parent[u]
+				if p == -1:
+					continue
+				low[p] = min(low[p], low[u])
+				if low[u] > disc[p]:
+					bridges.append((p, u) if p < u else (u, p))
+				if low[u] >= disc[p]:
+					if p != root:
+						articulation.add(p)
+					component = []
+					while True:
+						edge = edge_stack.pop()
+						component.append(edge)
+						if edge == (p, u):
+							break
+					components.append(component)
+		if root_children >= 2:
+			articulation.add(root)
+
+	return bridges, sorted(articulation), components
+
+
+def closure_impact_report(G, names):
+	"""Describe in terms of vertex names which edges and vertices are single points of failure.
+
+	Arguments:
+	G -- an undirected graph
+	names -- list of vertex names, so that vertex i is names[i]
+
+	Returns:
+	A dictionary with
+	"bridges" -- list of (name1, name2) pairs: closing one of these edges disconnects the graph
+	"articulation_points" -- list of names: closing one of these vertices disconnects the graph
+	"components" -- list of the biconnected components as sorted lists of names,
+	largest first: within one, any single edge or vertex can close without
+	disconnecting the rest
+	"""
+	bridges, articulation_points, components = biconnectivity(G)
+	vertex_sets = [sorted({names[x] for edge in component for x in edge}) for component in components]
+	vertex_sets.sort(key=len, reverse=True)
+	return {"bridges": sorted(tuple(sorted((names[u], names[v]))) for u, v in bridges),
+			"articulation_points": sorted(names[u] for u in articulation_points),
+			"components": vertex_sets}
+
+
+# Testing
+if __name__ == "__main__":
+
+	from adjacency_list_graph import AdjacencyListGraph
+	from connected_components import connected_components
+	from generate_random_graph import generate_random_graph
+	from london_underground import load_london_underground
+
+	# Two triangles joined at c, with a tail d - e - f.
+	vertices = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
+	edges = [('a', 'b'), ('b', 'c'), ('c', 'a'), ('c', 'g'), ('g', 'h'), ('h', 'c'),
+			 ('c', 'd'), ('d', 'e'), ('e', 'f')]
+	graph1 = AdjacencyListGraph.from_edge_list(len(vertices),
+											   [(vertices.index(u), vertices.index(v)) for u, v in edges], False)
+	report = closure_impact_report(graph1, vertices)
+	print(report["bridges"])              # c-d, d-e, e-f
+	print(report["articulation_points"])  # c, d, e
+	print(report["components"])
+
+	# Compare with deleting each edge and each vertex and counting components.
+	def count_components(card_V, edges):
+		return connected_components(AdjacencyListGraph.from_edge_list(card_V, edges, False), "array").get_count()
+
+	card_V = 40
+	graph2 = generate_random_graph(card_V, 0.06, True, False)
+	all_edges = graph2.get_edge_list()
+	base = count_components(card_V, all_edges)
+	bridges, articulation_points, components = biconnectivity(graph2)
+	brute_bridges = [e for e in all_edges if count_components(card_V, [f for f in all_edges if f != e]) > base]
+	brute_points = []
+	for x in range(card_V):
+		rest = [(u, v) for u, v in all_edges if x != u and x != v]
+		isolated = 0 if any(x in e for e in all_edges) else 1  # x alone was one component
+		if count_components(card_V, rest) - 1 > base - isolated:
+			brute_points.append(x)
+	print(sorted(bridges) == sorted(brute_bridges), articulation_points == brute_points)
+	print(sum(len(c) for c in components) == len(all_edges))  # every edge in exactly one component
+
+	# A long path does not hit the recursion limit.
+	n = 100000
+	path = AdjacencyListGraph.from_edge_list(n, [(i, i + 1) for i in range(n - 1)], False)
+	bridges, articulation_points, components = biconnectivity(path)
+	print(len(bridges) == n - 1, len(articulation_points) == n - 2)
+
+	# London Underground.
+	stations, G = load_london_underground()
+	report = closure_impact_report(G, stations)
+	print(len(report["bridges"]), "bridges,", len(report["articulation_points"]), "articulation points,",
+		  len(report["components"][0]), "stations in the largest biconnected component")
+	print("For example:", report["bridges"][:5], report["articulation_points"][:5])
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# bidirectional_dijkstra.py
+
+from heapq import heappush, heappop
+from single_source_shortest_paths import initialize_single_source
+
+
+def bidirectional_dijkstra(G, s, t, G_transpose=None):
+	"""Find a shortest path from s to t by searching forward from s and backward from t at once.
+
+	Each step finishes one vertex on the side whose heap is smaller.  The search stops
+	as soon as the smallest keys of the two heaps add up to at least the weight mu of
+	the best s-t path seen so far, since no path through an unfinished vertex can
+	then be shorter than mu.
+
+	Arguments:
+	G -- a weighted graph with nonnegative weights, represented by adjacency lists
+	s -- index of the source vertex
+	t -- index of the target vertex
+	G_transpose -- optional transpose of G, used by the backward search of a directed
+	graph.  Computed if omitted; pass it in when running many queries on one graph.
+	An undirected graph is its own transpose.
+
+	Returns:
+	d -- list of distances; d[t] is the shortest-path weight from s to t, infinity if
+	t is unreachable.  Entries for vertices on the returned path are exact.
+	pi -- list of predecessors, so that following pi from t leads back to s along a
+	shortest path
+	"""
+	if G_transpose is None:
+		G_transpose = G.transpose() if G.is_directed() else G
+
+	d, pi = initialize_single_source(G, s)       # forward search from s
+	d_back, succ = initialize_single_source(G, t)  # backward search from t
+	if s == t:
+		return d, pi
+
+	card_V = G.get_card_V()
+	finished = [False] * card_V
+	finished_back = [False] * card_V
+	heap = [(0, s)]
+	heap_back = [(0, t)]
+
+	mu = float('inf')  # weight of the best s-t path seen so far
+	meet = None        # (a, b) such that that path is s ~> a -> b ~> t
+
+	while len(heap) > 0 and len(heap_back) > 0:
+		if heap[0][0] + heap_back[0][0] >= mu:
+			break
+
+		if len(heap) <= len(heap_back):  # expand the forward search
+			d_u, u = heappop(heap)
+			if finished[u]:
+				continue
+			finished[u] = True
+			for edge in G.get_adj_list(u):
+				v = edge.get_v()
+				d_v = d_u + edge.get_weight()
+				if d_v < d[v]:
+					d[v] = d_v
+					pi[v] = u
+					heappush(heap, (d_v, v))
+				if d_v + d_back[v] < mu:  # v already reached by the backward search
+					mu = d_v + d_back[v]
+					meet = (u, v)
+		else:  # expand the backward search
+			d_u, u = heappop(heap_back)
+			if finished_back[u]:
+				continue
+			finished_back[u] = True
+			for edge in G_transpose.get_adj_list(u):
+				v = edge.get_v()  # G contains edge (v, u)
+				d_v = d_u + edge.get_weight()
+				if d_v < d_back[v]:
+					d_back[v] = d_v
+					succ[v] = u
+					heappush(heap_back, (d_v, v))
+				if d[v] + d_v < mu:  # v already reached by the forward search
+					mu = d[v] + d_v
+					meet = (v, u)
+
+	if meet is None:  # t is unreachable from s
+		d[t] = float('inf')
+		pi[t] = None
+		return d, pi
+
+	# Splice the backward half of the path onto the forward predecessors.  With
+	# zero-weight edges, the backward half b ~> t may run through vertices of the
+	# forward half s ~> a.  Their forward predecessors are kept, which cuts out the
+	# zero-weight cycle instead of closing it in pi.
+	a, b = meet
+	on_forward = set()
+	x = a
+	while x is not None:
+		on_forward.add(x)
+		x = pi[x]
+	if b not in on_forward:
+		pi[b] = a
+		d[b] = mu - d_back[b]
+	while b != t:
+		if succ[b] not in on_forward:
+			pi[succ[b]] = b
+			d[succ[b]] = mu - d_back[succ[b]]
+		b = succ[b]
+	return d, pi
+
+
+# Testing
+if __name__ == "__main__":
+
+	from adjacency_list_graph import AdjacencyListGraph
+	from dijkstra import dijkstra
+	from generate_random_graph import generate_random_graph
+	from print_path import print_path
+
+	# Textbook example.
+	vertices = ['s', 't', 'x', 'y', 'z']
+	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
+			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
+	graph1 = AdjacencyListGraph(len(vertices), True, True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	s = vertices.index('s')
+	for t in range(len(vertices)):
+		d, pi = bidirectional_dijkstra(graph1, s, t)
+		print(vertices[t] + ": d = " + str(d[t]) + ", path = " + str(print_path(pi, s, t, lambda i: vertices[i])))
+	print()
+
+	# Distances and path weights agree with Dijkstra's algorithm, directed and undirected.
+	for directed in [True, False]:
+		card_V = 150
+		graph2 = generate_random_graph(card_V, 0.03, True, directed, True, 0, 15)
+		xpose2 = graph2.transpose() if directed else graph2
+		all_equal = True
+		for s in range(0, card_V, 5):
+			dijkstra_d, dijkstra_pi = dijkstra(graph2, s)
+			for t in range(0, card_V, 7):
+				d, pi = bidirectional_dijkstra(graph2, s, t, xpose2)
+				if d[t] != dijkstra_d[t]:
+					print("Distance mismatch for pair", s, t)
+					all_equal = False
+				elif d[t] < float('inf'):
+					weight = 0
+					v = t
+					while v != s:
+						weight += graph2.find_edge(pi[v], v).get_weight()
+						v = pi[v]
+					if weight != d[t]:
+						print("Path weight mismatch for pair", s, t)
+						all_equal = False
+		print(("Directed" if directed else "Undirected") + ": shortest-path distances are " +
+			  ("not " if not all_equal else "") + "equal")
+
+	# Zero-weight cycles: following pi from t must reach s along a path of weight d[t].
+	all_equal = True
+	for directed in [True, False]:
+		for seed in range(10):
+			card_V = 60
+			graph3 = generate_random_graph(card_V, 0.08, True, directed, True, 0, 1, seed=seed)
+			xpose3 = graph3.transpose() if directed else graph3
+			for s in range(0, card_V, 3):
+				dijkstra_d = dijkstra(graph3, s)[0]
+				for t in range(card_V):
+					d, pi = bidirectional_dijkstra(graph3, s, t, xpose3)
+					weight = 0
+					v = t
+					for _ in range(card_V):  # a path has fewer than card_V edges
+						if v == s or pi[v] is None:
+							break
+						weight += graph3.find_edge(pi[v], v).get_weight()
+						v = pi[v]
+					if d[t] != dijkstra_d[t] or (d[t] < float('inf') and (v != s or weight != d[t])):
+						print("Zero-weight mismatch for pair", s, t)
+						all_equal = False
+	print("Zero-weight cycles: paths are " + ("not " if not all_equal else "") + "correct")
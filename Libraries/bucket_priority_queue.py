@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# bucket_priority_queue.py
+
+"""Minimum priority queue for small nonnegative integer keys, kept in buckets.
+
+Bucket k holds the objects with key k, so that insert and decrease_key take
+O(1) time and extract_min scans forward from the last minimum to the next
+nonempty bucket.  With circular buckets this is Dial's implementation of
+Dijkstra's algorithm: when all edge weights are integers in 0..C, every key in
+the queue lies within C of the last key extracted, so C + 1 buckets used
+modulo C + 1 suffice for any distance."""
+
+from csr_graph import CSRGraph
+
+
+class BucketPriorityQueue:
+
+    def __init__(self, get_key_func, num_buckets, circular=False):
+        """Initialize an empty bucket priority queue.
+
+        Arguments:
+        get_key_func -- required function that returns the key for the
+        objects stored. Keys must be nonnegative whole numbers or infinity.
+        num_buckets -- number of buckets.  If not circular, finite keys must be less
+        than num_buckets.
+        circular -- if True, bucket k % num_buckets holds key k.  Keys are then
+        monotone: no key may be less than the last key extracted, and all finite
+        keys in the queue must be less than that key plus num_buckets.
+        """
+        self.get_key = get_key_func
+        self.num_buckets = num_buckets
+        self.circular = circular
+        # Each bucket is a dictionary used as an insertion-ordered set.
+        self.buckets = [{} for i in range(num_buckets)]
+        self.infinite = {}  # objects with infinite keys
+        self.keys = {}      # key under which each object is filed
+        self.current = 0    # no finite key in the queue is less than current
+        self.finite_size = 0
+
+    def get_size(self):
+        """Return the number of objects in the priority queue."""
+        return len(self.keys)
+
+    def _file(self, x, k):
+        """File object x under key k."""
+        if k == float('inf'):
+            self.infinite[x] = None
+        else:
+            if k != int(k) or k < 0:
+                raise RuntimeError("Bucket priority queue keys must be nonnegative integers, not " + str(k) + ".")
+            k = int(k)
+            if k < self.current:
+                if self.circular:
+                    raise RuntimeError("Key " + str(k) + " is less than the last key extracted, " +
+                                       str(self.current) + ".")
+                self.current = k
+            if (self.circular and k - self.current >= self.num_buckets) or \
+                    (not self.circular and k >= self.num_buckets):
+                raise RuntimeError("Key " + str(k) + " is out of the range of the buckets.")
+            self.buckets[k % self.num_buckets][x] = None
+            self.finite_size += 1
+        self.keys[x] = k
+
+    def _unfile(self, x):
+        """Remove object x from its bucket."""
+        k = self.keys.pop(x)
+        if k == float('inf'):
+            del self.infinite[x]
+        else:
+            del self.buckets[k % self.num_buckets][x]
+            self.finite_size -= 1
+
+    def insert(self, x):
+        """Insert x into the priority queue."""
+        if x in self.keys:
+            raise RuntimeError("Object " + str(x) + " is already in the priority queue.")
+        self._file(x, self.get_key(x))
+
+    def _min_bucket(self):
+        """Return the bucket holding the minimum finite key, advancing current to that key."""
+        while len(self.buckets[self.current % self.num_buckets]) == 0:
+            self.current += 1
+        return self.buckets[self.current % self.num_buckets]
+
+    def minimum(self):
+        """Return an object with the minimum key."""
+        if len(self.keys) == 0:
+            raise RuntimeError("Heap underflow.")
+        if self.finite_size == 0:
+            return next(iter(self.infinite))
+        return next(iter(self._min_bucket()))
+
+    def extract_min(self):
+        """Return and delete an object with the minimum key.  Objects with equal keys
+        come out in the order in which they were filed under that key."""
+        x = self.minimum()
+        self._unfile(x)
+        return x
+
+    def decrease_key(self, x, k):
+        """Decrease the key of object x to value k.  Error if k is greater than x's current key.
+
+        Arguments:
+        x -- object whose key has been decreased
+        k -- new key of x
+        """
+        if k > self.keys[x]:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(self.keys[x]))
+        self._unfile(x)
+        self._file(x, k)
+
+
+def max_integer_weight(G):
+    """Return the largest edge weight of G if every weight is a nonnegative whole number,
+    and None otherwise."""
+    if isinstance(G, CSRGraph):  # check the weight array all at once
+        weights = G.get_weights()
+        if len(weights) == 0:
+            return 0
+        if weights.min() < 0 or (weights != weights.round()).any():
+            return None
+        return int(weights.max())
+
+    largest = 0
+    for u in range(G.get_card_V()):
+        for edge in G.get_adj_list(u):
+            weight = edge.get_weight()
+            if weight < 0 or weight != int(weight):
+                return None
+            largest = max(largest, weight)
+    return int(largest)
+
+
+# Testing
+if __name__ == "__main__":
+
+    from random import randint
+
+    # Keys of arbitrary order with decreases, as in Prim's algorithm.
+    keys = [randint(0, 20) for i in range(30)] + [float('inf')] * 3
+    pq1 = BucketPriorityQueue(lambda i: keys[i], 21)
+    for i in range(len(keys)):
+        pq1.insert(i)
+    keys[5] = 0
+    pq1.decrease_key(5, 0)
+    print(keys[pq1.minimum()] == 0)
+    extracted_keys = []
+    while pq1.get_size() > 0:
+        extracted_keys.append(keys[pq1.extract_min()])
+    print(extracted_keys)
+    print(extracted_keys == sorted(extracted_keys))
+
+    # Monotone keys in circular buckets, as in Dijkstra's algorithm.
+    keys = {0: 0}
+    pq2 = BucketPriorityQueue(lambda i: keys[i], 6, circular=True)
+    pq2.insert(0)
+    last = 0
+    in_order = True
+    for step in range(1, 100):
+        u = pq2.extract_min()
+        in_order = in_order and keys[u] >= last
+        last = keys[u]
+        keys[step] = keys[u] + randint(0, 5)
+        pq2.insert(step)
+    print(in_order)
+
+    # Errors.
+    try:
+        pq2.decrease_key(99, keys[99] + 1)
+    except RuntimeError as e:
+        print(e)
+    try:
+        BucketPriorityQueue(lambda i: i, 10).extract_min()
+    except RuntimeError as e:
+        print(e)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# closure_evaluator.py
+
+"""Evaluate the impact of closing each of many edges on all-pairs journey times.
+
+The all-pairs shortest-path weights D of the base graph are computed once.
+Closing edge (u, v) of weight w can change only the rows D[s] of sources s for
+which the edge lies on some shortest path, that is, D[s, u] + w == D[s, v] (or
+the same with u and v swapped, for an undirected graph).  Only those sources
+rerun Dijkstra's algorithm, on the graph without the edge, and their new rows
+are compared with the old ones.
+
+With several processes, D lives in shared memory, which every worker maps
+read-only instead of receiving a copy.  Given a graph kept in a file, such as a
+TubeSnapshot, the workers open the graph from the file as well; otherwise each
+worker receives the graph once, when it starts.  The closures go to the workers in a few large chunks, so that the
+cost of sending them is small next to the work.  Results are yielded in the
+order in which the chunks finish."""
+
+import os
+import numpy as np
+from heapq import heappush, heappop
+from multiprocessing import Pool, shared_memory
+from csr_graph import CSRGraph
+from floyd_warshall import floyd_warshall_vectorized
+
+# State of a worker process, set by _attach_worker.
+_worker_memory = None
+_worker_state = None
+
+
+def _adjacency(csr):
+	"""Return the adjacency lists of a CSR graph as lists of (v, weight) pairs."""
+	return [list(zip(csr.get_neighbors(u), csr.get_neighbor_weights(u))) for u in range(csr.get_card_V())]
+
+
+def _base_distances(csr):
+	"""Return the matrix of all-pairs shortest-path weights of a CSR graph."""
+	n = csr.get_card_V()
+	W = np.full((n, n), np.inf)
+	np.minimum.at(W, (csr.get_sources(), csr.get_targets()), csr.get_weights())  # lightest parallel edge
+	np.fill_diagonal(W, 0)
+	return floyd_warshall_vectorized(W, n)
+
+
+def _distances_without(adjacency, s, u, v, directed):
+	"""Return the list of shortest-path weights from s, ignoring every edge (u, v), and
+	also every edge (v, u) if the graph is undirected."""
+	d = [float('inf')] * len(adjacency)
+	d[s] = 0
+	heap = [(0, s)]
+	while len(heap) > 0:
+		d_x, x = heappop(heap)
+		if d_x > d[x]:
+			continue
+		for y, weight in adjacency[x]:
+			if (x == u and y == v) or (not directed and x == v and y == u):
+				continue
+			if d_x + weight < d[y]:
+				d[y] = d_x + weight
+				heappush(heap, (d[y], y))
+	return d
+
+
+def closure_impact(adjacency, D, directed, u, v):
+	"""Compute how closing edge (u, v) changes the shortest-path weights.
+
+	Arguments:
+	adjacency -- adjacency lists of (v, weight) pairs of the base graph
+	D -- matrix of all-pairs shortest-path weights of the base graph
+	directed -- True if the graph is directed.  Closing an undirected edge closes
+	both directions.
+	u, v -- endpoints of the edge to close
+
+	Returns:
+	A dictionary giving the edge, the numbers of ordered pairs of vertices whose
+	shortest-path weight increases and that become disconnected, and the maximum
+	and mean increase over the ordered pairs that stay connected
+	"""
+	n = len(adjacency)
+	weight = min((w for y, w in adjacency[u] if y == v), default=None)
+	if weight is None:
+		raise RuntimeError("Edge (" + str(u) + ", " + str(v) + ") is not in the graph.")
+
+	# Sources whose shortest paths may use the edge, allowing for rounding.
+	tolerance = 1e-9 * max(1.0, abs(weight))
+	uses = np.isfinite(D[:, u]) & (D[:, u] + weight <= D[:, v] + tolerance)
+	if not directed:
+		uses |= np.isfinite(D[:, v]) & (D[:, v] + weight <= D[:, u] + tolerance)
+	sources = np.flatnonzero(uses)
+
+	connected_pairs = int(np.isfinite(D).sum()) - n  # ordered pairs, not counting (s, s)
+	increased = disconnected = 0
+	max_increase = total_increase = 0.0
+	for s in sources.tolist():
+		old = D[s]
+		new = np.array(_distances_without(adjacency, s, u, v, directed))
+		lost = np.isfinite(old) & ~np.isfinite(new)
+		disconnected += int(lost.sum())
+		still = np.isfinite(new)
+		increase = new[still] - old[still]
+		increase = increase[increase > tolerance]
+		increased += len(increase)
+		if len(increase) > 0:
+			max_increase = max(max_increase, float(increase.max()))
+			total_increase += float(increase.sum())
+
+	remaining = connected_pairs - disconnected
+	return {"edge": (u, v), "weight": weight, "sources_rerun": len(sources),
+			"increased_pairs": increased, "disconnected_pairs": disconnected,
+			"max_increase": max_increase, "mean_increase": total_increase / remaining if remaining > 0 else 0.0}
+
+
+def available_processes():
+	"""Return the number of CPUs this process may run on."""
+	return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+def _attach_worker(graph, name, n):
+	"""Pool initializer: keep the graph, or open it again from its file if graph is a
+	(class, filename) pair, and map the shared distance matrix, read-only, into this worker."""
+	global _worker_memory, _worker_state
+	csr = graph[0](graph[1]).get_csr() if isinstance(graph, tuple) else graph
+	_worker_memory = shared_memory.SharedMemory(name=name)
+	D = np.ndarray((n, n), dtype=float, buffer=_worker_memory.buf)
+	D.flags.writeable = False  # a stray write would change D for every worker
+	_worker_state = (_adjacency(csr), D, csr.is_directed())
+
+
+def _worker_closure_impacts(edges):
+	"""Worker task: the list of closure_impact of each edge in a chunk."""
+	adjacency, D, directed = _worker_state
+	return [closure_impact(adjacency, D, directed, u, v) for u, v in edges]
+
+
+def evaluate_closures(G, closures, processes=1, chunksize=None):
+	"""Evaluate the impact of closing each edge in closures, one at a time.
+
+	Arguments:
+	G -- a weighted graph with nonnegative weights, directed or undirected, or an
+	object with get_csr and get_filename methods, such as a TubeSnapshot, which the
+	workers open again from its file, by calling its class with the filename, instead
+	of receiving a copy of the graph
+	closures -- list of edges (u, v) to close, each separately
+	processes -- number of worker processes, or None for available_processes().  With
+	1, the default, everything runs in this process.
+	chunksize -- number of closures sent to a worker at once.  Defaults to enough for
+	about four chunks per process.
+
+	Yields:
+	The dictionary of closure_impact for each closure, as soon as its chunk is
+	computed.  With more than one process, the order may differ from the order of
+	closures.
+	"""
+	snapshot = G if hasattr(G, "get_filename") else None
+	csr = snapshot.get_csr() if snapshot is not None else G if isinstance(G, CSRGraph) else G.to_csr()
+	n = csr.get_card_V()
+	D = _base_distances(csr)
+	closures = list(closures)
+	if processes is None:
+		processes = available_processes()
+	processes = min(processes, len(closures))
+	if processes <= 1:
+		adjacency = _adjacency(csr)
+		for u, v in closures:
+			yield closure_impact(adjacency, D, csr.is_directed(), u, v)
+		return
+
+	memory = shared_memory.SharedMemory(create=True, size=max(n * n, 1) * np.dtype(float).itemsize)
+	try:
+		shared_D = np.ndarray((n, n), dtype=float, buffer=memory.buf)
+		shared_D[:] = D
+		if chunksize is None:
+			chunksize = -(-len(closures) // (4 * processes))
+		chunks = [closures[i:i + chunksize] for i in range(0, len(closures), chunksize)]
+		graph = (type(snapshot), snapshot.get_filename()) if snapshot is not None else csr
+		with Pool(processes, initializer=_attach_worker, initargs=(graph, memory.name, n)) as pool:
+			for results in pool.imap_unordered(_worker_closure_impacts, chunks):
+				yield from results
+		del shared_D  # release the view before closing the shared memory
+	finally:
+		memory.close()
+		memory.unlink()
+
+
+# Testing
+if __name__ == "__main__":
+
+	from time import perf_counter
+	from adjacency_list_graph import AdjacencyListGraph
+	from tube_snapshot import load_network
+
+	network = load_network()
+	stations, G = network.get_stations(), network.get_graph()
+	closures = [(u, edge.get_v()) for u in range(G.get_card_V()) for edge in G.get_adj_list(u) if u < edge.get_v()]
+
+	start = perf_counter()
+	results = list(evaluate_closures(G, closures))
+	serial_time = perf_counter() - start
+	print(len(results), "closures evaluated in", round(serial_time, 2), "seconds")
+	for processes in sorted({2, available_processes()}):
+		start = perf_counter()
+		parallel = sorted(evaluate_closures(network, closures, processes), key=lambda r: r["edge"])
+		parallel_time = perf_counter() - start
+		print(processes, "processes on", available_processes(), "CPUs:", round(parallel_time, 2),
+			  "seconds, speedup", round(serial_time / parallel_time, 2))
+		print(parallel == sorted(results, key=lambda r: r["edge"]))
+
+	# Check a few closures against rebuilding the graph and recomputing all pairs.
+	all_equal = True
+	base = _base_distances(G.to_csr())
+	for result in results[::40]:
+		u, v = result["edge"]
+		H = G.copy()
+		H.delete_edge(u, v)
+		D = _base_distances(H.to_csr())
+		finite = np.isfinite(D)
+		if int((np.isfinite(base) & ~finite).sum()) != result["disconnected_pairs"] or \
+				float((D[finite] - base[finite]).max(initial=0)) != result["max_increase"]:
+			print("Mismatch for closure", stations[u], "-", stations[v])
+			all_equal = False
+	print("Closure impacts " + ("agree" if all_equal else "do not agree") + " with recomputation")
+
+	print("Most disruptive closures:")
+	for result in sorted(results, key=lambda r: (r["disconnected_pairs"], r["mean_increase"]), reverse=True)[:5]:
+		u, v = result["edge"]
+		print(" ", stations[u], "-", stations[v], result)
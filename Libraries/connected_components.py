@@ -33,14 +33,27 @@
 # Either of the following import statements works.
 # from disjoint_set_list import make_set, find_set, union
 from disjoint_set_forest import make_set, find_set, union
+from disjoint_set_array import DisjointSet
 
 
-def connected_components(G):
+def connected_components(G, sets="forest"):
 	"""Compute tge connected components of graph G.
 
 	G -- an undirected graph implemented with adjacency lists
+	sets -- "forest" to return a list of disjoint-set forest nodes, one per vertex,
+	or "array" to return a DisjointSet of the vertices, which needs no object per
+	vertex and no recursion
 	"""
 	card_V = G.get_card_V()
+	if sets == "array":
+		components = DisjointSet(card_V)
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				components.union(u, edge.get_v())
+		return components
+	elif sets != "forest":
+		raise RuntimeError("Unknown disjoint-set implementation " + str(sets) + ".")
+
 	nodes = [None] * card_V
 
 	# Make a singleton set for each vertex.
@@ -64,8 +77,10 @@ def same_component(u, v, sets):
 
 	Arguments:
 	u, v -- indices of distinct vertices
-	sets -- list of nodes for the vertices
+	sets -- list of nodes for the vertices, or a DisjointSet, as returned by connected_components
 	"""
+	if isinstance(sets, DisjointSet):
+		return sets.same_set(u, v)
 	return find_set(sets[u]) == find_set(sets[v])
 
 
@@ -95,3 +110,9 @@ if __name__ == "__main__":
 		print('a and e are in the same component')
 	else:
 		print('a and e are not in the same component')
+
+	# The array version finds the same components.
+	array_sets = connected_components(graph1, "array")
+	print(array_sets.get_count(), "components:", [[vertices[u] for u in s] for s in array_sets.get_sets()])
+	print(all(same_component(u, v, sets) == same_component(u, v, array_sets)
+			  for u in range(len(vertices)) for v in range(len(vertices))))
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# contraction_hierarchy.py
+
+"""Contraction hierarchies for fast point-to-point shortest paths.
+
+Preprocessing contracts the vertices one at a time, least important first.
+Contracting v removes it from the remaining graph and, for each pair of
+remaining neighbours u -> v -> w whose only shortest connection runs through
+v, inserts a shortcut edge (u, w) remembering v as its middle vertex.  The
+rank of a vertex is the order in which it was contracted.
+
+A query runs Dijkstra's algorithm forward from s over edges leading to
+higher-ranked vertices and backward from t over edges coming from
+higher-ranked vertices; the two searches meet at the highest-ranked vertex of
+a shortest path.  Shortcuts on the resulting path are then unpacked into
+original edges."""
+
+from heapq import heappush, heappop
+from adjacency_list_graph import AdjacencyListGraph
+
+
+class ContractionHierarchy:
+
+	def __init__(self, rank, upward, downward, middle):
+		"""Initialize a contraction hierarchy.  Built by build_contraction_hierarchy.
+
+		Arguments:
+		rank -- list giving the contraction order of each vertex
+		upward -- directed CSR graph of the edges (u, w), original or shortcut,
+		with rank[u] < rank[w]
+		downward -- directed CSR graph holding each edge (u, w) with rank[u] > rank[w]
+		as the reversed edge (w, u), for the backward search
+		middle -- dictionary mapping each shortcut (u, w) to its middle vertex
+		"""
+		self.rank = rank
+		self.upward = upward
+		self.downward = downward
+		self.middle = middle
+
+	def get_rank(self):
+		"""Return the list of vertex ranks."""
+		return self.rank
+
+	def get_shortcut_count(self):
+		"""Return the number of shortcut edges."""
+		return len(self.middle)
+
+	def _search(self, s, t):
+		"""Run the upward and downward searches.  Return the shortest-path weight, the
+		meeting vertex, and the predecessor dictionaries of both searches."""
+		d = {s: 0}
+		d_back = {t: 0}
+		pi = {s: None}
+		succ = {t: None}
+		finished = set()
+		finished_back = set()
+		heap = [(0, s)]
+		heap_back = [(0, t)]
+		mu = float('inf')
+		meet = None
+
+		# Unlike plain bidirectional Dijkstra, a side can stop only once its own smallest
+		# key reaches mu, because the searches meet at the top of the path.
+		while (len(heap) > 0 and heap[0][0] < mu) or (len(heap_back) > 0 and heap_back[0][0] < mu):
+			forward = len(heap_back) == 0 or heap_back[0][0] >= mu or \
+				(len(heap) > 0 and heap[0][0] < mu and heap[0][0] <= heap_back[0][0])
+			if forward:
+				graph, queue, dist, other, pred, done = self.upward, heap, d, d_back, pi, finished
+			else:
+				graph, queue, dist, other, pred, done = self.downward, heap_back, d_back, d, succ, finished_back
+
+			d_u, u = heappop(queue)
+			if u in done:
+				continue
+			done.add(u)
+			if u in other and d_u + other[u] < mu:
+				mu = d_u + other[u]
+				meet = u
+			for v, weight in zip(graph.get_neighbors(u), graph.get_neighbor_weights(u)):
+				d_v = d_u + weight
+				if d_v < dist.get(v, float('inf')):
+					dist[v] = d_v
+					pred[v] = u
+					heappush(queue, (d_v, v))
+		return mu, meet, pi, succ
+
+	def distance(self, s, t):
+		"""Return the shortest-path weight from s to t, infinity if t is unreachable."""
+		if s == t:
+			return 0
+		return self._search(s, t)[0]
+
+	def query(self, s, t):
+		"""Find a shortest path from s to t.
+
+		Returns:
+		distance -- the shortest-path weight, infinity if t is unreachable
+		path -- list of the vertices on a shortest path from s to t using original
+		edges only, None if t is unreachable
+		"""
+		if s == t:
+			return 0, [s]
+		mu, meet, pi, succ = self._search(s, t)
+		if meet is None:
+			return float('inf'), None
+
+		# Path in the hierarchy: s ~> meet by the upward search, meet ~> t by the downward one.
+		hierarchy_path = []
+		v = meet
+		while v is not None:
+			hierarchy_path.append(v)
+			v = pi[v]
+		hierarchy_path.reverse()
+		v = succ[meet]
+		while v is not None:
+			hierarchy_path.append(v)
+			v = succ[v]
+
+		path = [s]
+		for i in range(len(hierarchy_path) - 1):
+			self._unpack(hierarchy_path[i], hierarchy_path[i + 1], path)
+		return mu, path
+
+	def _unpack(self, u, w, path):
+		"""Append to path the vertices after u on the original edges that edge (u, w) stands for."""
+		stack = [(u, w)]
+		while len(stack) > 0:
+			a, b = stack.pop()
+			m = self.middle.get((a, b))
+			if m is None:  # original edge
+				path.append(b)
+			else:  # shortcut: expand (a, m) first, so push it last
+				stack.append((m, b))
+				stack.append((a, m))
+
+
+def _witness_search(out_edges, source, skip, targets, limit, settle_limit):
+	"""Run a bounded Dijkstra search from source that avoids vertex skip.
+
+	Stops once the smallest key exceeds limit, every target is finished, or
+	settle_limit vertices have been finished.  Returns a dictionary of distance
+	upper bounds."""
+	d = {source: 0}
+	finished = set()
+	remaining = len(targets)
+	heap = [(0, source)]
+	while len(heap) > 0 and remaining > 0 and len(finished) < settle_limit:
+		d_u, u = heappop(heap)
+		if u in finished:
+			continue
+		if d_u > limit:
+			break
+		finished.add(u)
+		if u in targets:
+			remaining -= 1
+		for v, weight in out_edges[u].items():
+			if v == skip:
+				continue
+			d_v = d_u + weight
+			if d_v < d.get(v, float('inf')):
+				d[v] = d_v
+				heappush(heap, (d_v, v))
+	return d
+
+
+def _shortcuts(out_edges, in_edges, v, settle_limit):
+	"""Return the list of shortcuts (u, w, weight) needed to contract v."""
+	shortcuts = []
+	for u, weight_uv in in_edges[v].items():
+		targets = {w: weight_uv + weight_vw for w, weight_vw in out_edges[v].items() if w != u}
+		if len(targets) == 0:
+			continue
+		d = _witness_search(out_edges, u, v, targets, max(targets.values()), settle_limit)
+		for w, weight in targets.items():
+			if d.get(w, float('inf')) > weight:  # no witness path avoids v
+				shortcuts.append((u, w, weight))
+	return shortcuts
+
+
+def _priority(out_edges, in_edges, v, deleted_neighbors, settle_limit):
+	"""Return the contraction priority of v: the edge difference plus the number of
+	neighbours already contracted, which spreads contraction evenly over the graph."""
+	added = len(_shortcuts(out_edges, in_edges, v, settle_limit))
+	return added - len(out_edges[v]) - len(in_edges[v]) + deleted_neighbors[v]
+
+
+def build_contraction_hierarchy(G, settle_limit=100):
+	"""Preprocess a weighted graph into a contraction hierarchy.
+
+	Arguments:
+	G -- a weighted graph with nonnegative weights, directed or undirected
+	settle_limit -- most vertices finished by one witness search.  Smaller values
+	speed up preprocessing but may add unnecessary shortcuts; queries stay exact.
+
+	Returns:
+	A ContractionHierarchy
+	"""
+	card_V = G.get_card_V()
+	# Remaining graph as dictionaries; keep only the lightest of parallel edges.
+	out_edges = [{} for v in range(card_V)]
+	in_edges = [{} for v in range(card_V)]
+	for u in range(card_V):
+		for edge in G.get_adj_list(u):
+			v = edge.get_v()
+			if u != v and edge.get_weight() < out_edges[u].get(v, float('inf')):
+				out_edges[u][v] = edge.get_weight()
+				in_edges[v][u] = edge.get_weight()
+
+	deleted_neighbors = [0] * card_V
+	heap = [(_priority(out_edges, in_edges, v, deleted_neighbors, settle_limit), v) for v in range(card_V)]
+	heap.sort()  # a sorted list is a heap
+	rank = [None] * card_V
+	middle = {}
+	upward_edges = []
+	downward_edges = []
+	order = 0
+	while len(heap) > 0:
+		priority, v = heappop(heap)
+		# Lazy update: priorities of other vertices may have changed since v was pushed.
+		priority = _priority(out_edges, in_edges, v, deleted_neighbors, settle_limit)
+		if len(heap) > 0 and priority > heap[0][0]:
+			heappush(heap, (priority, v))
+			continue
+
+		rank[v] = order
+		order += 1
+		# Every remaining neighbour is contracted later, so it has a higher rank.
+		for w, weight in out_edges[v].items():
+			upward_edges.append((v, w, weight))
+		for u, weight in in_edges[v].items():
+			downward_edges.append((v, u, weight))  # edge (u, v), reversed
+
+		for u, w, weight in _shortcuts(out_edges, in_edges, v, settle_limit):
+			if weight < out_edges[u].get(w, float('inf')):
+				out_edges[u][w] = weight
+				in_edges[w][u] = weight
+				middle[(u, w)] = v
+
+		for w in out_edges[v]:
+			del in_edges[w][v]
+			deleted_neighbors[w] += 1
+		for u in in_edges[v]:
+			del out_edges[u][v]
+			deleted_neighbors[u] += 1
+		out_edges[v] = {}
+		in_edges[v] = {}
+
+	upward = AdjacencyListGraph.from_edge_list(card_V, upward_edges, True, True).to_csr()
+	downward = AdjacencyListGraph.from_edge_list(card_V, downward_edges, True, True).to_csr()
+	return ContractionHierarchy(rank, upward, downward, middle)
+
+
+def compare_with_dijkstra(G, pairs, settle_limit=100):
+	"""Time contraction-hierarchy preprocessing and queries against Dijkstra's algorithm.
+
+	Arguments:
+	G -- a weighted graph
+	pairs -- list of (s, t) query pairs
+	settle_limit -- passed on to build_contraction_hierarchy
+
+	Returns:
+	A dictionary with the preprocessing time, the average query times of both
+	methods in seconds, the number of shortcuts, and whether all distances agreed.
+	"""
+	from time import perf_counter
+	from dijkstra import dijkstra
+
+	start = perf_counter()
+	ch = build_contraction_hierarchy(G, settle_limit)
+	preprocessing = perf_counter() - start
+
+	start = perf_counter()
+	ch_results = [ch.query(s, t) for s, t in pairs]
+	ch_time = (perf_counter() - start) / len(pairs)
+
+	start = perf_counter()
+	dijkstra_results = [dijkstra(G, s, t)[0][t] for s, t in pairs]
+	dijkstra_time = (perf_counter() - start) / len(pairs)
+
+	agree = all(distance == expected for (distance, path), expected in zip(ch_results, dijkstra_results))
+	return {"preprocessing": preprocessing, "ch_query": ch_time, "dijkstra_query": dijkstra_time,
+			"shortcuts": ch.get_shortcut_count(), "agree": agree}
+
+
+# Testing
+if __name__ == "__main__":
+
+	from random import randrange, seed
+	from generate_random_graph import generate_random_graph
+	from london_underground import load_london_underground
+
+	seed(2024)
+
+	# London Underground.
+	stations, G = load_london_underground()
+	ch = build_contraction_hierarchy(G)
+	distance, path = ch.query(stations.index("Wimbledon"), stations.index("Stratford"))
+	print(distance, "minutes:", [stations[i] for i in path])
+	# The unpacked path uses original edges and has the returned weight.
+	print(sum(G.find_edge(path[i], path[i + 1]).get_weight() for i in range(len(path) - 1)) == distance)
+
+	pairs = [(randrange(len(stations)), randrange(len(stations))) for i in range(500)]
+	print("London Underground:", compare_with_dijkstra(G, pairs))
+
+	# Random graphs, undirected and directed.
+	for card_V, directed in [(1000, False), (1000, True)]:
+		G = generate_random_graph(card_V, 3 / card_V, True, directed, True, 1, 14)
+		pairs = [(randrange(card_V), randrange(card_V)) for i in range(200)]
+		print(card_V, "vertices", "directed:" if directed else "undirected:", compare_with_dijkstra(G, pairs))
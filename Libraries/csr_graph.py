@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# csr_graph.py
+
+"""Read-only graph stored in compressed-sparse-row (CSR) form.
+
+The neighbours of vertex u are targets[offsets[u]:offsets[u+1]], with the
+matching edge weights at the same positions of the weights array.  The class
+offers the same read interface as AdjacencyListGraph, so that algorithms such
+as dijkstra, bfs, kruskal and prim run over it unchanged."""
+
+import numpy as np
+from adjacency_matrix_graph import AdjacencyMatrixGraph
+
+
+class CSREdge:
+
+	__slots__ = ("v", "weight")
+
+	def __init__(self, v, weight=None):
+		"""Initialize a lightweight view of one entry in a CSR graph.
+
+		Arguments:
+		v -- the other vertex that the edge is incident on
+		weight -- optional parameter for weighted graphs
+		"""
+		self.v = v
+		self.weight = weight
+
+	def get_v(self):
+		"""Return the vertex index."""
+		return self.v
+
+	def get_weight(self):
+		"""Return the weight of this edge."""
+		return self.weight
+
+	def __str__(self):
+		"""String version of the vertex with optional weight in parentheses."""
+		return self.strmap(lambda v: v)
+
+	def strmap(self, mapping_func):
+		"""String version of the vertex with optional weight in parentheses.
+		Vertex numbers are mapped according to a mapping function."""
+		string = str(mapping_func(self.v))
+		if self.weight is not None:
+			string += " (" + str(self.weight) + ")"
+		return string
+
+
+class CSRGraph:
+
+	def __init__(self, card_V, offsets, targets, weights=None, directed=True, card_E=None):
+		"""Initialize a graph from its compressed-sparse-row arrays.
+
+		Arguments:
+		card_V -- number of vertices in this graph
+		offsets -- array of card_V + 1 indices into targets; the neighbours of u are
+		targets[offsets[u]:offsets[u+1]]
+		targets -- array of neighbour vertices, one entry per stored edge
+		weights -- array of edge weights parallel to targets, or None if unweighted
+		directed -- boolean indicating whether the graph is directed
+		card_E -- number of edges, counting each undirected edge once.  Computed from
+		the arrays if omitted.
+		"""
+		self.card_V = card_V
+		self.directed = directed
+		self.weighted = weights is not None
+		self.offsets = np.asarray(offsets, dtype=np.int64)
+		index_type = np.int32 if card_V < 2 ** 31 else np.int64
+		self.targets = np.asarray(targets, dtype=index_type)
+		if self.weighted:
+			self.weights = np.asarray(weights)
+		else:
+			self.weights = None
+
+		if len(self.offsets) != card_V + 1:
+			raise RuntimeError("Offsets array must have card_V + 1 entries.")
+		if self.offsets[-1] != len(self.targets):
+			raise RuntimeError("Last offset must equal the number of stored edges.")
+		if self.weighted and len(self.weights) != len(self.targets):
+			raise RuntimeError("Weights array must be parallel to the targets array.")
+
+		if card_E is None:
+			card_E = len(self.targets) if directed else len(self.targets) // 2
+		self.card_E = card_E
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.card_V
+
+	def get_card_E(self):
+		"""Return the number of edges in this graph."""
+		return self.card_E
+
+	def get_offsets(self):
+		"""Return the offsets array."""
+		return self.offsets
+
+	def get_targets(self):
+		"""Return the array of neighbour vertices."""
+		return self.targets
+
+	def get_weights(self):
+		"""Return the array of edge weights, or None if the graph is unweighted."""
+		return self.weights
+
+	def get_degree(self, u):
+		"""Return the number of edges leaving vertex u."""
+		return int(self.offsets[u + 1] - self.offsets[u])
+
+	def get_neighbors(self, u):
+		"""Return a Python list of the neighbours of vertex u."""
+		return self.targets[self.offsets[u]:self.offsets[u + 1]].tolist()
+
+	def get_neighbor_weights(self, u):
+		"""Return a Python list of the weights of the edges leaving u, parallel to get_neighbors(u)."""
+		if not self.weighted:
+			raise RuntimeError("Graph is unweighted.")
+		return self.weights[self.offsets[u]:self.offsets[u + 1]].tolist()
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the adjacency list of vertex u."""
+		if self.weighted:
+			for v, weight in zip(self.get_neighbors(u), self.get_neighbor_weights(u)):
+				yield CSREdge(v, weight)
+		else:
+			for v in self.get_neighbors(u):
+				yield CSREdge(v)
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.directed
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.weighted
+
+	def insert_edge(self, u, v, weight=None):
+		"""A CSR graph cannot be modified."""
+		raise RuntimeError("Cannot insert edge (" + str(u) + ", " + str(v) + ") into a read-only CSR graph.")
+
+	def delete_edge(self, u, v, delete_undirected=True):
+		"""A CSR graph cannot be modified."""
+		raise RuntimeError("Cannot delete edge (" + str(u) + ", " + str(v) + ") from a read-only CSR graph.")
+
+	def _find_position(self, u, v):
+		"""Return the index into targets of edge (u, v), or None if (u, v) is not in this graph."""
+		start = self.offsets[u]
+		hits = np.flatnonzero(self.targets[start:self.offsets[u + 1]] == v)
+		if len(hits) == 0:
+			return None
+		return int(start + hits[0])
+
+	def find_edge(self, u, v):
+		"""Return an edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
+		i = self._find_position(u, v)
+		if i is None:
+			return None
+		return CSREdge(v, self.weights[i].item() if self.weighted else None)
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is in this graph, False otherwise."""
+		return self._find_position(u, v) is not None
+
+	def get_sources(self):
+		"""Return an array parallel to targets giving the vertex each stored edge leaves."""
+		return np.repeat(np.arange(self.card_V, dtype=self.targets.dtype), np.diff(self.offsets))
+
+	def get_edge_list(self):
+		"""Return a Python list containing the edges of this graph."""
+		sources = self.get_sources()
+		if self.directed:
+			keep = slice(None)
+		else:
+			keep = sources < self.targets
+		return list(zip(sources[keep].tolist(), self.targets[keep].tolist()))
+
+	def copy(self):
+		"""Return a copy of this graph."""
+		weights = None if self.weights is None else self.weights.copy()
+		return CSRGraph(self.card_V, self.offsets.copy(), self.targets.copy(), weights,
+						self.directed, self.card_E)
+
+	def transpose(self):
+		"""Return the transpose of this graph."""
+		if not self.directed:
+			return self.copy()
+		# Group the stored edges by target with a stable sort, so that each new adjacency
+		# list keeps the original order of the sources.
+		order = np.argsort(self.targets, kind="stable")
+		counts = np.bincount(self.targets, minlength=self.card_V)
+		offsets = np.zeros(self.card_V + 1, dtype=np.int64)
+		np.cumsum(counts, out=offsets[1:])
+		weights = None if self.weights is None else self.weights[order]
+		return CSRGraph(self.card_V, offsets, self.get_sources()[order], weights, True, self.card_E)
+
+	def adjacency_matrix(self):
+		"""Return the adjacency-matrix representation of this graph."""
+		matrix = AdjacencyMatrixGraph(self.card_V, self.directed, self.weighted)
+		for u, v in self.get_edge_list():
+			weight = self.find_edge(u, v).get_weight() if self.weighted else None
+			matrix.insert_edge(u, v, weight)
+		return matrix
+
+	def to_adjacency_list_graph(self):
+		"""Return a modifiable AdjacencyListGraph with the same edges as this graph."""
+		from adjacency_list_graph import AdjacencyListGraph
+		G = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		sources = self.get_sources().tolist()
+		targets = self.targets.tolist()
+		weights = self.weights.tolist() if self.weighted else [None] * len(targets)
+		for u, v, weight in zip(sources, targets, weights):
+			if self.directed or u < v:
+				G.insert_edge(u, v, weight)
+		return G
+
+	def __str__(self):
+		"""Return the adjacency lists formatted as a string."""
+		return self.strmap()
+
+	def strmap(self, mapping_func=None):
+		"""Return the adjacency lists formatted as a string, but mapping vertex numbers
+		by a mapping function.  If mapping_func is None, then do not map."""
+		if mapping_func is None:
+			mapping_func = lambda i: i
+
+		result = ""
+		for i in range(self.card_V):
+			result += str(mapping_func(i)) + ": "
+			for edge in self.get_adj_list(i):
+				result += edge.strmap(mapping_func) + " "
+			result += "\n"
+		return result
+
+
+# Testing
+if __name__ == "__main__":
+
+	from adjacency_list_graph import AdjacencyListGraph
+	from bfs import bfs
+	from dijkstra import dijkstra
+	from mst import kruskal, prim, get_total_weight
+	from generate_random_graph import generate_random_graph
+
+	# Textbook example for Dijkstra's algorithm.
+	vertices = ['s', 't', 'x', 'y', 'z']
+	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
+			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
+	graph1 = AdjacencyListGraph(len(vertices), True, True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	csr1 = graph1.to_csr()
+	print(csr1.strmap(lambda i: vertices[i]))
+	print(dijkstra(graph1, 0) == dijkstra(csr1, 0))
+	print(csr1.transpose().strmap(lambda i: vertices[i]))
+	print(str(graph1.transpose()) == str(csr1.transpose()))
+	try:
+		csr1.insert_edge(0, 4, 1)
+	except RuntimeError as e:
+		print(e)
+
+	# Random undirected graph: same results from BFS, Kruskal and Prim.
+	card_V = 60
+	graph2 = generate_random_graph(card_V, 0.1, True, False, True, 1, 15)
+	csr2 = graph2.freeze()
+	print(csr2.get_card_V(), csr2.get_card_E(), graph2.get_card_E())
+	print(sorted(csr2.get_edge_list()) == sorted(graph2.get_edge_list()))
+	print(bfs(graph2, 0) == bfs(csr2, 0))
+	print(get_total_weight(kruskal(graph2)) == get_total_weight(kruskal(csr2)))
+	print(get_total_weight(prim(graph2, 0)) == get_total_weight(prim(csr2, 0)))
+	print(sorted(csr2.to_adjacency_list_graph().get_edge_list()) == sorted(graph2.get_edge_list()))
@@ -56,9 +56,9 @@ def dfs(G, start_dfs_tree=None, discover_func=None, finish_func=None, order=None
 	f -- list of vertex finish times
 	pi -- list of depth-first vertex predecessors
 	"""
-	# Initialize color, pi, distance, and finish time lists.
-	global time, color, pi, d, f
-	time = 0  # global timestamp
+	# Initialize color, pi, distance, and finish time lists.  They are local to this
+	# search, so that searches may run at the same time in different threads.
+	time = 0  # timestamp
 	card_V = G.get_card_V()
 	color = [WHITE] * card_V  # vertices are numbered, color[0] corresponds with color of vertex 0.
 	pi = [None] * card_V
@@ -76,13 +76,14 @@ def dfs(G, start_dfs_tree=None, discover_func=None, finish_func=None, order=None
 				start_dfs_tree()
 			if discover_func is not None:
 				discover_func(u)  # discover first vertex in this depth-first tree
-			dfs_visit(G, u, discover_func, finish_func)  # DFS from vertex u
+			time = dfs_visit(G, u, discover_func, finish_func, color, pi, d, f, time)  # DFS from vertex u
 	return d, f, pi
 
 
-def dfs_visit(G, u, discover_func, finish_func):
+def dfs_visit(G, u, discover_func, finish_func, color, pi, d, f, time):
 	"""Perform depth-first search on a graph represented by adjacency lists, starting
-	from a given vertex.
+	from a given vertex.  Uses an explicit stack rather than recursion, so that the
+	depth of the search is not limited by Python's recursion limit.
 
 	Arguments:
 	G -- a graph, represented by adjacency lists.
@@ -91,26 +92,39 @@ def dfs_visit(G, u, discover_func, finish_func):
 	an edge in a graph, taking the vertex as an argument.  Defaults to do nothing.
 	finish_func -- function called upon finishing a vertex in a graph, taking the
 	vertex as an argument.  Defaults to do nothing.
+	color, pi, d, f -- lists of colors, predecessors, discovery and finish times, updated
+	time -- timestamp before discovering u
 
-	Updates the global timestamp time and the global lists color, pi, d, and f.
+	Returns:
+	The timestamp after finishing u
 	"""
-	global time, color, pi, d, f
 	time += 1  # white vertex u has just been discovered
 	d[u] = time
 	color[u] = GRAY
-
-	for edge in G.get_adj_list(u):  # explore each edge (u, v)
-		v = edge.get_v()
-		if color[v] == WHITE:
-			if discover_func is not None:
-				discover_func(v)  # do something with vertex v upon discovering it
-			pi[v] = u
-			dfs_visit(G, v, discover_func, finish_func)
-	time += 1
-	f[u] = time
-	color[u] = BLACK  # black u; it is finished
-	if finish_func is not None:
-		finish_func(u)  # do something with vertex v upon finishing it
+	# Each stack entry holds a gray vertex and an iterator over its remaining edges.
+	stack = [(u, iter(G.get_adj_list(u)))]
+
+	while len(stack) > 0:
+		u, edges = stack[-1]
+		for edge in edges:  # explore each edge (u, v)
+			v = edge.get_v()
+			if color[v] == WHITE:
+				if discover_func is not None:
+					discover_func(v)  # do something with vertex v upon discovering it
+				pi[v] = u
+				time += 1  # white vertex v has just been discovered
+				d[v] = time
+				color[v] = GRAY
+				stack.append((v, iter(G.get_adj_list(v))))
+				break  # continue the search from v, and resume u's edges later
+		else:  # all of u's edges have been explored
+			stack.pop()
+			time += 1
+			f[u] = time
+			color[u] = BLACK  # black u; it is finished
+			if finish_func is not None:
+				finish_func(u)  # do something with vertex u upon finishing it
+	return time
 
 
 # Testing
@@ -133,3 +147,19 @@ if __name__ == "__main__":
 			print(pi[v])
 		else:
 			print(vertices[pi[v]])
+
+	# A path longer than the recursion limit.
+	n = 100000
+	path = AdjacencyListGraph.from_edge_list(n, [(i, i + 1) for i in range(n - 1)])
+	d, f, pi = dfs(path)
+	print(d[n - 1] == n, f[0] == 2 * n)
+
+	# Two searches running in different threads do not share state.
+	from threading import Thread
+	results = [None, None]
+	threads = [Thread(target=lambda i=i: results.__setitem__(i, dfs(path if i == 0 else graph1))) for i in range(2)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	print(results[0] == dfs(path), results[1] == dfs(graph1))
@@ -30,19 +30,67 @@
 #                                                                       #
 #########################################################################
 
+from heapq import heappush, heappop
 from single_source_shortest_paths import initialize_single_source, relax
 from min_heap_priority_queue import MinHeapPriorityQueue
+from indexed_heap_priority_queue import MinIndexedHeapPriorityQueue
+from pairing_heap_priority_queue import MinPairingHeapPriorityQueue
+from fibonacci_heap_priority_queue import MinFibonacciHeapPriorityQueue
+from bucket_priority_queue import BucketPriorityQueue, max_integer_weight
+from csr_graph import CSRGraph
 
 
-def dijkstra(G, s):
+def dijkstra(G, s, target=None, engine="heapq"):
 	"""Solve single-source shortest-paths problem with no negative-weight edges.
 
 	Arguments:
 	G -- a directed, weighted graph
 	s -- index of source vertex
+	target -- optional index of a target vertex.  If given, the search stops as soon
+	as the target's shortest-path distance is known.
+	engine -- "heapq", the default, for a binary heap of (distance, vertex) tuples
+	with lazy deletion, which was the fastest on every graph measured, "bucket"
+	for Dial's algorithm with a BucketPriorityQueue (edge weights must be
+	nonnegative whole numbers), "dary", "pairing", or "fibonacci" for a
+	MinIndexedHeapPriorityQueue, MinPairingHeapPriorityQueue, or
+	MinFibonacciHeapPriorityQueue with decrease_key, or "clrs" for the textbook
+	version with MinHeapPriorityQueue
+
 	Assumption:
 	All weights are nonnegative
 
+	Returns:
+	d -- distances from source vertex s.  When the search stops early at the target,
+	vertices not yet finished hold upper bounds on their distances.
+	pi -- predecessors
+	"""
+	if engine == "heapq":
+		return dijkstra_lazy(G, s, target)
+	elif engine == "bucket":
+		max_weight = max_integer_weight(G)
+		if max_weight is None:
+			raise RuntimeError("Bucket engine needs nonnegative whole-number edge weights.")
+		return dijkstra_dial(G, s, target, max_weight)
+	elif engine == "dary":
+		return dijkstra_queue(G, s, target, lambda d: MinIndexedHeapPriorityQueue(lambda u: d[u], G.get_card_V()))
+	elif engine == "pairing":
+		return dijkstra_queue(G, s, target, lambda d: MinPairingHeapPriorityQueue(lambda u: d[u]))
+	elif engine == "fibonacci":
+		return dijkstra_queue(G, s, target, lambda d: MinFibonacciHeapPriorityQueue(lambda u: d[u]))
+	elif engine == "clrs":
+		return dijkstra_clrs(G, s, target)
+	else:
+		raise RuntimeError("Unknown Dijkstra engine " + str(engine) + ".")
+
+
+def dijkstra_clrs(G, s, target=None):
+	"""Dijkstra's algorithm as in the textbook, with every vertex in a MinHeapPriorityQueue.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	target -- optional index of a vertex at which to stop
+
 	Returns:
 	d -- distances from source vertex s
 	pi -- predecessors
@@ -59,6 +107,8 @@ def dijkstra(G, s):
 
 	while queue.get_size() > 0:  # while the priority queue is not empty
 		u = queue.extract_min()  # extract a vertex with the minimum distance
+		if u == target:
+			break
 
 		# Relax each edge and update d and pi.
 		for edge in G.get_adj_list(u):
@@ -70,6 +120,117 @@ def dijkstra(G, s):
 	return d, pi
 
 
+def dijkstra_queue(G, s, target, make_queue):
+	"""Dijkstra's algorithm with a priority queue supporting decrease_key.
+
+	Unlike the textbook version, a vertex enters the queue only when it is first
+	reached, so that unreachable vertices cost nothing.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	target -- optional index of a vertex at which to stop
+	make_queue -- function that takes the distance list d and returns an empty
+	minimum priority queue of vertices keyed by d
+
+	Returns:
+	d -- distances from source vertex s
+	pi -- predecessors
+	"""
+	d, pi = initialize_single_source(G, s)
+	finished = [False] * G.get_card_V()
+	csr = isinstance(G, CSRGraph)
+
+	queue = make_queue(d)
+	queue.insert(s)
+	while queue.get_size() > 0:
+		u = queue.extract_min()
+		finished[u] = True
+		if u == target:
+			break
+
+		if csr:
+			neighbors = zip(G.get_neighbors(u), G.get_neighbor_weights(u))
+		else:
+			neighbors = ((edge.get_v(), edge.get_weight()) for edge in G.get_adj_list(u))
+		d_u = d[u]
+		for v, weight in neighbors:
+			d_v = d_u + weight
+			if d_v < d[v]:
+				reached = d[v] < float('inf')
+				d[v] = d_v
+				pi[v] = u
+				if reached:
+					queue.decrease_key(v, d_v)
+				else:
+					queue.insert(v)
+
+	return d, pi
+
+
+def dijkstra_dial(G, s, target, max_weight):
+	"""Dial's implementation of Dijkstra's algorithm for whole-number edge weights.
+
+	This is dijkstra_queue with a BucketPriorityQueue of max_weight + 1 circular
+	buckets: every distance in the queue lies within max_weight of the last one
+	extracted, so the buckets, used modulo max_weight + 1, hold them all.
+
+	Arguments:
+	G -- a directed graph with nonnegative whole-number edge weights
+	s -- index of source vertex
+	target -- optional index of a vertex at which to stop
+	max_weight -- largest edge weight in G
+
+	Returns:
+	d -- distances from source vertex s
+	pi -- predecessors
+	"""
+	return dijkstra_queue(G, s, target, lambda d: BucketPriorityQueue(lambda u: d[u], max_weight + 1, circular=True))
+
+
+def dijkstra_lazy(G, s, target=None):
+	"""Dijkstra's algorithm with a binary heap of (distance, vertex) tuples.
+
+	Instead of decreasing a key, each relaxation pushes a new tuple, and tuples for
+	vertices that have already been finished are skipped when popped.  Only vertices
+	that have been reached ever enter the heap.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	target -- optional index of a vertex at which to stop
+
+	Returns:
+	d -- distances from source vertex s
+	pi -- predecessors
+	"""
+	d, pi = initialize_single_source(G, s)
+	finished = [False] * G.get_card_V()
+	csr = isinstance(G, CSRGraph)
+
+	heap = [(0, s)]
+	while len(heap) > 0:
+		d_u, u = heappop(heap)
+		if finished[u]:  # stale entry
+			continue
+		finished[u] = True
+		if u == target:
+			break
+
+		if csr:  # read the arrays directly rather than creating edge objects
+			neighbors = zip(G.get_neighbors(u), G.get_neighbor_weights(u))
+		else:
+			neighbors = ((edge.get_v(), edge.get_weight()) for edge in G.get_adj_list(u))
+		for v, weight in neighbors:
+			d_v = d_u + weight
+			if d_v < d[v]:
+				d[v] = d_v
+				pi[v] = u
+				heappush(heap, (d_v, v))
+
+	return d, pi
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -102,4 +263,22 @@ if __name__ == "__main__":
 			print("Shortest-path distances mismatch for source vertex", s)
 			all_equal = False
 		# Don't check whether pi values are equal because shortest paths might not be unique.
-	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
\ No newline at end of file
+	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Both engines, and the CSR form of the graph, give the same distances.
+	csr2 = graph2.to_csr()
+	all_equal = True
+	for s in range(card_V):
+		clrs_d, clrs_pi = dijkstra(graph2, s, engine="clrs")
+		if clrs_d != dijkstra(graph2, s, engine="heapq")[0] or clrs_d != dijkstra(csr2, s)[0] \
+				or clrs_d != dijkstra(graph2, s, engine="bucket")[0] or clrs_d != dijkstra(graph2, s, engine="dary")[0] \
+				or clrs_d != dijkstra(graph2, s, engine="pairing")[0] or clrs_d != dijkstra(graph2, s, engine="fibonacci")[0]:
+			print("Engine mismatch for source vertex", s)
+			all_equal = False
+		# Stopping at a target gives that target's final distance.
+		t = (s * 7) % card_V
+		if dijkstra(graph2, s, t)[0][t] != clrs_d[t] or dijkstra(graph2, s, t, "clrs")[0][t] != clrs_d[t] \
+				or dijkstra(graph2, s, t, "dary")[0][t] != clrs_d[t]:
+			print("Early-exit mismatch for pair", s, t)
+			all_equal = False
+	print("Engines " + ("disagree" if not all_equal else "agree"))
\ No newline at end of file
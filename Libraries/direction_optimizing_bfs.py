@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# direction_optimizing_bfs.py
+
+"""Breadth-first search over a CSR graph, one whole level at a time with NumPy.
+
+A top-down step scans the edges leaving the frontier and claims the undiscovered
+vertices at their heads.  A bottom-up step instead scans the edges entering the
+undiscovered vertices and claims those with a predecessor in the frontier.
+Following Beamer, Asanovic, and Patterson, each level takes whichever step
+examines fewer edges: top-down while the frontier is small, bottom-up once the
+frontier's edges outnumber those of the vertices still undiscovered, typically
+for the few middle levels of a low-diameter graph.  The frontier and the set of
+visited vertices are NumPy boolean arrays, and each step is a handful of array
+operations instead of a Python loop over edges."""
+
+import numpy as np
+from csr_graph import CSRGraph
+
+
+def _gather(csr_offsets, csr_targets, vertices):
+	"""Return the arrays (tails, heads) of all edges leaving the given vertices in a
+	CSR graph, grouped by tail in the order given."""
+	starts = csr_offsets[vertices]
+	counts = csr_offsets[vertices + 1] - starts
+	total = int(counts.sum())
+	if total == 0:
+		return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+	# Position of each edge in the targets array: its tail's start plus its rank among the tail's edges.
+	first = np.cumsum(counts) - counts
+	positions = np.arange(total) + np.repeat(starts - first, counts)
+	return np.repeat(vertices, counts), csr_targets[positions]
+
+
+def bfs_csr(G, sources, goal=None, G_transpose=None, alpha=1.0):
+	"""Perform breadth-first search from one or more sources.
+
+	Arguments:
+	G -- the graph, a CSRGraph or any graph with a to_csr method
+	sources -- index of the source vertex, or list of indices for a multi-source search
+	goal -- optional index of a vertex at which to stop, once its level is complete
+	G_transpose -- for a directed graph, the CSR transpose of G, used by bottom-up steps.
+	Computed if omitted.  An undirected graph is its own transpose.
+	alpha -- a level runs bottom-up when alpha times the number of edges leaving the
+	frontier exceeds the number of edges entering undiscovered vertices
+
+	Returns:
+	dist -- NumPy array of the number of edges from the nearest source, infinity if
+	unreachable (or not reached before stopping at goal)
+	pi -- NumPy integer array of predecessors, -1 for the sources and for vertices
+	not reached
+	"""
+	csr = G if isinstance(G, CSRGraph) else G.to_csr()
+	if csr.is_directed():
+		transpose = G_transpose if G_transpose is not None else csr.transpose()
+		if not isinstance(transpose, CSRGraph):
+			transpose = transpose.to_csr()
+	else:
+		transpose = csr
+	card_V = csr.get_card_V()
+	offsets, targets = csr.get_offsets(), csr.get_targets()
+	in_offsets, in_targets = transpose.get_offsets(), transpose.get_targets()
+	out_degree = np.diff(offsets)
+	in_degree = np.diff(in_offsets)
+
+	dist = np.full(card_V, np.inf)
+	pi = np.full(card_V, -1, dtype=np.int64)
+	visited = np.zeros(card_V, dtype=bool)
+	frontier = np.unique(np.atleast_1d(np.asarray(sources, dtype=np.int64)))
+	visited[frontier] = True
+	dist[frontier] = 0
+	unvisited_edges = int(in_degree.sum() - in_degree[frontier].sum())  # edges entering undiscovered vertices
+
+	level = 0
+	while len(frontier) > 0 and (goal is None or not visited[goal]):
+		level += 1
+		frontier_edges = int(out_degree[frontier].sum())
+		if alpha * frontier_edges > unvisited_edges:
+			# Bottom-up: each undiscovered vertex looks for a predecessor in the frontier.
+			in_frontier = np.zeros(card_V, dtype=bool)
+			in_frontier[frontier] = True
+			heads, tails = _gather(in_offsets, in_targets, np.flatnonzero(~visited))
+			hit = in_frontier[tails]
+			heads, tails = heads[hit], tails[hit]
+		else:
+			# Top-down: each frontier vertex claims its undiscovered successors.
+			tails, heads = _gather(offsets, targets, frontier)
+			new = ~visited[heads]
+			tails, heads = tails[new], heads[new]
+		# Keep the first predecessor found for each newly discovered vertex.
+		frontier, first = np.unique(heads, return_index=True)
+		visited[frontier] = True
+		dist[frontier] = level
+		pi[frontier] = tails[first]
+		unvisited_edges -= int(in_degree[frontier].sum())
+	return dist, pi
+
+
+def fewest_stops_path(G, source, goal, G_transpose=None):
+	"""Return a path from source to goal with the fewest edges, as a list of vertices,
+	or None if goal is unreachable.  The search stops once goal is reached."""
+	dist, pi = bfs_csr(G, source, goal, G_transpose)
+	if dist[goal] == np.inf:
+		return None
+	path = [goal]
+	while path[-1] != source:
+		path.append(int(pi[path[-1]]))
+	path.reverse()
+	return path
+
+
+# Testing
+if __name__ == "__main__":
+
+	from time import perf_counter
+	from random import seed
+	from adjacency_list_graph import AdjacencyListGraph
+	from bfs import bfs
+	from generate_random_graph import generate_random_graph
+
+	seed(2024)
+
+	# Undirected, textbook example.
+	vertices = ['r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z']
+	edges = [('r', 's'), ('r', 't'), ('r', 'w'), ('s', 'u'), ('s', 'v'),
+			 ('t', 'u'), ('u', 'y'), ('v', 'w'), ('v', 'y'), ('w', 'x'),
+			 ('w', 'z'), ('x', 'y'), ('x', 'z')]
+	graph1 = AdjacencyListGraph.from_edge_list(len(vertices),
+											   [(vertices.index(u), vertices.index(v)) for u, v in edges], False)
+	dist, pi = bfs_csr(graph1, vertices.index('s'))
+	print(dist.tolist() == bfs(graph1, vertices.index('s'))[0])
+	print([vertices[i] for i in fewest_stops_path(graph1, vertices.index('s'), vertices.index('z'))])
+
+	# Distances agree with bfs, for any alpha, directed and undirected.
+	all_equal = True
+	for directed in [True, False]:
+		G = generate_random_graph(300, 0.01, True, directed)
+		for s in range(0, 300, 30):
+			expected = bfs(G, s)[0]
+			for alpha in [0.0, 1.0, 1e9]:  # always top-down, mixed, always bottom-up
+				dist, pi = bfs_csr(G, s, alpha=alpha)
+				# Each predecessor is one level closer to the source.
+				tree_ok = all(pi[v] == -1 or dist[pi[v]] + 1 == dist[v] for v in range(300))
+				if dist.tolist() != expected or not tree_ok:
+					print("Mismatch from source", s, "alpha", alpha)
+					all_equal = False
+	print("Distances " + ("agree" if all_equal else "do not agree") + " with bfs")
+
+	# Multiple sources give the distance to the nearest one.
+	dist, pi = bfs_csr(G, [0, 1, 2])
+	print(dist.tolist() == np.minimum.reduce([bfs(G, s)[0] for s in [0, 1, 2]]).tolist())
+
+	# A million edges.
+	card_V, degree = 200000, 5
+	rng = np.random.default_rng(2024)
+	heads = rng.integers(0, card_V, size=card_V * degree)
+	large = CSRGraph(card_V, np.arange(0, card_V * degree + 1, degree), heads)
+	large_transpose = large.transpose()
+	start = perf_counter()
+	dist, pi = bfs_csr(large, 0, G_transpose=large_transpose)
+	print("Million-edge BFS:", round(perf_counter() - start, 3), "seconds,", int(dist[np.isfinite(dist)].max()), "levels")
+	start = perf_counter()
+	dist, pi = bfs_csr(large, 0, G_transpose=large_transpose, alpha=0.0)
+	print("Top-down only:", round(perf_counter() - start, 3), "seconds")
+	start = perf_counter()
+	path = fewest_stops_path(large, 0, 12345, large_transpose)
+	print("Path to 12345:", path, round(perf_counter() - start, 3), "seconds")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# disjoint_set_array.py
+
+"""Disjoint sets of the integers 0, 1, ..., n-1, as a forest stored in two lists.
+
+The same disjoint-set forest as in disjoint_set_forest.py, with union by rank,
+but with parent[x] and rank[x] kept in lists indexed by x instead of in one
+ForestNode object per element.  find is a loop that uses path halving, making
+every other node on the find path point to its grandparent, which gives the
+same amortized bounds as full path compression without recursion."""
+
+
+class DisjointSet:
+
+	def __init__(self, n):
+		"""Make n singleton sets {0}, {1}, ..., {n-1}."""
+		self.parent = list(range(n))  # each root is its own parent
+		self.rank = [0] * n
+		self.count = n  # number of sets
+
+	def __len__(self):
+		"""Return the number of elements."""
+		return len(self.parent)
+
+	def get_count(self):
+		"""Return the number of disjoint sets."""
+		return self.count
+
+	def make_set(self):
+		"""Add a new element in a singleton set, and return the element."""
+		x = len(self.parent)
+		self.parent.append(x)
+		self.rank.append(0)
+		self.count += 1
+		return x
+
+	def find(self, x):
+		"""Return the root of the set containing x."""
+		parent = self.parent
+		while parent[x] != x:
+			parent[x] = parent[parent[x]]  # path halving
+			x = parent[x]
+		return x
+
+	def union(self, x, y):
+		"""Unite the set containing x and the set containing y.
+
+		Returns:
+		True if the sets were different and have been united, False if x and y
+		were already in the same set
+		"""
+		x = self.find(x)
+		y = self.find(y)
+		if x == y:
+			return False
+		# The root with larger rank becomes the parent of the root with the smaller rank.
+		if self.rank[x] > self.rank[y]:
+			self.parent[y] = x
+		else:
+			self.parent[x] = y
+			if self.rank[x] == self.rank[y]:
+				self.rank[y] += 1
+		self.count -= 1
+		return True
+
+	def same_set(self, x, y):
+		"""Return True if x and y are in the same set, False otherwise."""
+		return self.find(x) == self.find(y)
+
+	def get_sets(self):
+		"""Return a list of the sets, each a list of its elements in increasing order."""
+		sets = {}
+		for x in range(len(self.parent)):
+			sets.setdefault(self.find(x), []).append(x)
+		return list(sets.values())
+
+
+# Testing
+if __name__ == "__main__":
+
+	letters = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
+	sets = DisjointSet(len(letters))
+	for i in range(0, len(letters), 2):
+		sets.union(i, i + 1)
+	print(sets.get_count(), [[letters[x] for x in s] for s in sets.get_sets()])
+	for i in range(0, len(letters), 4):
+		sets.union(i, i + 2)
+	print(sets.get_count(), [[letters[x] for x in s] for s in sets.get_sets()])
+	print(sets.union(0, 4), sets.union(1, 7))  # True, then already in the same set
+	print(sets.get_count(), sets.same_set(3, 6))
+
+	# A long chain does not hit the recursion limit.
+	n = 100000
+	chain = DisjointSet(n)
+	for i in range(n - 1):
+		chain.parent[i] = i + 1  # worst case: a path of length n - 1
+	print(chain.find(0) == n - 1, chain.find(0) == n - 1)
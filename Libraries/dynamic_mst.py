@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# dynamic_mst.py
+
+"""Minimum spanning forest maintained under edge insertions and deletions.
+
+The edges of the graph are split into essential ones, in the current minimum
+spanning forest, and closable ones, not in it.  Inserting edge (u, v) either
+joins two trees or closes a cycle with the tree path from u to v; by the cycle
+property, the new edge enters the forest exactly when it is lighter than the
+heaviest edge on that path, which then becomes closable.  Deleting an essential
+edge splits its tree in two, and by the cut property the lightest closable
+edge crossing between the two parts, if any, becomes essential.  Each update
+takes O(V) time to walk the forest plus, for a deletion, O(E) to scan the
+closable edges, instead of the O(E lg E) of recomputing the forest."""
+
+from adjacency_list_graph import AdjacencyListGraph
+from mst import fast_kruskal
+
+
+def _key(u, v):
+	"""Return the dictionary key of the undirected edge (u, v)."""
+	return (u, v) if u < v else (v, u)
+
+
+class DynamicMST:
+
+	def __init__(self, G):
+		"""Compute the minimum spanning forest of an undirected, weighted graph G with
+		Kruskal's algorithm, and get ready to maintain it.  Parallel edges keep the
+		lightest weight."""
+		if G.is_directed():
+			raise RuntimeError("Graph should be undirected.")
+		self.card_V = G.get_card_V()
+		self.tree = [{} for u in range(self.card_V)]  # tree[u] maps u's forest neighbours to weights
+		self.closable = {}  # dictionary from (u, v), u < v, to weight, for edges not in the forest
+		self.total_weight = 0
+
+		for u, v, weight in zip(*(array.tolist() for array in fast_kruskal(G, "edges"))):
+			self._link(u, v, weight)
+		for u in range(self.card_V):
+			for edge in G.get_adj_list(u):
+				v, weight = edge.get_v(), edge.get_weight()
+				key = _key(u, v)
+				if u != v and v not in self.tree[u] and weight < self.closable.get(key, float('inf')):
+					self.closable[key] = weight
+
+	def _link(self, u, v, weight):
+		"""Make (u, v) an essential edge."""
+		self.tree[u][v] = weight
+		self.tree[v][u] = weight
+		self.total_weight += weight
+
+	def _cut(self, u, v):
+		"""Remove the essential edge (u, v) from the forest, and return its weight."""
+		weight = self.tree[u].pop(v)
+		del self.tree[v][u]
+		self.total_weight -= weight
+		return weight
+
+	def get_card_V(self):
+		"""Return the number of vertices."""
+		return self.card_V
+
+	def get_total_weight(self):
+		"""Return the total weight of the minimum spanning forest."""
+		return self.total_weight
+
+	def is_essential(self, u, v):
+		"""Return True if (u, v) is an edge of the minimum spanning forest."""
+		return v in self.tree[u]
+
+	def has_edge(self, u, v):
+		"""Return True if (u, v) is an edge of the graph, essential or closable."""
+		return v in self.tree[u] or _key(u, v) in self.closable
+
+	def get_essential_edges(self):
+		"""Return a list of the edges (u, v, weight) of the minimum spanning forest, with u < v."""
+		return [(u, v, weight) for u in range(self.card_V) for v, weight in self.tree[u].items() if u < v]
+
+	def get_closable_edges(self):
+		"""Return a list of the edges (u, v, weight) not in the minimum spanning forest, with u < v."""
+		return [(u, v, weight) for (u, v), weight in self.closable.items()]
+
+	def to_graph(self):
+		"""Return the minimum spanning forest as an undirected, weighted AdjacencyListGraph."""
+		return AdjacencyListGraph.from_edge_list(self.card_V, self.get_essential_edges(), False, True)
+
+	def tree_path(self, u, v):
+		"""Return the list of vertices on the forest path from u to v, None if u and v are
+		in different trees."""
+		pred = {u: None}
+		stack = [u]
+		while len(stack) > 0 and v not in pred:
+			x = stack.pop()
+			for y in self.tree[x]:
+				if y not in pred:
+					pred[y] = x
+					stack.append(y)
+		if v not in pred:
+			return None
+		path = []
+		while v is not None:
+			path.append(v)
+			v = pred[v]
+		path.reverse()
+		return path
+
+	def _heaviest_on_path(self, path):
+		"""Return the heaviest edge (a, b, weight) on a forest path."""
+		heaviest = None
+		for i in range(len(path) - 1):
+			weight = self.tree[path[i]][path[i + 1]]
+			if heaviest is None or weight > heaviest[2]:
+				heaviest = (path[i], path[i + 1], weight)
+		return heaviest
+
+	def insert_edge(self, u, v, weight):
+		"""Insert edge (u, v) with the given weight into the graph and update the forest.
+
+		Returns:
+		The previously essential edge (a, b, weight) that the new edge replaces and that
+		is now closable, or None if no edge became closable
+		"""
+		if u == v:
+			raise RuntimeError("Self-loops are not allowed.")
+		if self.has_edge(u, v):
+			raise RuntimeError("Edge (" + str(u) + ", " + str(v) + ") is already in the graph.")
+		path = self.tree_path(u, v)
+		if path is None:  # joins two trees
+			self._link(u, v, weight)
+			return None
+		a, b, heaviest = self._heaviest_on_path(path)
+		if weight >= heaviest:  # the new edge is the heaviest on its cycle
+			self.closable[_key(u, v)] = weight
+			return None
+		self._cut(a, b)
+		self.closable[_key(a, b)] = heaviest
+		self._link(u, v, weight)
+		return _key(a, b) + (heaviest,)
+
+	def replacement_edge(self, u, v):
+		"""Return the closable edge (a, b, weight) that would become essential if the
+		essential edge (u, v) were deleted, or None if there is none and deleting (u, v)
+		would disconnect its tree.  The forest is left unchanged."""
+		if not self.is_essential(u, v):
+			raise RuntimeError("Edge (" + str(u) + ", " + str(v) + ") is not essential.")
+		# Find the vertices on u's side of the tree once (u, v) is removed.
+		side = {u}
+		stack = [u]
+		while len(stack) > 0:
+			x = stack.pop()
+			for y in self.tree[x]:
+				if y not in side and not (x == u and y == v):
+					side.add(y)
+					stack.append(y)
+		# The lightest closable edge crossing the cut replaces (u, v).
+		best = None
+		for (a, b), weight in self.closable.items():
+			if (a in side) != (b in side) and (best is None or weight < best[2]):
+				best = (a, b, weight)
+		return best
+
+	def delete_edge(self, u, v):
+		"""Delete edge (u, v) from the graph and update the forest.
+
+		Returns:
+		The previously closable edge (a, b, weight) that has become essential, or None if
+		no edge became essential
+		"""
+		key = _key(u, v)
+		if key in self.closable:
+			del self.closable[key]
+			return None
+		replacement = self.replacement_edge(u, v)
+		self._cut(u, v)
+		if replacement is not None:
+			a, b, weight = replacement
+			del self.closable[(a, b)]
+			self._link(a, b, weight)
+		return replacement
+
+
+# Testing
+if __name__ == "__main__":
+
+	from random import choice, randint, seed
+	from generate_random_graph import generate_random_graph
+	from london_underground import load_london_underground
+	from mst import kruskal, get_total_weight
+
+	seed(2024)
+
+	# Random updates agree with recomputing the MST from scratch.
+	card_V = 60
+	G = generate_random_graph(card_V, 0.1, True, False, True, 1, 20)
+	dynamic = DynamicMST(G)
+	print(dynamic.get_total_weight() == get_total_weight(kruskal(G)))
+	all_equal = True
+	for step in range(200):
+		if randint(0, 1) == 0 and len(dynamic.get_essential_edges()) > 0:
+			u, v, weight = choice(dynamic.get_essential_edges() + dynamic.get_closable_edges())
+			dynamic.delete_edge(u, v)
+		else:
+			u, v = randint(0, card_V - 1), randint(0, card_V - 1)
+			if u == v or dynamic.has_edge(u, v):
+				continue
+			dynamic.insert_edge(u, v, randint(1, 20))
+		edges = dynamic.get_essential_edges() + dynamic.get_closable_edges()
+		H = AdjacencyListGraph.from_edge_list(card_V, edges, False, True)
+		if dynamic.get_total_weight() != get_total_weight(kruskal(H)):
+			print("Mismatch after step", step)
+			all_equal = False
+	print("Dynamic MST " + ("agrees" if all_equal else "does not agree") + " with Kruskal's algorithm")
+
+	# What-if closures on the London Underground.
+	stations, G = load_london_underground()
+	dynamic = DynamicMST(G)
+	print(len(dynamic.get_essential_edges()), "essential and", len(dynamic.get_closable_edges()), "closable connections")
+	for u, v, weight in dynamic.get_essential_edges()[:10]:
+		replacement = dynamic.replacement_edge(u, v)
+		if replacement is not None:
+			a, b, minutes = replacement
+			print("Closing", stations[u], "-", stations[v], "makes", stations[a], "-", stations[b], "essential")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# dynamic_sssp.py
+
+"""Repair single-source shortest paths after edge weights change or edges close.
+
+Given shortest-path weights d and predecessors pi from a source s, as computed
+by dijkstra, and a batch of edge updates, only the vertices whose shortest
+paths change are revisited, in the manner of Ramalingam and Reps:
+
+- When a tree edge (pi[v], v) becomes heavier or closes, the vertices in the
+  subtree of v lose their shortest paths.  Their distances are reset, each gets
+  a tentative distance through its best in-neighbour outside the subtree, and
+  Dijkstra's algorithm, started from just those vertices, settles them.
+- When an edge (u, v) becomes lighter or opens, and d[u] + weight < d[v], the
+  improvement propagates from v by Dijkstra's algorithm, stopping wherever a
+  distance does not improve.
+
+Heavier non-tree edges change nothing.  The work is proportional to the number
+of vertices whose distances or predecessors change and the edges around them."""
+
+from heapq import heappush, heappop
+
+
+def update_shortest_paths(G, d, pi, updates, G_transpose=None):
+	"""Apply edge updates to G and repair d and pi in place.
+
+	Arguments:
+	G -- a weighted AdjacencyListGraph with nonnegative weights, directed or undirected
+	d -- shortest-path weights from a source vertex in G before the updates, as from dijkstra
+	pi -- predecessors from the source in G before the updates
+	updates -- list of (u, v, weight) triples.  A weight sets the weight of edge (u, v),
+	inserting the edge if it is absent, and None closes the edge.  For an
+	undirected graph both directions change.
+	G_transpose -- for a directed graph, the transpose of G, which gives each vertex's
+	in-edges and which is updated too.  If omitted, it is computed, in O(V + E) time.
+	Undirected graphs do not need it.
+
+	Returns:
+	The set of vertices whose distance or predecessor changed
+	"""
+	directed = G.is_directed()
+	if directed and G_transpose is None:
+		G_transpose = G.transpose()
+	incoming = G_transpose if directed else G
+
+	# Apply the updates, remembering the weight each edge had before the batch, so that
+	# several updates of the same edge count as one, from its first weight to its last.
+	before = {}  # edge (u, v), with u <= v if undirected, -> weight before the batch, or None
+	for u, v, weight in updates:
+		edge = G.find_edge(u, v)
+		old_weight = None if edge is None else edge.get_weight()
+		before.setdefault((u, v) if directed or u <= v else (v, u), old_weight)
+		if weight is None:
+			G.delete_edge(u, v)
+			if directed:
+				G_transpose.delete_edge(v, u)
+		elif edge is None:
+			G.insert_edge(u, v, weight)
+			if directed:
+				G_transpose.insert_edge(v, u, weight)
+		else:
+			edge.set_weight(weight)
+			if directed:
+				G_transpose.find_edge(v, u).set_weight(weight)
+			else:
+				G.find_edge(v, u).set_weight(weight)
+
+	# Where shortest paths break or may improve.
+	broken = []     # vertices whose tree edge became heavier or closed
+	improved = []   # edges (u, v, weight) that became lighter or opened
+	for (u, v), old_weight in before.items():
+		edge = G.find_edge(u, v)
+		weight = None if edge is None else edge.get_weight()
+		for a, b in [(u, v)] if directed else [(u, v), (v, u)]:
+			if old_weight is not None and (weight is None or weight > old_weight):
+				if pi[b] == a:
+					broken.append(b)
+			elif weight is not None and (old_weight is None or weight < old_weight):
+				improved.append((a, b, weight))
+
+	old = {}  # original (d, pi) of every vertex touched
+	heap = []
+
+	# Heavier or closed tree edges: reset the subtrees below them.
+	affected = set(broken)
+	stack = list(affected)
+	while len(stack) > 0:
+		x = stack.pop()
+		for edge in G.get_adj_list(x):
+			y = edge.get_v()
+			if pi[y] == x and y not in affected:
+				affected.add(y)
+				stack.append(y)
+	for x in affected:
+		old[x] = (d[x], pi[x])
+		d[x] = float('inf')
+		pi[x] = None
+	for x in affected:
+		# Best path through an in-neighbour whose distance is still valid.
+		for edge in incoming.get_adj_list(x):
+			p = edge.get_v()
+			if p not in affected and d[p] + edge.get_weight() < d[x]:
+				d[x] = d[p] + edge.get_weight()
+				pi[x] = p
+		if d[x] < float('inf'):
+			heappush(heap, (d[x], x))
+
+	# Lighter or opened edges: start improvements at their heads.
+	for u, v, weight in improved:
+		if d[u] + weight < d[v]:
+			old.setdefault(v, (d[v], pi[v]))
+			d[v] = d[u] + weight
+			pi[v] = u
+			heappush(heap, (d[v], v))
+
+	# Dijkstra's algorithm from the vertices whose distances were set above.
+	while len(heap) > 0:
+		d_x, x = heappop(heap)
+		if d_x > d[x]:  # stale entry
+			continue
+		for edge in G.get_adj_list(x):
+			y = edge.get_v()
+			d_y = d_x + edge.get_weight()
+			if d_y < d[y]:
+				old.setdefault(y, (d[y], pi[y]))
+				d[y] = d_y
+				pi[y] = x
+				heappush(heap, (d_y, y))
+
+	return {x for x, before in old.items() if before != (d[x], pi[x])}
+
+
+# Testing
+if __name__ == "__main__":
+
+	from random import randint, random, seed
+	from time import perf_counter
+	from adjacency_list_graph import AdjacencyListGraph
+	from dijkstra import dijkstra
+	from generate_random_graph import generate_random_graph
+	from london_underground import load_london_underground
+
+	seed(2024)
+
+	# Random batches of updates agree with running Dijkstra's algorithm again.
+	all_equal = True
+	for directed in [True, False]:
+		card_V = 80
+		G = generate_random_graph(card_V, 0.06, True, directed, True, 1, 20)
+		G_transpose = G.transpose() if directed else None
+		d, pi = dijkstra(G, 0)
+		for batch in range(100):
+			updates = []
+			for i in range(randint(1, 3)):
+				u, v = randint(0, card_V - 1), randint(0, card_V - 1)
+				if len(updates) > 0 and random() < 0.3:  # update an edge already in the batch again
+					u, v = updates[randint(0, len(updates) - 1)][:2]
+					if not directed and random() < 0.5:
+						u, v = v, u
+				if u == v:
+					continue
+				if G.has_edge(u, v) and random() < 0.3:
+					updates.append((u, v, None))
+				else:
+					updates.append((u, v, randint(1, 20)))
+			update_shortest_paths(G, d, pi, updates, G_transpose)
+			expected = dijkstra(G, 0)[0]
+			# Every predecessor edge must also give the distance.
+			tree_ok = all(pi[v] is None or d[pi[v]] + G.find_edge(pi[v], v).get_weight() == d[v]
+						  for v in range(card_V))
+			if d != expected or not tree_ok:
+				print("Mismatch after batch", batch, "directed" if directed else "undirected")
+				all_equal = False
+	print("Repaired distances " + ("agree" if all_equal else "do not agree") + " with Dijkstra's algorithm")
+
+	# Opening and closing an edge in one batch, and lowering then raising one.
+	for batch in [[(0, 2, 1), (0, 2, None)], [(1, 2, 1), (1, 2, 5)]]:
+		G = AdjacencyListGraph(3, True, True)
+		G.insert_edge(0, 1, 1)
+		G.insert_edge(1, 2, 10)
+		d, pi = dijkstra(G, 0)
+		update_shortest_paths(G, d, pi, batch)
+		print(batch, d, pi, d == dijkstra(G, 0)[0])
+
+	# A single delay on the London Underground.
+	stations, G = load_london_underground()
+	s = stations.index("Wimbledon")
+	d, pi = dijkstra(G, s)
+	u, v = stations.index("Harrow-on-the-Hill"), stations.index("North Harrow")
+	start = perf_counter()
+	changed = update_shortest_paths(G, d, pi, [(u, v, G.find_edge(u, v).get_weight() + 5)])
+	repair_time = perf_counter() - start
+	start = perf_counter()
+	expected = dijkstra(G, s)[0]
+	dijkstra_time = perf_counter() - start
+	print(len(changed), "stations changed;", d == expected, "; repair", round(repair_time * 1e6), "us, Dijkstra",
+		  round(dijkstra_time * 1e6), "us")
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# fibonacci_heap_priority_queue.py
+
+"""Minimum priority queue implemented with a Fibonacci heap.
+
+A Fibonacci heap is a collection of heap-ordered trees whose roots form a
+circular, doubly linked root list.  Insert, meld, and decrease_key take O(1)
+amortized time; extract_min consolidates the root list so that no two roots
+have the same degree, in O(log n) amortized time.  Meld also merges the
+dictionaries from objects to nodes, in time linear in the smaller queue.  The
+procedures follow Chapter 19 of the third edition of the textbook, with
+consolidation and cascading cuts written as loops.  The keys of the objects are
+read once, upon insertion, and kept in the nodes."""
+
+
+class FibonacciHeapNode:
+
+    __slots__ = "item", "key", "parent", "child", "left", "right", "degree", "mark"
+
+    def __init__(self, item, key):
+        """Initialize a node holding item with the given key, in a list by itself."""
+        self.item = item
+        self.key = key
+        self.parent = None
+        self.child = None  # any one child
+        self.left = self   # siblings in a circular, doubly linked list
+        self.right = self
+        self.degree = 0    # number of children
+        self.mark = False  # has node lost a child since it became a child itself?
+
+
+def _splice(a, b):
+    """Concatenate the circular lists containing nodes a and b."""
+    a_right = a.right
+    b_left = b.left
+    a.right = b
+    b.left = a
+    b_left.right = a_right
+    a_right.left = b_left
+
+
+def _remove(x):
+    """Remove node x from its circular list, leaving x in a list by itself."""
+    x.left.right = x.right
+    x.right.left = x.left
+    x.left = x
+    x.right = x
+
+
+class MinFibonacciHeapPriorityQueue:
+
+    def __init__(self, get_key_func, set_key_func=None):
+        """Initialize an empty minimum priority queue implemented with a Fibonacci heap.
+
+        Arguments:
+        get_key_func -- required function that returns the key of an object upon insertion
+        set_key_func -- optional function that sets the key of an object
+        """
+        self.get_key = get_key_func
+        self.set_key = set_key_func
+        self.min = None  # root with the minimum key, None if the heap is empty
+        self.nodes = {}  # dictionary from objects to their nodes
+
+    def get_size(self):
+        """Return the number of objects in the priority queue."""
+        return len(self.nodes)
+
+    def minimum(self):
+        """Return the object with the minimum key."""
+        if self.min is None:  # error if heap is empty
+            raise RuntimeError("Heap underflow.")
+        return self.min.item
+
+    def insert(self, x):
+        """Insert object x into the priority queue."""
+        if x in self.nodes:
+            raise RuntimeError("Object " + str(x) + " is already in the priority queue.")
+        node = FibonacciHeapNode(x, self.get_key(x))
+        self.nodes[x] = node
+        self._add_root(node)
+
+    def _add_root(self, node):
+        """Add node, in a list by itself, to the root list, updating the minimum."""
+        if self.min is None:
+            self.min = node
+        else:
+            _splice(self.min, node)
+            if node.key < self.min.key:
+                self.min = node
+
+    def extract_min(self):
+        """Return and delete the object with the minimum key."""
+        z = self.min
+        if z is None:  # error if heap is empty
+            raise RuntimeError("Heap underflow.")
+        del self.nodes[z.item]
+
+        # Make each child of z a root.
+        child = z.child
+        if child is not None:
+            x = child
+            while True:
+                x.parent = None
+                x = x.right
+                if x is child:
+                    break
+            _splice(z, child)
+            z.child = None
+
+        if z.right is z:  # z was the only node
+            self.min = None
+        else:
+            self.min = z.right
+            _remove(z)
+            self._consolidate()
+        return z.item
+
+    def _consolidate(self):
+        """Link roots of equal degree until every root has a different degree, then
+        find the new minimum."""
+        by_degree = {}  # dictionary from degrees to the roots having them
+        roots = []
+        x = self.min
+        while True:
+            roots.append(x)
+            x = x.right
+            if x is self.min:
+                break
+
+        for x in roots:
+            d = x.degree
+            while d in by_degree:
+                y = by_degree.pop(d)
+                if y.key < x.key:
+                    x, y = y, x
+                # Link y as a child of x.
+                _remove(y)
+                y.parent = x
+                y.mark = False
+                if x.child is None:
+                    x.child = y
+                else:
+                    _splice(x.child, y)
+                x.degree += 1
+                d += 1
+            by_degree[d] = x
+
+        self.min = None
+        for x in by_degree.values():
+            x.left = x
+            x.right = x
+            self._add_root(x)
+
+    def decrease_key(self, x, k):
+        """Decrease the key of object x to value k.  Error if k is greater than x's current key.
+            Cut x from its parent if the heap order is violated, with cascading cuts.
+
+        Arguments:
+        x -- object whose key has been decreased
+        k -- new key of x
+        """
+        node = self.nodes[x]
+        if k > node.key:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(node.key))
+        node.key = k
+        if self.set_key is not None:
+            self.set_key(x, k)
+        parent = node.parent
+        if parent is not None and node.key < parent.key:
+            self._cut(node, parent)
+            # Cascading cut: move up the tree while the ancestors have lost a child already.
+            node = parent
+            parent = node.parent
+            while parent is not None:
+                if not node.mark:
+                    node.mark = True
+                    break
+                self._cut(node, parent)
+                node = parent
+                parent = node.parent
+        if k < self.min.key:
+            self.min = self.nodes[x]
+
+    def _cut(self, x, parent):
+        """Cut node x from its parent and make it a root."""
+        if parent.child is x:
+            parent.child = None if x.right is x else x.right
+        _remove(x)
+        parent.degree -= 1
+        x.parent = None
+        x.mark = False
+        self._add_root(x)
+
+    def meld(self, other):
+        """Move all the objects of another MinFibonacciHeapPriorityQueue into this one,
+        leaving the other queue empty.  The two queues must hold different objects,
+        which is not checked.  Joining the heaps takes O(1) time, and joining the
+        dictionaries from objects to nodes takes time linear in the smaller queue."""
+        if other is self or other.min is None:
+            return
+        if len(self.nodes) < len(other.nodes):
+            self.nodes, other.nodes = other.nodes, self.nodes
+        self.nodes.update(other.nodes)
+        if self.min is None:
+            self.min = other.min
+        else:
+            _splice(self.min, other.min)
+            if other.min.key < self.min.key:
+                self.min = other.min
+        other.min = None
+        other.nodes = {}
+
+
+# Testing
+if __name__ == "__main__":
+
+    import numpy as np
+    from key_object import KeyObject
+
+    list1 = ["AL", "AK", "AZ", "AR", "CA", "CO", "CT", "HI", "NH", "NY"]
+    objects = [KeyObject(list1[i], i) for i in range(len(list1))]
+    pq1 = MinFibonacciHeapPriorityQueue(KeyObject.get_key, KeyObject.set_key)
+    for x in objects:
+        pq1.insert(x)
+
+    # Decrease last key to -100 which should be the minimum.
+    pq1.decrease_key(objects[-1], -100)
+    print(pq1.minimum() == objects[-1])
+    pq1.extract_min()
+    # After consolidation, decreasing a key inside a tree cuts it out.
+    pq1.decrease_key(objects[5], -50)
+    print(pq1.extract_min() == objects[5])
+
+    extracted_keys = []
+    while pq1.get_size() > 0:
+        extracted_keys.append(KeyObject.get_key(pq1.extract_min()))
+    print(extracted_keys)
+    print(extracted_keys == sorted(extracted_keys))
+
+    # Random keys with interleaved extractions and decreases, and a meld.
+    keys = np.random.randint(0, 1000, size=200).tolist()
+    pq2 = MinFibonacciHeapPriorityQueue(lambda i: keys[i])
+    pq3 = MinFibonacciHeapPriorityQueue(lambda i: keys[i])
+    for i in range(100):
+        pq2.insert(i)
+        pq3.insert(100 + i)
+    removed = pq3.extract_min()  # consolidate pq3 into trees
+    for i in np.random.randint(100, 200, size=100):
+        if i != removed:
+            keys[i] -= np.random.randint(0, 500)
+            pq3.decrease_key(i, keys[i])
+    pq2.meld(pq3)
+    print(pq2.get_size(), pq3.get_size())
+    extracted_keys = []
+    while pq2.get_size() > 0:
+        extracted_keys.append(keys[pq2.extract_min()])
+    print(extracted_keys == sorted(extracted_keys))
+
+    # Check minimum in empty priority queue.
+    try:
+        pq3.extract_min()
+    except RuntimeError as e:
+        print(e)
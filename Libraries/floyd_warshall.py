@@ -31,6 +31,7 @@
 #########################################################################
 
 import numpy as np
+from multiprocessing import Pool, shared_memory
 
 
 def floyd_warshall(W, n):
@@ -81,6 +82,167 @@ def transitive_closure(G, n):
 	return t
 
 
+def floyd_warshall_vectorized(W, n):
+	"""Compute all-pairs shortest paths, replacing the two inner loops of
+	floyd_warshall by one NumPy operation on the whole matrix for each k.
+
+	Arguments:
+	W -- the weighted adjacency matrix for the graph, but with 0 on the diagonal
+	n -- each matrix is n x n
+
+	Returns:
+	n x n matrix of shortest-path weights in G
+	"""
+	d = np.array(W, dtype=float)  # a copy
+	for k in range(n):
+		# Row k and column k do not change in iteration k, so d can be updated in place.
+		np.minimum(d, d[:, k, None] + d[None, k, :], out=d)
+	return d
+
+
+def floyd_warshall_with_predecessors(W, n):
+	"""Compute all-pairs shortest paths and the predecessor matrix, vectorized over i and j.
+
+	Arguments:
+	W -- the weighted adjacency matrix for the graph, but with 0 on the diagonal
+	n -- each matrix is n x n
+
+	Returns:
+	d -- n x n matrix of shortest-path weights in G
+	Pi -- n x n predecessor matrix for print_all_pairs_shortest_path: Pi[i, j] is the
+	predecessor of j on some shortest path from i, or None if i == j or no path exists
+	"""
+	d = np.array(W, dtype=float)
+	# pred[i, j] = i for each edge (i, j), -1 for no predecessor.
+	pred = np.where(np.isfinite(d), np.arange(n)[:, None], -1)
+	np.fill_diagonal(pred, -1)
+	for k in range(n):
+		through_k = d[:, k, None] + d[None, k, :]
+		shorter = through_k < d
+		d[shorter] = through_k[shorter]
+		# A path i ~> k ~> j ends with the last edge of the path k ~> j.
+		pred = np.where(shorter, pred[k, :][None, :], pred)
+
+	Pi = pred.astype(object)
+	Pi[pred < 0] = None
+	return d, Pi
+
+
+def transitive_closure_vectorized(G, n):
+	"""Return the transitive closure of a directed graph, as transitive_closure does,
+	but with one boolean NumPy operation on the whole matrix for each k.
+
+	Argument:
+	G -- a directed graph represented by an adjacency matrix
+	n -- matrices are n x n
+	Returns:
+	A transitive closure matrix in which the [i][j] entry is True
+	if there is a path in G from vertex i to vertex j, False otherwise
+	"""
+	t = G.get_adj_matrix() != G.no_edge
+	t |= np.eye(n, dtype=bool)
+	for k in range(n):
+		t |= t[:, k, None] & t[None, k, :]
+	return t
+
+
+# Shared distance matrix of a blocked Floyd-Warshall worker process, set by _attach_shared.
+_shared_memory = None
+_shared_d = None
+
+
+def _attach_shared(name, n):
+	"""Pool initializer: map the shared n x n distance matrix into this worker process."""
+	global _shared_memory, _shared_d
+	_shared_memory = shared_memory.SharedMemory(name=name)
+	_shared_d = np.ndarray((n, n), dtype=float, buffer=_shared_memory.buf)
+
+
+def _relax_block(d, rows, cols, ks):
+	"""Update block d[rows, cols] with paths through each vertex of range ks, in order."""
+	block = d[rows, cols]
+	for k in ks:
+		np.minimum(block, d[rows, k, None] + d[None, k, cols], out=block)
+
+
+def _relax_block_row(d, bi, kb, block_size, n):
+	"""Update every block in block row bi except the blocks in block column kb.
+
+	These blocks depend only on the blocks in block row and block column kb, which
+	are final for round kb, so that different block rows can be updated in parallel."""
+	rows = slice(bi * block_size, min((bi + 1) * block_size, n))
+	ks = range(kb * block_size, min((kb + 1) * block_size, n))
+	for bj in range((n + block_size - 1) // block_size):
+		if bj != kb:
+			_relax_block(d, rows, slice(bj * block_size, min((bj + 1) * block_size, n)), ks)
+
+
+def _relax_shared_block_row(args):
+	"""Worker task: _relax_block_row on the shared matrix."""
+	_relax_block_row(_shared_d, *args)
+
+
+def blocked_floyd_warshall(W, n, block_size=64, processes=1):
+	"""Compute all-pairs shortest paths with the blocked (tiled) Floyd-Warshall algorithm.
+
+	The matrix is divided into block_size x block_size blocks.  Round kb first
+	updates the diagonal block (kb, kb), then the other blocks of block row and
+	block column kb, which depend only on the diagonal block, and finally all
+	remaining blocks, which are independent of each other and may be spread over
+	worker processes that share the matrix.
+
+	Arguments:
+	W -- the weighted adjacency matrix for the graph, but with 0 on the diagonal
+	n -- each matrix is n x n
+	block_size -- side length of a block
+	processes -- number of worker processes for the independent blocks.  With 1, the
+	default, everything runs in this process.
+
+	Returns:
+	n x n matrix of shortest-path weights in G, the same as floyd_warshall computes
+	"""
+	if processes <= 1:
+		d = np.array(W, dtype=float)
+		_blocked_rounds(d, n, block_size, None)
+		return d
+
+	memory = shared_memory.SharedMemory(create=True, size=max(n * n, 1) * np.dtype(float).itemsize)
+	try:
+		d = np.ndarray((n, n), dtype=float, buffer=memory.buf)
+		d[:] = W
+		with Pool(processes, initializer=_attach_shared, initargs=(memory.name, n)) as pool:
+			_blocked_rounds(d, n, block_size, pool)
+		result = d.copy()
+		del d  # release the view before closing the shared memory
+		return result
+	finally:
+		memory.close()
+		memory.unlink()
+
+
+def _blocked_rounds(d, n, block_size, pool):
+	"""Run all rounds of the blocked Floyd-Warshall algorithm on d, in place.  If pool is
+	not None, d must be the shared matrix that the pool's workers have attached."""
+	num_blocks = (n + block_size - 1) // block_size
+	block = lambda b: slice(b * block_size, min((b + 1) * block_size, n))
+	for kb in range(num_blocks):
+		ks = range(kb * block_size, min((kb + 1) * block_size, n))
+		# Phase 1: the diagonal block.
+		_relax_block(d, block(kb), block(kb), ks)
+		# Phase 2: the rest of block row kb and block column kb.
+		for b in range(num_blocks):
+			if b != kb:
+				_relax_block(d, block(kb), block(b), ks)
+				_relax_block(d, block(b), block(kb), ks)
+		# Phase 3: all other blocks, one task per block row.
+		tasks = [(bi, kb, block_size, n) for bi in range(num_blocks) if bi != kb]
+		if pool is not None:
+			pool.map(_relax_shared_block_row, tasks)
+		else:
+			for task in tasks:
+				_relax_block_row(d, *task)
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -110,3 +272,27 @@ if __name__ == "__main__":
 	print(graph2)
 	tc_result = transitive_closure(graph2, n)
 	print(tc_result)
+	print(np.array_equal(tc_result, transitive_closure_vectorized(graph2, n)))
+
+	# Vectorized versions agree with the loops.
+	from print_all_pairs_shortest_path import print_all_pairs_shortest_path
+	print(np.array_equal(fw_result, floyd_warshall_vectorized(w, len(vertices1))))
+	fw_d, fw_Pi = floyd_warshall_with_predecessors(w, len(vertices1))
+	print(np.array_equal(fw_result, fw_d))
+	print(fw_Pi)
+	print_all_pairs_shortest_path(fw_Pi, 0, 1)
+
+	from generate_random_graph import generate_random_graph
+	n = 60
+	graph3 = generate_random_graph(n, 0.08, False, True, True, 0, 15)
+	w = create_W(graph3, n)
+	print(np.array_equal(floyd_warshall(w, n), floyd_warshall_vectorized(w, n)))
+	print(np.array_equal(transitive_closure(graph3, n), transitive_closure_vectorized(graph3, n)))
+
+	# Blocked version, in this process and with a pool of workers.
+	n = 150
+	graph4 = generate_random_graph(n, 0.03, False, True, True, 0, 15)
+	w = create_W(graph4, n)
+	fw_d = floyd_warshall_vectorized(w, n)
+	print(np.array_equal(fw_d, blocked_floyd_warshall(w, n, 32)))
+	print(np.array_equal(fw_d, blocked_floyd_warshall(w, n, 32, processes=2)))
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# fuzzy_station_index.py
+
+"""Find the stations whose names are closest to a misspelled query.
+
+A query is first put through the lookup key of station_registry and searched
+for in a ChainedHashTable of every name and alias, so that exact matches cost
+one hash.  Otherwise the answer is the k names at the smallest Levenshtein
+(edit) distance from the query, found without computing the distance to every
+name.
+
+Each name is padded with two #s at each end and split into its n + 2
+overlapping trigrams, and an inverted index lists, for every trigram, the names
+containing it and how often.  One edit changes at most 3 trigrams, so a name of
+length n at distance d from a query of length m shares at least
+max(m, n) + 2 - 3d trigrams with it (Ukkonen's q-gram lemma).  Turned around,
+the number of trigrams shared gives a lower bound on the distance.  Distances
+are computed only to the names whose bounds are at most a threshold, which
+starts as low as it can while taking in k names and rises until no name left
+out could be closer than the k-th closest station found.  Counting the shared
+trigrams, from the inverted index, and computing the bounds are NumPy operations
+over all names at once, and the distances to each batch of names are computed
+together by a bit-parallel algorithm, also in NumPy."""
+
+import numpy as np
+from chained_hashtable import ChainedHashTable
+from station_registry import lookup_key
+
+PAD = "##"
+
+
+def trigrams(key):
+	"""Return the dictionary from each trigram of the padded key to its number of occurrences."""
+	padded = PAD + key + PAD
+	counts = {}
+	for i in range(len(padded) - 2):
+		gram = padded[i:i + 3]
+		counts[gram] = counts.get(gram, 0) + 1
+	return counts
+
+
+def levenshtein(a, b, bound=None):
+	"""Return the Levenshtein distance between strings a and b: the fewest insertions,
+	deletions, and substitutions of single characters that turn a into b.
+
+	Arguments:
+	a, b -- the strings
+	bound -- optional bound.  If the distance exceeds it, bound + 1 is returned as
+	soon as that is certain, which saves time.
+	"""
+	if len(a) < len(b):
+		a, b = b, a
+	if bound is None:
+		bound = len(a)
+	if len(a) - len(b) > bound:
+		return bound + 1
+	previous = list(range(len(b) + 1))
+	for i in range(1, len(a) + 1):
+		current = [i] + [0] * len(b)
+		x = a[i - 1]
+		for j in range(1, len(b) + 1):
+			current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != b[j - 1]))
+		if min(current) > bound:  # every later row is at least as large
+			return bound + 1
+		previous = current
+	return min(previous[-1], bound + 1)
+
+
+def _edit_distances(key, codes, lengths, alphabet):
+	"""Return the array of Levenshtein distances from key to each of a batch of names.
+
+	Myers' bit-parallel algorithm, in the form of Hyyrö for whole strings, keeps
+	a column of the dynamic-programming table as the bits of two words, one for the
+	rows that rise by one from the row above and one for those that fall by one,
+	and advances it by one character of a name with a handful of word operations.
+	The words of all the names in the batch are NumPy arrays, which advance together.
+
+	Arguments:
+	key -- the query, of at most 64 characters
+	codes -- 2-D array of the names' characters, as codes from alphabet, padded at the end
+	lengths -- array of the names' lengths
+	alphabet -- dictionary from characters to codes.  The padding code is len(alphabet).
+	"""
+	m = len(key)
+	if m == 0:
+		return lengths.copy()
+	peq = np.zeros(len(alphabet) + 1, dtype=np.uint64)  # bits of the rows holding each character
+	for row, character in enumerate(key):
+		code = alphabet.get(character)
+		if code is not None:
+			peq[code] |= np.uint64(1 << row)
+	mask = np.uint64((1 << m) - 1)
+	last = np.uint64(1 << (m - 1))
+	one = np.uint64(1)
+	positive = np.full(len(codes), mask)  # rows rising by one
+	negative = np.zeros(len(codes), dtype=np.uint64)  # rows falling by one
+	distances = np.full(len(codes), m, dtype=np.int64)
+	for j in range(int(lengths.max())):
+		matches = peq[codes[:, j]]
+		vertical = matches | negative
+		horizontal = (((matches & positive) + positive) ^ positive) | matches
+		rise = negative | ~(horizontal | positive)
+		fall = positive & horizontal
+		active = j < lengths
+		distances += active & ((rise & last) != 0)
+		distances -= active & ((fall & last) != 0)
+		rise = ((rise << one) | one) & mask  # the top row rises by one in every column
+		fall = (fall << one) & mask
+		positive = (fall | ~(vertical | rise)) & mask
+		negative = rise & vertical
+	return distances
+
+
+class FuzzyStationIndex:
+
+	def __init__(self, registry):
+		"""Index the names and aliases in a StationRegistry.
+
+		Arguments:
+		registry -- the StationRegistry, whose ids the searches return
+		"""
+		self.registry = registry
+		self.keys = list(registry.ids.items())  # (lookup key, station id) of each name and alias
+		self.exact = ChainedHashTable(max(1, 2 * len(self.keys)), get_key_func=lambda entry: entry[0])
+		postings = {}  # trigram -> (positions in self.keys, occurrences)
+		for position, (key, i) in enumerate(self.keys):
+			self.exact.insert((key, i))
+			for gram, count in trigrams(key).items():
+				lists = postings.setdefault(gram, ([], []))
+				lists[0].append(position)
+				lists[1].append(count)
+		self.postings = {gram: (np.array(positions, dtype=np.int32), np.array(counts, dtype=np.int32))
+						 for gram, (positions, counts) in postings.items()}
+		self.lengths = np.array([len(key) for key, i in self.keys], dtype=np.int64)
+		self.station_ids = np.array([i for key, i in self.keys], dtype=np.int64)
+
+		# The names as rows of character codes, for _edit_distances.
+		self.alphabet = {}
+		for key, i in self.keys:
+			for character in key:
+				self.alphabet.setdefault(character, len(self.alphabet))
+		padding = len(self.alphabet)
+		self.codes = np.full((len(self.keys), int(self.lengths.max(initial=0)) + 1), padding,
+							 dtype=np.uint8 if padding < 256 else np.int32)
+		for position, (key, i) in enumerate(self.keys):
+			self.codes[position, :len(key)] = [self.alphabet[character] for character in key]
+
+	def search_exact(self, query):
+		"""Return the id of the station named query, as a name or alias, or None."""
+		node = self.exact.search(lookup_key(query))
+		return None if node is None else node.data[1]
+
+	def _distances(self, key, positions):
+		"""Return the array of edit distances from key to the names at positions."""
+		if len(positions) == 0:
+			return np.empty(0, dtype=np.int64)
+		if len(key) > 64:
+			return np.array([levenshtein(key, self.keys[p][0]) for p in positions.tolist()], dtype=np.int64)
+		lengths = self.lengths[positions]
+		return _edit_distances(key, self.codes[positions, :int(lengths.max(initial=0))], lengths, self.alphabet)
+
+	def search(self, query, k=5, max_distance=None):
+		"""Return the stations whose names are closest to query.
+
+		Arguments:
+		query -- the name to look for
+		k -- the most stations to return
+		max_distance -- optional largest edit distance, between lookup keys, to return
+
+		Returns:
+		List of up to k (name, id, distance) triples, closest first, with each station
+		once, at the distance of its closest name or alias.  Of names at the same
+		distance, those sharing more trigrams with query come first.  An exact match is
+		returned alone, at distance 0.
+		"""
+		key = lookup_key(query)
+		node = self.exact.search(key)
+		if node is not None:
+			i = node.data[1]
+			return [(self.registry.get_name(i), i, 0)]
+		if len(self.keys) == 0 or k <= 0:
+			return []
+
+		# Trigrams shared with each name, counting repeated trigrams as often as both have them.
+		positions, common = [], []
+		for gram, count in trigrams(key).items():
+			if gram in self.postings:
+				gram_positions, occurrences = self.postings[gram]
+				positions.append(gram_positions)
+				common.append(np.minimum(occurrences, count))
+		shared = np.zeros(len(self.keys), dtype=np.int64)
+		if len(positions) > 0:
+			shared = np.bincount(np.concatenate(positions), np.concatenate(common), len(self.keys)).astype(np.int64)
+		# Lower bounds on the distance to each name, from the q-gram lemma and the lengths.
+		longer = np.maximum(self.lengths, len(key))
+		bounds = np.maximum(np.abs(self.lengths - len(key)), -((shared - longer - 2) // 3))
+
+		# Examine the names with bounds up to a threshold, starting with the smallest
+		# threshold that takes in k names, and raise it until no name left could be closer
+		# than the k-th closest station found.
+		levels = np.cumsum(np.bincount(bounds))  # number of names with each bound or less
+		threshold = int(np.searchsorted(levels, min(k, len(self.keys))))
+		if max_distance is not None:
+			threshold = min(threshold, max_distance)
+		examined = np.empty(0, dtype=np.int64)
+		distances = np.empty(0, dtype=np.int64)
+		done = -1  # names with bounds up to done are examined
+		while True:
+			batch = np.flatnonzero((bounds > done) & (bounds <= threshold))
+			examined = np.concatenate([examined, batch])
+			distances = np.concatenate([distances, self._distances(key, batch)])
+			done = threshold
+			# Closest name of each station, ordered by distance and then by shared trigrams.
+			order = np.lexsort((examined, -shared[examined], distances))
+			unique, first = np.unique(self.station_ids[examined[order]], return_index=True)
+			best = order[np.sort(first)][:k]
+			if max_distance is not None:
+				best = best[distances[best] <= max_distance]
+			if done >= len(levels) - 1 or (max_distance is not None and done >= max_distance):
+				break
+			if len(best) == k:
+				if distances[best[-1]] <= done + 1:  # every name left is at least done + 1 away
+					break
+				threshold = int(distances[best[-1]]) - 1
+			else:
+				threshold = done + 1
+			if max_distance is not None:
+				threshold = min(threshold, max_distance)
+
+		return [(self.registry.get_name(int(self.station_ids[examined[b]])), int(self.station_ids[examined[b]]),
+				 int(distances[b])) for b in best]
+
+
+# Testing
+if __name__ == "__main__":
+
+	from random import choice, randint, seed
+	from time import perf_counter
+	from station_registry import StationRegistry
+	from synthetic_metro import station_name
+	from tube_snapshot import load_network
+
+	seed(2024)
+	registry = load_network().get_registry()
+	index = FuzzyStationIndex(registry)
+	for query in ["Paddinton", "Victoria", "kings cros", "Tottenham Court", "Hamersmith", "Elephant Castle", "xq"]:
+		print(repr(query), index.search(query, 3))
+
+	# The same answers as computing the distance to every name.
+	def brute_force(index, query, k, max_distance=None):
+		key = lookup_key(query)
+		distances = {}
+		for name_key, i in index.keys:
+			distance = levenshtein(key, name_key)
+			distances[i] = min(distance, distances.get(i, distance))
+		ordered = sorted(distances.values())
+		return [d for d in ordered if max_distance is None or d <= max_distance][:k]
+
+	def misspell(name):
+		for _ in range(randint(1, 3)):
+			p = randint(0, len(name) - 1)
+			edit = randint(0, 2)
+			letter = choice("abcdefghijklmnopqrstuvwxyz")
+			name = name[:p] + letter + name[p + 1:] if edit == 0 else \
+				name[:p] + name[p + 1:] if edit == 1 else name[:p] + letter + name[p:]
+		return name
+
+	all_equal = True
+	for _ in range(300):
+		query = misspell(choice(registry.get_names())) if randint(0, 5) > 0 else misspell("ab")
+		for k, max_distance in [(1, None), (5, None), (5, 2)]:
+			expected = brute_force(index, query, k, max_distance)
+			if expected[:1] == [0]:  # an exact match is returned alone
+				expected = [0]
+			if [d for _, _, d in index.search(query, k, max_distance)] != expected:
+				print("Mismatch for", repr(query), k, max_distance)
+				all_equal = False
+	print("Fuzzy search " + ("agrees" if all_equal else "does not agree") + " with brute force")
+
+	# A larger catalogue of generated names.
+	names = [station_name(i) for i in range(100000)]
+	start = perf_counter()
+	large = FuzzyStationIndex(StationRegistry(names))
+	print("Indexed", len(names), "names in", round(perf_counter() - start, 2), "s")
+	queries = [misspell(choice(names)) for _ in range(200)]
+	start = perf_counter()
+	for query in queries:
+		large.search(query, 5)
+	fuzzy_time = (perf_counter() - start) / len(queries)
+	start = perf_counter()
+	for query in queries[:2]:
+		brute_force(large, query, 5)
+	brute_time = (perf_counter() - start) / 2
+	print("Per query: index", round(fuzzy_time * 1000, 3), "ms, brute force", round(brute_time * 1000, 1), "ms")
+	print(queries[0], large.search(queries[0], 3))
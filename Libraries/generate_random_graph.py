@@ -30,13 +30,90 @@
 #                                                                       #
 #########################################################################
 
-from random import randint, random
+import numpy as np
+from random import getrandbits
 from adjacency_list_graph import AdjacencyListGraph
 from adjacency_matrix_graph import AdjacencyMatrixGraph
 
 
+def _pair_indices(num_pairs, edge_probability, rng):
+    """Return the sorted indices in range(num_pairs) of the pairs chosen independently with
+    probability edge_probability, in O(1 + number chosen) expected time.  The gap from
+    one chosen index to the next is geometrically distributed, so the gaps are drawn
+    in blocks and summed instead of flipping a coin for every pair."""
+    if edge_probability <= 0 or num_pairs == 0:
+        return np.empty(0, dtype=np.int64)
+    if edge_probability >= 1:
+        return np.arange(num_pairs, dtype=np.int64)
+    blocks = []
+    last = -1  # index of the last pair chosen so far
+    expected = num_pairs * edge_probability
+    while True:
+        block_size = int(expected + 4 * np.sqrt(expected) + 16)
+        indices = last + np.cumsum(rng.geometric(edge_probability, size=block_size))
+        if indices[-1] >= num_pairs:
+            blocks.append(indices[indices < num_pairs])
+            break
+        blocks.append(indices)
+        last = indices[-1]
+    return np.concatenate(blocks)
+
+
+def generate_random_edges(card_V, edge_probability, directed=True, weighted=False,
+                          min_weight=0, max_weight=20, seed=None, connected=False):
+    """Generate the edges of a random graph in which each possible edge is present
+    independently with probability edge_probability, as generate_random_graph does,
+    but in O(V + E) expected time rather than by examining all pairs.
+
+    Arguments:
+        card_V -- number of vertices
+        edge_probability -- probability that a given edge is present
+        directed -- True if the graph is directed, False if undirected.  A directed
+        graph may have self-loops (u, u), as in generate_random_graph.
+        weighted -- True if the graph is weighted, False if unweighted
+        min_weight -- if weighted, the minimum weight of an edge
+        max_weight -- if weighted, the maximum weight of an edge
+        seed -- seed for numpy.random.default_rng, or a numpy.random.Generator.  If None,
+        the seed comes from Python's random module, so that random.seed still makes
+        the output reproducible.
+        connected -- if True, always include the edges (i, i + 1), which make an
+        undirected graph connected, and for a directed graph also (card_V - 1, 0),
+        which makes it strongly connected
+
+    Returns:
+        u, v -- NumPy arrays of the endpoints of the edges, with u < v if undirected
+        weight -- NumPy array of the edge weights, or None if not weighted
+        """
+    rng = seed if isinstance(seed, np.random.Generator) else \
+        np.random.default_rng(getrandbits(64) if seed is None else seed)
+    n = card_V
+    if directed:
+        indices = _pair_indices(n * n, edge_probability, rng)
+        u, v = indices // n, indices % n
+    else:
+        # Pairs u < v in row-major order: row u starts at index u * (2n - u - 1) / 2.
+        indices = _pair_indices(n * (n - 1) // 2, edge_probability, rng)
+        u = np.floor((2 * n - 1 - np.sqrt((2 * n - 1) ** 2 - 8 * indices.astype(float))) / 2).astype(np.int64)
+        row_start = lambda r: r * (2 * n - r - 1) // 2
+        u -= row_start(u) > indices  # correct any rounding in the square root
+        u += row_start(u + 1) <= indices
+        v = indices - row_start(u) + u + 1
+
+    if connected and n > 1:
+        # A path 0, 1, ..., n - 1, closed into a cycle if directed.
+        chain_u = np.arange(n if directed else n - 1)
+        chain_v = (chain_u + 1) % n
+        repeat = v == (u + 1) % n  # random edges that repeat a chain edge
+        u = np.concatenate([chain_u, u[~repeat]])
+        v = np.concatenate([chain_v, v[~repeat]])
+
+    weight = rng.integers(min_weight, max_weight + 1, size=len(u)) if weighted else None
+    return u, v, weight
+
+
 def generate_random_graph(card_V, edge_probability, by_adjacency_lists=True,
-                          directed=True, weighted=False, min_weight=0, max_weight=20):
+                          directed=True, weighted=False, min_weight=0, max_weight=20,
+                          seed=None, connected=False):
     """Generate and return a random graph.
 
     Arguments:
@@ -48,27 +125,27 @@ def generate_random_graph(card_V, edge_probability, by_adjacency_lists=True,
         weighted -- True if the graph is weighted, False if unweighted
         min_weight -- if weighted, the minimum weight of an edge
         max_weight -- if weighted, the maximum weight of an edge
+        seed -- seed or numpy.random.Generator, as for generate_random_edges
+        connected -- if True, include a path through all vertices, as for generate_random_edges
 
     Returns:
         A graph
         """
-    constructor = AdjacencyListGraph if by_adjacency_lists else AdjacencyMatrixGraph
-    G = constructor(card_V, directed, weighted)
-
-    for u in range(card_V):
-        if directed:
-            min_v = 0
-        else:
-            min_v = u + 1
-
-        for v in range(min_v, card_V):
-            if random() <= edge_probability:  # add edge (u, v)
-                if weighted:
-                    weight = randint(min_weight, max_weight)  # random weight within range
-                else:
-                    weight = None
-                G.insert_edge(u, v, weight)  # guaranteed that edge (u, v) is not already present
+    u, v, weight = generate_random_edges(card_V, edge_probability, directed, weighted,
+                                         min_weight, max_weight, seed, connected)
+    if weighted:
+        edges = zip(u.tolist(), v.tolist(), weight.tolist())
+    else:
+        edges = zip(u.tolist(), v.tolist())
+
+    # Each edge (u, v) is generated at most once, so the adjacency lists can be built
+    # in bulk without checking for duplicates on every insertion.
+    if by_adjacency_lists:
+        return AdjacencyListGraph.from_edge_list(card_V, edges, directed, weighted)
 
+    G = AdjacencyMatrixGraph(card_V, directed, weighted)
+    for edge in edges:
+        G.insert_edge(*edge)
     return G
 
 
@@ -83,3 +160,25 @@ if __name__ == "__main__":
 
     graph3 = generate_random_graph(18, 0.25, False, False, True, 3, 7)
     print(graph3)
+
+    # Exact pair decoding: with probability 1, every pair appears once.
+    u, v, weight = generate_random_edges(50, 1.0, directed=False)
+    print(len(u) == 50 * 49 // 2, len(set(zip(u.tolist(), v.tolist()))) == len(u), bool((u < v).all()))
+    u, v, weight = generate_random_edges(30, 1.0)
+    print(len(set(zip(u.tolist(), v.tolist()))) == 900)
+
+    # The number of edges is close to its expectation, and a seed makes the graph reproducible.
+    card_V, p = 10000, 0.001
+    u, v, weight = generate_random_edges(card_V, p, False, True, 1, 10, seed=7)
+    expected = p * card_V * (card_V - 1) / 2
+    print(abs(len(u) - expected) < 5 * np.sqrt(expected))
+    u2, v2, weight2 = generate_random_edges(card_V, p, False, True, 1, 10, seed=7)
+    print((u == u2).all() and (v == v2).all() and (weight == weight2).all())
+
+    # Connected graphs.
+    from connected_components import connected_components
+    from strongly_connected_components import strongly_connected_components
+    graph4 = generate_random_graph(1000, 0.0005, directed=False, connected=True, seed=1)
+    print(connected_components(graph4, "array").get_count() == 1)
+    graph5 = generate_random_graph(1000, 0.0005, directed=True, connected=True, seed=1)
+    print(len(strongly_connected_components(graph5)) == 1)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# indexed_heap_priority_queue.py
+
+"""Priority queues of the integers 0, 1, ..., n-1, implemented with an array-backed d-ary heap.
+
+Where HeapPriorityQueue keeps a dictionary from objects to heap positions and
+calls get_key_func on every comparison, these queues store the objects'
+positions and keys in plain lists indexed by the object itself, so that
+graph algorithms over vertices 0..card_V-1 avoid hashing and function calls
+inside the heap.  The key of an object is read once, upon insertion, and
+afterward changes only through decrease_key or increase_key.  A heap with more
+children per node (arity) is shallower, which makes decrease_key cheaper at
+some cost to extract_min."""
+
+from operator import lt, gt
+
+
+class IndexedHeapPriorityQueue:
+
+    def __init__(self, compare, get_key_func, capacity=0, arity=4, set_key_func=None):
+        """Initialize an empty priority queue.
+
+        Arguments:
+        compare -- comparison function: operator.gt for a max-heap priority queue,
+        operator.lt for a min-heap priority queue
+        get_key_func -- required function that returns the key of an object upon insertion
+        capacity -- expected largest object plus 1.  The arrays grow as needed.
+        arity -- number of children of each heap node, at least 2
+        set_key_func -- optional function called as set_key_func(x, k) whenever the key
+        of x changes
+        """
+        if arity < 2:
+            raise RuntimeError("Heap arity must be at least 2.")
+        self.compare = compare
+        self.get_key = get_key_func
+        self.set_key = set_key_func
+        self.arity = arity
+        self.heap = []                  # heap[i] is the object at position i
+        self.position = [-1] * capacity  # position[x] is the position of x, -1 if not in the heap
+        self.key = [None] * capacity     # key[x] is the key of x
+
+    def get_size(self):
+        """Return the number of objects in the priority queue."""
+        return len(self.heap)
+
+    def contains(self, x):
+        """Return True if object x is in the priority queue, False otherwise."""
+        return x < len(self.position) and self.position[x] >= 0
+
+    def get_key_of(self, x):
+        """Return the key of object x as stored in the priority queue."""
+        return self.key[x]
+
+    def top_of_heap(self):
+        """Return the object at the top of the heap."""
+        if len(self.heap) == 0:  # error if heap is empty
+            raise RuntimeError("Heap underflow.")
+        return self.heap[0]
+
+    def insert(self, x):
+        """Insert object x, an integer from 0 up, into the heap.
+
+        Arguments:
+        x -- object to insert
+        """
+        if x >= len(self.position):  # grow the arrays, at least doubling them
+            extra = max(x + 1, 2 * len(self.position)) - len(self.position)
+            self.position.extend([-1] * extra)
+            self.key.extend([None] * extra)
+        elif self.position[x] >= 0:
+            raise RuntimeError("Object " + str(x) + " is already in the priority queue.")
+        self.key[x] = self.get_key(x)
+        self.heap.append(x)
+        self.position[x] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def extract_top(self):
+        """Return and delete the top element in a heap."""
+        top = self.top_of_heap()
+        last = self.heap.pop()
+        self.position[top] = -1
+        if len(self.heap) > 0:
+            # Move the last object in heap to the root position and restore the heap property.
+            self.heap[0] = last
+            self.position[last] = 0
+            self._sift_down(0)
+        return top
+
+    def update_key(self, x, k):
+        """Update the key of object x to value k, moving x toward the top.
+        Assumption: The caller has already verified that the new value is OK.
+
+        Arguments:
+        x -- object whose key has been changed
+        k -- new key of x
+        """
+        self.key[x] = k
+        if self.set_key is not None:
+            self.set_key(x, k)
+        self._sift_up(self.position[x])
+
+    def _sift_up(self, i):
+        """Move the object at position i up until its parent comes before it."""
+        heap, position, key, compare, arity = self.heap, self.position, self.key, self.compare, self.arity
+        x = heap[i]
+        k = key[x]
+        while i > 0:
+            parent = (i - 1) // arity
+            y = heap[parent]
+            if not compare(k, key[y]):
+                break
+            heap[i] = y  # move the parent down a level
+            position[y] = i
+            i = parent
+        heap[i] = x
+        position[x] = i
+
+    def _sift_down(self, i):
+        """Move the object at position i down until it comes before all of its children.
+        Iterative, unlike Heap.heapify."""
+        heap, position, key, compare, arity = self.heap, self.position, self.key, self.compare, self.arity
+        size = len(heap)
+        x = heap[i]
+        k = key[x]
+        while True:
+            first = arity * i + 1
+            if first >= size:
+                break
+            # Find the child that should come first.
+            best = first
+            best_key = key[heap[first]]
+            for child in range(first + 1, min(first + arity, size)):
+                child_key = key[heap[child]]
+                if compare(child_key, best_key):
+                    best = child
+                    best_key = child_key
+            if not compare(best_key, k):
+                break
+            y = heap[best]
+            heap[i] = y  # move the child up a level
+            position[y] = i
+            i = best
+        heap[i] = x
+        position[x] = i
+
+    def is_heap(self):
+        """Verify that the array represents a heap and that the positions are right."""
+        for i in range(len(self.heap)):
+            if self.position[self.heap[i]] != i:
+                return False
+            if i > 0 and self.compare(self.key[self.heap[i]], self.key[self.heap[(i - 1) // self.arity]]):
+                return False
+        return True
+
+    def __str__(self):
+        """Return the heap as an array."""
+        return ", ".join(str(x) for x in self.heap)
+
+
+class MinIndexedHeapPriorityQueue(IndexedHeapPriorityQueue):
+
+    def __init__(self, get_key_func, capacity=0, arity=4, set_key_func=None):
+        """Initialize a minimum priority queue of integers implemented with an indexed d-ary heap.
+
+        Arguments:
+        get_key_func -- required function that returns the key of an object upon insertion
+        capacity -- expected largest object plus 1.  The arrays grow as needed.
+        arity -- number of children of each heap node
+        set_key_func -- optional function that sets the key of an object
+        """
+        IndexedHeapPriorityQueue.__init__(self, lt, get_key_func, capacity, arity, set_key_func)
+
+    def minimum(self):
+        """Return the object with the minimum key in a heap."""
+        return self.top_of_heap()
+
+    def extract_min(self):
+        """Return and delete the object with the minimum value in a heap."""
+        return self.extract_top()
+
+    def decrease_key(self, x, k):
+        """Decrease the key of object x to value k.  Error if k is greater than x's current key.
+            Update the heap structure appropriately.
+
+        Arguments:
+        x -- object whose key has been decreased
+        k -- new key of x
+        """
+        if k > self.key[x]:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(self.key[x]))
+        self.update_key(x, k)
+
+
+class MaxIndexedHeapPriorityQueue(IndexedHeapPriorityQueue):
+
+    def __init__(self, get_key_func, capacity=0, arity=4, set_key_func=None):
+        """Initialize a maximum priority queue of integers implemented with an indexed d-ary heap.
+
+        Arguments:
+        get_key_func -- required function that returns the key of an object upon insertion
+        capacity -- expected largest object plus 1.  The arrays grow as needed.
+        arity -- number of children of each heap node
+        set_key_func -- optional function that sets the key of an object
+        """
+        IndexedHeapPriorityQueue.__init__(self, gt, get_key_func, capacity, arity, set_key_func)
+
+    def maximum(self):
+        """Return the object with the maximum key in a heap."""
+        return self.top_of_heap()
+
+    def extract_max(self):
+        """Return and delete the object with the maximum value in a heap."""
+        return self.extract_top()
+
+    def increase_key(self, x, k):
+        """Increase the key of object x to value k.  Error if k is less than x's current key.
+            Update the heap structure appropriately.
+
+        Arguments:
+        x -- object whose key has been increased
+        k -- new key of x
+        """
+        if k < self.key[x]:
+            raise RuntimeError("Error in increase_key: new key " + str(k)
+                               + " is less than current key " + str(self.key[x]))
+        self.update_key(x, k)
+
+
+# Testing
+if __name__ == "__main__":
+
+    import numpy as np
+
+    for arity in [2, 3, 4, 8]:
+        keys = np.random.randint(-100, 100, size=50).tolist()
+        pq1 = MinIndexedHeapPriorityQueue(lambda i: keys[i], len(keys), arity)
+        for i in range(len(keys)):
+            pq1.insert(i)
+        print(pq1.is_heap(), end=" ")
+
+        # Decrease the last key to -1000, which should be the minimum.
+        keys[-1] = -1000
+        pq1.decrease_key(len(keys) - 1, -1000)
+        print(pq1.is_heap(), pq1.minimum() == len(keys) - 1, end=" ")
+
+        # Check repeated calls to extract_min.
+        extracted_keys = []
+        while pq1.get_size() > 0:
+            extracted_keys.append(keys[pq1.extract_min()])
+        print(extracted_keys == sorted(extracted_keys), end=" ")
+
+        # Max version, growing from capacity 0.
+        pq2 = MaxIndexedHeapPriorityQueue(lambda i: keys[i], arity=arity)
+        for i in range(len(keys)):
+            pq2.insert(i)
+        keys[0] = 1000
+        pq2.increase_key(0, 1000)
+        extracted_keys = []
+        while pq2.get_size() > 0:
+            extracted_keys.append(keys[pq2.extract_max()])
+        print(extracted_keys == sorted(extracted_keys, reverse=True))
+
+    # Errors.
+    pq3 = MinIndexedHeapPriorityQueue(lambda i: i, 5)
+    pq3.insert(3)
+    try:
+        pq3.decrease_key(3, 4)
+    except RuntimeError as e:
+        print(e)
+    try:
+        pq3.insert(3)
+    except RuntimeError as e:
+        print(e)
+    pq3.extract_min()
+    try:
+        pq3.extract_min()
+    except RuntimeError as e:
+        print(e)
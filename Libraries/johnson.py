@@ -31,15 +31,33 @@
 #########################################################################
 
 import numpy as np
+from multiprocessing import Pool
+from adjacency_list_graph import AdjacencyListGraph
 from bellman_ford import bellman_ford
 from dijkstra import dijkstra
 
+# Reweighted graph of a johnson worker process, set by _set_worker_graph.
+_worker_graph = None
 
-def johnson(G):
+
+def _set_worker_graph(G):
+	"""Pool initializer: keep the reweighted graph for the Dijkstra tasks of this worker."""
+	global _worker_graph
+	_worker_graph = G
+
+
+def _dijkstra_distances(u):
+	"""Worker task: shortest-path distances from u in the reweighted graph."""
+	return dijkstra(_worker_graph, u)[0]
+
+
+def johnson(G, processes=1):
 	"""Compute all-pairs shortest paths. 
 
 	Argument: 
 	G -- a weighted, directed graph represented by adjacency lists
+	processes -- number of worker processes running Dijkstra's algorithm from different
+	sources.  With 1, the default, all runs are in this process.
 
 	Returns:
 	A matrix of shortest-path weights
@@ -69,10 +87,18 @@ def johnson(G):
 
 		# Compute shortest paths from each vertex u with Dijkstra's algorithm.
 		d = np.ndarray((card_V, card_V))
-		for u in range(card_V):
-			dijkstra_d, pi = dijkstra(G_prime, u)
-			for v in range(card_V):
-				d[u, v] = dijkstra_d[v] + h[v] - h[u]
+		if processes > 1:
+			# Send each worker one compact read-only copy of the graph, then farm out the sources.
+			with Pool(processes, initializer=_set_worker_graph, initargs=(G_prime.to_csr(),)) as pool:
+				rows = pool.imap(_dijkstra_distances, range(card_V), chunksize=max(1, card_V // (4 * processes)))
+				for u, dijkstra_d in enumerate(rows):
+					for v in range(card_V):
+						d[u, v] = dijkstra_d[v] + h[v] - h[u]
+		else:
+			for u in range(card_V):
+				dijkstra_d, pi = dijkstra(G_prime, u)
+				for v in range(card_V):
+					d[u, v] = dijkstra_d[v] + h[v] - h[u]
 
 		return d
 
@@ -80,7 +106,6 @@ def johnson(G):
 # Testing
 if __name__ == "__main__":
 
-	from adjacency_list_graph import AdjacencyListGraph
 	from all_pairs_shortest_paths import create_W
 	from floyd_warshall import floyd_warshall
 	from generate_random_graph import generate_random_graph
@@ -106,3 +131,4 @@ if __name__ == "__main__":
 	print(johnson_d)
 	fw_d = floyd_warshall(create_W(graph2.adjacency_matrix(), n), n)
 	print(np.array_equal(johnson_d, fw_d))
+	print(np.array_equal(johnson_d, johnson(graph2, processes=2)))
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# journey_matrix.py
+
+"""Precomputed all-pairs journey times and next hops, stored in one binary file.
+
+The file holds a header, the station names, an n x n matrix of journey times
+as unsigned 16-bit integers, and an n x n next-hop matrix, in which
+next_hop[u, v] is the vertex after u on a shortest path from u to v.
+JourneyMatrix maps the matrices with numpy.memmap, so that opening the file
+costs almost nothing and all processes that open it share the same pages of
+the operating system's file cache."""
+
+import os
+import struct
+import tempfile
+import numpy as np
+from csr_graph import CSRGraph
+
+MAGIC = b"JRNY"
+FORMAT_VERSION = 1
+# Magic, version, bytes per next-hop entry, number of stations, bytes of station names.
+HEADER = struct.Struct("<4sHHII")
+# Journey time stored for a pair of stations with no path between them.
+UNREACHABLE = np.iinfo(np.uint16).max
+
+
+def _aligned(offset):
+	"""Round offset up to a multiple of 8 bytes."""
+	return (offset + 7) // 8 * 8
+
+
+def all_pairs_with_next_hops(G):
+	"""Compute all-pairs shortest-path weights and next hops with a vectorized Floyd-Warshall.
+
+	Arguments:
+	G -- a weighted graph with nonnegative weights
+
+	Returns:
+	d -- n x n matrix of shortest-path weights, infinity where no path exists
+	next_hop -- n x n integer matrix: next_hop[u, v] is the vertex after u on a
+	shortest path from u to v, and -1 if u == v or no path exists
+	"""
+	n = G.get_card_V()
+	csr = G if isinstance(G, CSRGraph) else G.to_csr()
+	sources, targets, weights = csr.get_sources(), csr.get_targets(), csr.get_weights()
+
+	d = np.full((n, n), np.inf)
+	np.minimum.at(d, (sources, targets), weights)  # lightest of any parallel edges
+	np.fill_diagonal(d, 0)
+	next_hop = np.where(np.isfinite(d), np.arange(n)[None, :], -1)
+	np.fill_diagonal(next_hop, -1)
+	for k in range(n):
+		through_k = d[:, k, None] + d[None, k, :]
+		shorter = through_k < d
+		d[shorter] = through_k[shorter]
+		# A path u ~> k ~> v starts with the first edge of the path u ~> k.
+		next_hop = np.where(shorter, next_hop[:, k, None], next_hop)
+	return d, next_hop
+
+
+def write_journey_matrix(filename, stations, G):
+	"""Compute the journey times and next hops of graph G and write them to filename.
+
+	Arguments:
+	filename -- name of the file to write
+	stations -- list of station names, so that vertex i is stations[i]
+	G -- a weighted graph with whole-number weights
+	"""
+	n = G.get_card_V()
+	if len(stations) != n:
+		raise RuntimeError("Need one station name per vertex.")
+	d, next_hop = all_pairs_with_next_hops(G)
+	finite = np.isfinite(d)
+	if np.any(d[finite] != np.round(d[finite])):
+		raise RuntimeError("Journey times must be whole numbers to be stored as 16-bit integers.")
+	if np.any(d[finite] >= UNREACHABLE):
+		raise RuntimeError("Journey times must be less than " + str(UNREACHABLE) + ".")
+	times = np.where(finite, d, UNREACHABLE).astype(np.uint16)
+	hop_type = np.int16 if n <= np.iinfo(np.int16).max else np.int32
+
+	names = "\n".join(stations).encode("utf-8")
+	# Write a temporary file beside filename and rename it into place, so that readers
+	# never see half a file.
+	descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), suffix=".tmp")
+	try:
+		with os.fdopen(descriptor, "wb") as f:
+			f.write(HEADER.pack(MAGIC, FORMAT_VERSION, np.dtype(hop_type).itemsize, n, len(names)))
+			f.write(names)
+			f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+			f.write(times.tobytes())
+			f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+			f.write(next_hop.astype(hop_type).tobytes())
+		# mkstemp makes the file readable by its owner only; give it the mode open would.
+		umask = os.umask(0)
+		os.umask(umask)
+		os.chmod(temporary, 0o666 & ~umask)
+		os.replace(temporary, filename)
+	except BaseException:
+		os.remove(temporary)
+		raise
+
+
+def build_london_journey_matrix(filename, data_file=None):
+	"""Read data.csv (or data_file) and write the London Underground journey matrix to filename."""
+	from london_underground import DATA_FILE, load_london_underground
+	stations, G = load_london_underground(data_file or DATA_FILE)
+	write_journey_matrix(filename, stations, G)
+
+
+class JourneyMatrix:
+
+	def __init__(self, filename):
+		"""Open a journey matrix file written by write_journey_matrix, mapping its matrices into memory."""
+		with open(filename, "rb") as f:
+			magic, version, hop_size, n, names_size = HEADER.unpack(f.read(HEADER.size))
+			if magic != MAGIC:
+				raise RuntimeError(str(filename) + " is not a journey matrix file.")
+			if version != FORMAT_VERSION:
+				raise RuntimeError("Unsupported journey matrix version " + str(version) + ".")
+			names = f.read(names_size).decode("utf-8")
+		self.stations = names.split("\n") if n > 0 else []
+		self.index = {name: i for i, name in enumerate(self.stations)}
+		self.n = n
+
+		times_offset = _aligned(HEADER.size + names_size)
+		hops_offset = _aligned(times_offset + n * n * 2)
+		hop_type = {2: np.int16, 4: np.int32}[hop_size]
+		self.times = np.memmap(filename, dtype=np.uint16, mode="r", offset=times_offset, shape=(n, n))
+		self.next_hop = np.memmap(filename, dtype=hop_type, mode="r", offset=hops_offset, shape=(n, n))
+
+	def get_stations(self):
+		"""Return the list of station names."""
+		return self.stations
+
+	def station_index(self, name):
+		"""Return the vertex number of the station with the given name."""
+		return self.index[name]
+
+	def distance(self, u, v):
+		"""Return the journey time from vertex u to vertex v, infinity if there is no path."""
+		time = int(self.times[u, v])
+		return float('inf') if time == UNREACHABLE else time
+
+	def route(self, u, v):
+		"""Return the list of vertices on a shortest path from u to v, None if there is no path."""
+		if u == v:
+			return [u]
+		if self.next_hop[u, v] < 0:
+			return None
+		path = [u]
+		while u != v:
+			u = int(self.next_hop[u, v])
+			path.append(u)
+		return path
+
+	def journey(self, source, destination):
+		"""Return the journey time and list of station names from source to destination, given by name."""
+		u, v = self.index[source], self.index[destination]
+		path = self.route(u, v)
+		return self.distance(u, v), None if path is None else [self.stations[i] for i in path]
+
+
+# Testing
+if __name__ == "__main__":
+
+	from dijkstra import dijkstra
+	from london_underground import load_london_underground
+
+	filename = os.path.join(tempfile.mkdtemp(), "london.jrny")
+	build_london_journey_matrix(filename)
+	print(os.path.getsize(filename), "bytes, mode", oct(os.stat(filename).st_mode & 0o777))
+
+	journeys = JourneyMatrix(filename)
+	print(journeys.journey("Covent Garden", "Leicester Square"))
+	print(journeys.journey("Wimbledon", "Stratford"))
+
+	# Every journey time agrees with Dijkstra's algorithm, and every route has that time.
+	stations, G = load_london_underground()
+	all_equal = stations == journeys.get_stations()
+	for s in range(0, len(stations), 9):
+		d, pi = dijkstra(G, s)
+		for t in range(len(stations)):
+			path = journeys.route(s, t)
+			weight = sum(G.find_edge(path[i], path[i + 1]).get_weight() for i in range(len(path) - 1))
+			if journeys.distance(s, t) != d[t] or weight != d[t]:
+				print("Mismatch for pair", stations[s], stations[t])
+				all_equal = False
+	print("Journey matrix " + ("agrees" if all_equal else "does not agree") + " with Dijkstra's algorithm")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# london_underground.py
+
+"""Read the London Underground connections in data.csv into a graph.
+
+Each row of data.csv gives a line name, a station, and optionally a second
+station with the travel time in minutes between the two.  Rows without a
+second station or a time only list the stations of a line.  The same rows can
+also be read from the spreadsheet London Underground data.xlsx, if openpyxl is
+installed."""
+
+import csv
+import os
+from adjacency_list_graph import AdjacencyListGraph
+
+# data.csv lives at the top of the repository, next to the Libraries folder.
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.csv")
+# The spreadsheet lives in the Libraries folder.
+XLSX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "London Underground data.xlsx")
+
+
+def _xlsx_rows(filename):
+	"""Yield the rows of the first worksheet of an .xlsx file as lists of strings."""
+	try:
+		from openpyxl import load_workbook
+	except ImportError:
+		raise RuntimeError("Reading " + filename + " needs openpyxl; read data.csv instead.")
+	workbook = load_workbook(filename, read_only=True, data_only=True)
+	try:
+		for row in workbook.worksheets[0].iter_rows(values_only=True):
+			yield ["" if value is None else str(value) for value in row]
+	finally:
+		workbook.close()
+
+
+def _parse_rows(rows):
+	"""Return the (line, station1, station2, minutes) tuples of the rows that give a connection."""
+	connections = []
+	for row in rows:
+		if len(row) < 4:
+			continue
+		line, station1, station2, minutes = (field.strip() for field in row[:4])
+		if station1 == "" or station2 == "" or minutes == "":
+			continue
+		try:
+			minutes = float(minutes)
+		except ValueError:
+			continue
+		if minutes.is_integer():
+			minutes = int(minutes)
+		connections.append((line, station1, station2, minutes))
+	return connections
+
+
+def read_connections(filename=DATA_FILE):
+	"""Return a list of (line, station1, station2, minutes) tuples for the rows of
+	filename that give a connection.  The file is CSV with a header row, or an .xlsx
+	spreadsheet without one.  Station names have surrounding spaces removed, and
+	minutes is an int when the time is a whole number."""
+	if filename.lower().endswith(".xlsx"):
+		return _parse_rows(_xlsx_rows(filename))
+	with open(filename, newline="", encoding="utf-8") as f:
+		reader = csv.reader(f)
+		next(reader)  # header row
+		return _parse_rows(reader)
+
+
+def load_london_underground(filename=DATA_FILE):
+	"""Build the undirected, weighted London Underground graph.
+
+	Stations are numbered in sorted order of their names.  When two stations are
+	connected more than once, by different lines, the edge keeps the smallest time.
+	Rows connecting a station to itself are skipped.
+
+	Returns:
+	stations -- sorted list of station names, so that vertex i is stations[i]
+	G -- the graph, with journey times in minutes as edge weights
+	"""
+	connections = read_connections(filename)
+	stations = sorted({c[1] for c in connections} | {c[2] for c in connections})
+	index = {name: i for i, name in enumerate(stations)}
+	edges = ((index[a], index[b], minutes) for line, a, b, minutes in connections if a != b)
+	G = AdjacencyListGraph.from_edge_list(len(stations), edges, False, True, on_duplicate="min")
+	return stations, G
+
+
+# Testing
+if __name__ == "__main__":
+
+	from dijkstra import dijkstra
+	from print_path import print_path
+
+	stations, G = load_london_underground()
+	print(len(stations), "stations,", G.get_card_E(), "connections")
+	s = stations.index("Wimbledon")
+	t = stations.index("Stratford")
+	d, pi = dijkstra(G, s, t)
+	print(d[t], "minutes:", print_path(pi, s, t, lambda i: stations[i]))
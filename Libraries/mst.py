@@ -30,10 +30,17 @@
 #                                                                       #
 #########################################################################
 
+import numpy as np
 from merge_sort import merge_sort
 from adjacency_list_graph import AdjacencyListGraph
+from csr_graph import CSRGraph
 from disjoint_set_forest import make_set, find_set, union
+from disjoint_set_array import DisjointSet
 from min_heap_priority_queue import MinHeapPriorityQueue
+from indexed_heap_priority_queue import MinIndexedHeapPriorityQueue
+from pairing_heap_priority_queue import MinPairingHeapPriorityQueue
+from fibonacci_heap_priority_queue import MinFibonacciHeapPriorityQueue
+from bucket_priority_queue import BucketPriorityQueue, max_integer_weight
 
 
 class KruskalEdge:
@@ -66,18 +73,20 @@ class KruskalEdge:
         return "(" + str(self.u) + ", " + str(self.v) + "), weight: " + str(self.weight)
 
 
-def kruskal(G):
-    """ Return the minimum spanning tree of a weighted, undirected graph G using Kruskal's algorithm."""
+def kruskal(G, sets="array"):
+    """ Return the minimum spanning tree of a weighted, undirected graph G using Kruskal's algorithm.
+
+    Arguments:
+    G -- an undirected, weighted graph
+    sets -- disjoint-set implementation: "array" for a DisjointSet, the default, or
+    "forest" for the ForestNode objects of disjoint_set_forest
+    """
     if G.is_directed():
         raise RuntimeError("Graph should be undirected.")
 
     card_V = G.get_card_V()
     # Initialize an undirected, weighted, minimum spanning tree.
     mst = AdjacencyListGraph(card_V, False, True)
-    # Keep an array of handles to disjoint-set objects.
-    forest = [None] * card_V
-    for v in range(card_V):
-        forest[v] = make_set(v)
 
     # Make an array of weighted edges and sort it by weight.
     edges = []
@@ -88,6 +97,21 @@ def kruskal(G):
                 edges.append(KruskalEdge(u, edge.get_v(), edge.get_weight()))
     merge_sort(edges)  # sort in nondecreasing order by weight
 
+    if sets == "array":
+        forest = DisjointSet(card_V)
+        # Examine each edge.  union connects the trees if the endpoints are not in the same tree.
+        for edge in edges:
+            if forest.union(edge.get_u(), edge.get_v()):
+                mst.insert_edge(edge.get_u(), edge.get_v(), edge.get_weight())
+        return mst
+    elif sets != "forest":
+        raise RuntimeError("Unknown disjoint-set implementation " + str(sets) + ".")
+
+    # Keep an array of handles to disjoint-set objects.
+    forest = [None] * card_V
+    for v in range(card_V):
+        forest[v] = make_set(v)
+
     # Examine each edge.
     for edge in edges:
         u = forest[edge.get_u()]
@@ -100,12 +124,68 @@ def kruskal(G):
     return mst
 
 
-def prim(G, r):
+def fast_kruskal(G, output="graph"):
+    """Return the minimum spanning tree (or forest) of a weighted, undirected graph G using
+    Kruskal's algorithm, with the edges held in parallel NumPy arrays.
+
+    The edges are sorted by weight with a stable NumPy argsort.  When the weights are
+    whole numbers below 2 ** 16, they are sorted as uint8 or uint16 values, for which
+    NumPy's stable argsort is a radix sort taking O(E) time, instead of a merge sort.
+    The scan stops as soon as the tree has card_V - 1 edges.  Ties are broken as in
+    kruskal, so both return the same tree.
+
+    Arguments:
+    G -- an undirected, weighted graph, either an AdjacencyListGraph or a CSRGraph
+    output -- "graph" to return an AdjacencyListGraph, "edges" to return the arrays
+
+    Returns:
+    The MST as an undirected, weighted AdjacencyListGraph, or three parallel arrays
+    u, v, weight of its edges, in the order in which they were added, with u < v
+    """
+    if G.is_directed():
+        raise RuntimeError("Graph should be undirected.")
+    if output not in ("graph", "edges"):
+        raise RuntimeError("Unknown output " + str(output) + ".")
+
+    card_V = G.get_card_V()
+    csr = G if isinstance(G, CSRGraph) else G.to_csr()
+    sources, targets, weights = csr.get_sources(), csr.get_targets(), csr.get_weights()
+    once = sources < targets  # each undirected edge appears in both directions
+    sources, targets, weights = sources[once], targets[once], weights[once]
+    keys = weights
+    max_weight = max_integer_weight(csr)
+    if max_weight is not None and max_weight < 2 ** 16:  # radix sort
+        keys = weights.astype(np.uint8 if max_weight < 2 ** 8 else np.uint16)
+    order = np.argsort(keys, kind="stable")
+
+    forest = DisjointSet(card_V)
+    chosen = []
+    remaining = card_V - 1  # edges still missing from a spanning tree
+    for i, u, v in zip(order.tolist(), sources[order].tolist(), targets[order].tolist()):
+        if remaining == 0:
+            break
+        if forest.union(u, v):
+            chosen.append(i)
+            remaining -= 1
+
+    chosen = np.array(chosen, dtype=np.int64)
+    if output == "edges":
+        return sources[chosen], targets[chosen], weights[chosen]
+    return AdjacencyListGraph.from_edge_list(card_V, zip(sources[chosen].tolist(), targets[chosen].tolist(),
+                                                         weights[chosen].tolist()), False, True)
+
+
+def prim(G, r, queue="heap"):
     """ Return the minimum spanning tree of a weighted, undirected graph G using Prim's algorithm.
 
     Arguments:
     G -- an undirected graph, represented by adjacency lists
     r -- root vertex to start from
+    queue -- min-priority queue of vertices: "heap", the default, for
+    MinIndexedHeapPriorityQueue, "clrs" for the textbook MinHeapPriorityQueue,
+    "pairing" for MinPairingHeapPriorityQueue, "fibonacci" for
+    MinFibonacciHeapPriorityQueue, or "bucket" for BucketPriorityQueue (edge weights
+    must be nonnegative whole numbers).
     """
     # Initialize keys and predecessors.
     card_V = G.get_card_V()
@@ -115,7 +195,22 @@ def prim(G, r):
     key[r] = 0  # root r has key 0
 
     # Initialize the min-priority queue of vertices.
-    queue = MinHeapPriorityQueue(lambda u: key[u])
+    if queue == "bucket":
+        max_weight = max_integer_weight(G)
+        if max_weight is None:
+            raise RuntimeError("Bucket queue needs nonnegative whole-number edge weights.")
+        # Keys in Prim's algorithm are edge weights, so max_weight + 1 buckets hold them all.
+        queue = BucketPriorityQueue(lambda u: key[u], max_weight + 1)
+    elif queue == "heap":
+        queue = MinIndexedHeapPriorityQueue(lambda u: key[u], card_V)
+    elif queue == "clrs":
+        queue = MinHeapPriorityQueue(lambda u: key[u])
+    elif queue == "pairing":
+        queue = MinPairingHeapPriorityQueue(lambda u: key[u])
+    elif queue == "fibonacci":
+        queue = MinFibonacciHeapPriorityQueue(lambda u: key[u])
+    else:
+        raise RuntimeError("Unknown priority queue " + str(queue) + ".")
     for u in range(card_V):
         queue.insert(u)
 
@@ -204,3 +299,12 @@ if __name__ == "__main__":
     prim_weight2 = get_total_weight(prim2)
     print("Prim weight =", prim_weight2)
     print(prim_weight2 == kruskal_weight2)
+
+    # Both priority queues give the same weight.
+    print(get_total_weight(kruskal(graph2, "forest")) == kruskal_weight2)
+    print(get_total_weight(fast_kruskal(graph2)) == kruskal_weight2,
+          get_total_weight(fast_kruskal(graph2.to_csr())) == kruskal_weight2)
+    u, v, weight = fast_kruskal(graph2, "edges")
+    print(len(u) == card_V - 1, weight.sum() == kruskal_weight2)
+    print(len({get_total_weight(prim(graph2, 0, queue))
+               for queue in ["heap", "clrs", "pairing", "fibonacci", "bucket"]}) == 1)
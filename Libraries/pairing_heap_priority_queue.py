@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# pairing_heap_priority_queue.py
+
+"""Minimum priority queue implemented with a pairing heap.
+
+A pairing heap is a heap-ordered tree of arbitrary shape, stored with a
+pointer from each node to its leftmost child and to its right sibling.  Insert,
+meld, and decrease_key link two trees in O(1) time; extract_min links the
+children of the root in two passes, in O(log n) amortized time.  Meld also
+merges the dictionaries from objects to nodes, in time linear in the smaller
+queue.  The keys of the objects are read once, upon insertion, and kept in the
+nodes."""
+
+
+class PairingHeapNode:
+
+    __slots__ = "item", "key", "child", "sibling", "prev"
+
+    def __init__(self, item, key):
+        """Initialize a node holding item with the given key."""
+        self.item = item
+        self.key = key
+        self.child = None    # leftmost child
+        self.sibling = None  # right sibling
+        self.prev = None     # left sibling, or parent if this node is a leftmost child
+
+
+def _link(a, b):
+    """Link the roots of two trees, making the root with the larger key the leftmost
+    child of the other.  Return the root of the combined tree."""
+    if b.key < a.key:
+        a, b = b, a
+    b.prev = a
+    b.sibling = a.child
+    if a.child is not None:
+        a.child.prev = b
+    a.child = b
+    a.sibling = None
+    a.prev = None
+    return a
+
+
+class MinPairingHeapPriorityQueue:
+
+    def __init__(self, get_key_func, set_key_func=None):
+        """Initialize an empty minimum priority queue implemented with a pairing heap.
+
+        Arguments:
+        get_key_func -- required function that returns the key of an object upon insertion
+        set_key_func -- optional function that sets the key of an object
+        """
+        self.get_key = get_key_func
+        self.set_key = set_key_func
+        self.root = None
+        self.nodes = {}  # dictionary from objects to their nodes
+
+    def get_size(self):
+        """Return the number of objects in the priority queue."""
+        return len(self.nodes)
+
+    def minimum(self):
+        """Return the object with the minimum key."""
+        if self.root is None:  # error if heap is empty
+            raise RuntimeError("Heap underflow.")
+        return self.root.item
+
+    def insert(self, x):
+        """Insert object x into the priority queue."""
+        if x in self.nodes:
+            raise RuntimeError("Object " + str(x) + " is already in the priority queue.")
+        node = PairingHeapNode(x, self.get_key(x))
+        self.nodes[x] = node
+        self.root = node if self.root is None else _link(self.root, node)
+
+    def extract_min(self):
+        """Return and delete the object with the minimum key."""
+        root = self.root
+        if root is None:  # error if heap is empty
+            raise RuntimeError("Heap underflow.")
+        del self.nodes[root.item]
+        self.root = self._merge_pairs(root.child)
+        return root.item
+
+    def decrease_key(self, x, k):
+        """Decrease the key of object x to value k.  Error if k is greater than x's current key.
+            Cut the subtree of x from its parent and link it with the root.
+
+        Arguments:
+        x -- object whose key has been decreased
+        k -- new key of x
+        """
+        node = self.nodes[x]
+        if k > node.key:
+            raise RuntimeError("Error in decrease_key: new key " + str(k)
+                               + " is greater than current key " + str(node.key))
+        node.key = k
+        if self.set_key is not None:
+            self.set_key(x, k)
+        if node is self.root:
+            return
+
+        # Cut the subtree rooted at node from its siblings and parent.
+        if node.prev.child is node:  # leftmost child
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.sibling = None
+        node.prev = None
+        self.root = _link(self.root, node)
+
+    def meld(self, other):
+        """Move all the objects of another MinPairingHeapPriorityQueue into this one,
+        leaving the other queue empty.  The two queues must hold different objects,
+        which is not checked.  Joining the heaps takes O(1) time, and joining the
+        dictionaries from objects to nodes takes time linear in the smaller queue."""
+        if other is self or other.root is None:
+            return
+        if len(self.nodes) < len(other.nodes):
+            self.nodes, other.nodes = other.nodes, self.nodes
+        self.nodes.update(other.nodes)
+        self.root = other.root if self.root is None else _link(self.root, other.root)
+        other.root = None
+        other.nodes = {}
+
+    @staticmethod
+    def _merge_pairs(first):
+        """Combine the list of sibling trees starting at first into one tree and return
+        its root: link the trees in pairs from left to right, then link the resulting
+        trees from right to left."""
+        if first is None:
+            return None
+        pairs = []
+        while first is not None:
+            a = first
+            b = a.sibling
+            if b is None:
+                first = None
+            else:
+                first = b.sibling
+                a = _link(a, b)
+            a.sibling = None
+            a.prev = None
+            pairs.append(a)
+        root = pairs.pop()
+        while len(pairs) > 0:
+            root = _link(pairs.pop(), root)
+        return root
+
+
+# Testing
+if __name__ == "__main__":
+
+    import numpy as np
+    from key_object import KeyObject
+
+    list1 = ["AL", "AK", "AZ", "AR", "CA", "CO", "CT", "HI", "NH", "NY"]
+    objects = [KeyObject(list1[i], i) for i in range(len(list1))]
+    pq1 = MinPairingHeapPriorityQueue(KeyObject.get_key, KeyObject.set_key)
+    for x in objects:
+        pq1.insert(x)
+
+    # Decrease last key to -100 which should be the minimum.
+    pq1.decrease_key(objects[-1], -100)
+    print(pq1.minimum() == objects[-1])
+    pq1.extract_min()
+    # Decreasing a key deep in the heap keeps the heap ordered.
+    pq1.decrease_key(objects[5], -50)
+    print(pq1.extract_min() == objects[5])
+
+    extracted_keys = []
+    while pq1.get_size() > 0:
+        extracted_keys.append(KeyObject.get_key(pq1.extract_min()))
+    print(extracted_keys)
+    print(extracted_keys == sorted(extracted_keys))
+
+    # Random keys with random decreases, and a meld.
+    keys = np.random.randint(0, 1000, size=200).tolist()
+    pq2 = MinPairingHeapPriorityQueue(lambda i: keys[i])
+    pq3 = MinPairingHeapPriorityQueue(lambda i: keys[i])
+    for i in range(100):
+        pq2.insert(i)
+        pq3.insert(100 + i)
+    for i in np.random.randint(0, 200, size=100):
+        keys[i] -= np.random.randint(0, 500)
+        (pq2 if i < 100 else pq3).decrease_key(i, keys[i])
+    pq2.meld(pq3)
+    print(pq2.get_size(), pq3.get_size())
+    extracted_keys = []
+    while pq2.get_size() > 0:
+        extracted_keys.append(keys[pq2.extract_min()])
+    print(extracted_keys == sorted(keys))
+
+    # Check minimum in empty priority queue.
+    try:
+        pq3.extract_min()
+    except RuntimeError as e:
+        print(e)
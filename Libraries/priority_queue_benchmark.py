@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# priority_queue_benchmark.py
+
+"""Compare the priority queues behind Dijkstra's and Prim's algorithms on sparse and dense graphs.
+
+Both algorithms perform one extract_min per vertex and up to one decrease_key
+per edge, so the denser the graph, the more the cost of decrease_key matters:
+O(log n) for the binary and d-ary heaps, O(1) amortized for the pairing and
+Fibonacci heaps."""
+
+from time import perf_counter
+from random import seed
+from generate_random_graph import generate_random_graph
+from dijkstra import dijkstra, dijkstra_queue
+from indexed_heap_priority_queue import MinIndexedHeapPriorityQueue
+from mst import prim
+
+# Names of the queues, as accepted by dijkstra's engine and prim's queue arguments.
+QUEUES = {"dijkstra": ["clrs", "dary", "pairing", "fibonacci"],
+		  "prim": ["clrs", "heap", "pairing", "fibonacci"]}
+
+
+class CountingQueue:
+	"""Wraps a priority queue, counting calls to extract_min and decrease_key."""
+
+	def __init__(self, queue):
+		"""Initialize a counting wrapper around queue, with both counts zero."""
+		self.queue = queue
+		self.extracts = 0
+		self.decreases = 0
+
+	def get_size(self):
+		"""Return the number of elements in the wrapped queue."""
+		return self.queue.get_size()
+
+	def insert(self, x):
+		"""Insert x into the wrapped queue."""
+		self.queue.insert(x)
+
+	def extract_min(self):
+		"""Remove and return the minimum element of the wrapped queue, counting the call."""
+		self.extracts += 1
+		return self.queue.extract_min()
+
+	def decrease_key(self, x, k):
+		"""Decrease the key of x to k in the wrapped queue, counting the call."""
+		self.decreases += 1
+		self.queue.decrease_key(x, k)
+
+
+def count_operations(G, s):
+	"""Return the numbers of extract_min and decrease_key calls made by Dijkstra's
+	algorithm from source s."""
+	counting = CountingQueue(None)
+
+	def make_queue(d):
+		counting.queue = MinIndexedHeapPriorityQueue(lambda u: d[u], G.get_card_V())
+		return counting
+
+	dijkstra_queue(G, s, None, make_queue)
+	return counting.extracts, counting.decreases
+
+
+def benchmark_priority_queues(card_V, edge_probabilities, sources=5, random_seed=2024):
+	"""Time Dijkstra's and Prim's algorithms with each priority queue on random graphs.
+
+	Arguments:
+	card_V -- number of vertices of each graph
+	edge_probabilities -- list of edge probabilities, from sparse to dense
+	sources -- number of source vertices to run Dijkstra's algorithm from
+	random_seed -- seed for generating the graphs
+
+	Returns:
+	A list with one dictionary per edge probability, giving the number of edges,
+	the extract_min and decrease_key counts of one Dijkstra run, and the time in
+	seconds of each algorithm with each queue, keyed by (algorithm, queue).
+	"""
+	seed(random_seed)
+	results = []
+	for p in edge_probabilities:
+		G = generate_random_graph(card_V, p, True, False, True, 1, 100)
+		extracts, decreases = count_operations(G, 0)
+		row = {"p": p, "edges": G.get_card_E(), "extracts": extracts, "decreases": decreases}
+		for queue in QUEUES["dijkstra"]:
+			start = perf_counter()
+			for s in range(sources):
+				dijkstra(G, s, engine=queue)
+			row[("dijkstra", queue)] = (perf_counter() - start) / sources
+		for queue in QUEUES["prim"]:
+			start = perf_counter()
+			prim(G, 0, queue)
+			row[("prim", queue)] = perf_counter() - start
+		results.append(row)
+	return results
+
+
+def print_benchmark(results):
+	"""Print the results of benchmark_priority_queues as a table, times in milliseconds,
+	marking the fastest queue for each algorithm with an asterisk."""
+	columns = [(algorithm, queue) for algorithm in QUEUES for queue in QUEUES[algorithm]]
+	print("     p    edges  extr  decr  " + "  ".join((a[0] + ":" + q).rjust(11) for a, q in columns))
+	for row in results:
+		fastest = {a: min(QUEUES[a], key=lambda q: row[(a, q)]) for a in QUEUES}
+		times = ["%10.1f%s" % (1000 * row[(a, q)], "*" if fastest[a] == q else " ") for a, q in columns]
+		print("%6.3f %8d %5d %5d  " % (row["p"], row["edges"], row["extracts"], row["decreases"])
+			  + "  ".join(times))
+
+
+# Testing
+if __name__ == "__main__":
+
+	print_benchmark(benchmark_priority_queues(1000, [0.002, 0.01, 0.05, 0.2, 0.5]))
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# station_registry.py
+
+"""Map station names to dense integer ids and back.
+
+Graph algorithms number stations 0, 1, ..., n - 1.  A StationRegistry makes
+that numbering once, so that every script agrees on it.  Each name is put in
+canonical form when it is added: surrounding spaces are removed and runs of
+spaces inside become one space, so that data.csv's "Charing Cross " is
+"Charing Cross".  Lookups go through a looser key, which also ignores case,
+apostrophes, full stops, commas, and brackets, treats hyphens as spaces, and
+reads "&" as "and", so that "kings cross st pancras" finds "King's Cross St.
+Pancras".  Aliases give further names for a station.  Names are looked up in a
+dictionary and ids in a list, both in O(1) time."""
+
+import re
+import sys
+import unicodedata
+
+# Other names for stations in data.csv.
+LONDON_ALIASES = {
+	"King's Cross": "King's Cross St. Pancras",
+	"St. Pancras": "King's Cross St. Pancras",
+	"Olympia": "Kensington (Olympia)",
+	"Heathrow": "Heathrow Terminals 1, 2, 3",
+	"Heathrow Terminals 123": "Heathrow Terminals 1, 2, 3",
+}
+
+_IGNORED = re.compile(r"['’.,()]")
+
+
+def canonical_name(name):
+	"""Return name with surrounding spaces removed and inner runs of spaces made single."""
+	return " ".join(unicodedata.normalize("NFC", name).split())
+
+
+def lookup_key(name):
+	"""Return the key under which name is looked up: the canonical name in lower case,
+	without apostrophes, full stops, commas, or brackets, with hyphens as spaces, and
+	with "&" as "and"."""
+	name = _IGNORED.sub("", unicodedata.normalize("NFC", name).casefold())
+	return " ".join(name.replace("&", " and ").replace("-", " ").split())
+
+
+class StationRegistry:
+
+	def __init__(self, names=(), aliases=None):
+		"""Initialize a registry.
+
+		Arguments:
+		names -- station names, which get ids 0, 1, 2, ... in order.  No two may have
+		the same lookup key.
+		aliases -- optional dictionary from other names to names in the registry
+		"""
+		self.names = []  # canonical name of each id
+		self.ids = {}    # lookup key of each name and alias to its id
+		for name in names:
+			key = lookup_key(name)
+			if key in self.ids:
+				raise RuntimeError("Stations " + repr(self.names[self.ids[key]]) + " and " + repr(name) +
+								   " have the same name.")
+			self.intern(name)
+		for alias, name in (aliases or {}).items():
+			self.add_alias(alias, name)
+
+	def intern(self, name):
+		"""Return the id of name, adding it to the registry with the next id if it is new."""
+		key = lookup_key(name)
+		i = self.ids.get(key)
+		if i is None:
+			i = len(self.names)
+			self.names.append(sys.intern(canonical_name(name)))
+			self.ids[key] = i
+		return i
+
+	def add_alias(self, alias, name):
+		"""Make alias another name for the station name, which must be in the registry."""
+		i = self.get_id(name)
+		if i is None:
+			raise RuntimeError("Station " + repr(name) + " is not in the registry.")
+		key = lookup_key(alias)
+		if self.ids.get(key, i) != i:
+			raise RuntimeError(repr(alias) + " already names station " + repr(self.names[self.ids[key]]) + ".")
+		self.ids[key] = i
+
+	def get_id(self, name):
+		"""Return the id of the station with this name or alias, or None if there is none."""
+		return self.ids.get(lookup_key(name))
+
+	def get_ids(self, names):
+		"""Return the list of ids of the stations with these names, raising RuntimeError
+		if any is unknown."""
+		ids = []
+		for name in names:
+			i = self.ids.get(lookup_key(name))
+			if i is None:
+				raise RuntimeError("Station " + repr(name) + " is not in the registry.")
+			ids.append(i)
+		return ids
+
+	def get_name(self, i):
+		"""Return the canonical name of station i."""
+		return self.names[i]
+
+	def get_names(self):
+		"""Return the list of canonical names, so that station i is names[i]."""
+		return self.names
+
+	def __len__(self):
+		"""Return the number of stations, not counting aliases."""
+		return len(self.names)
+
+	def __contains__(self, name):
+		"""Return True if name or an alias names a station in the registry."""
+		return lookup_key(name) in self.ids
+
+
+# Testing
+if __name__ == "__main__":
+
+	from time import perf_counter
+	from tube_snapshot import load_network
+
+	network = load_network()
+	registry = network.get_registry()
+	print(len(registry), "stations;", registry.get_names() == network.get_stations())
+	for query in ["Charing Cross ", "  epping", "kings cross st pancras", "King's Cross", "ELEPHANT AND CASTLE",
+				  "Bromley by Bow", "Kensington Olympia", "St Pauls", "Paddinton"]:
+		i = registry.get_id(query)
+		print(repr(query), "->", i, None if i is None else registry.get_name(i))
+
+	# Adding a known name returns its id; a new name gets the next one.
+	print(registry.intern("Victoria ") == registry.get_id("Victoria"), registry.intern("Battersea Power Station"))
+	try:
+		registry.add_alias("Victoria", "Paddington")
+	except RuntimeError as e:
+		print(e)
+	try:
+		StationRegistry(["Earl's Court", "Earls Court"])
+	except RuntimeError as e:
+		print(e)
+
+	start = perf_counter()
+	ids = registry.get_ids(network.get_stations() * 100)
+	print(len(ids), "lookups in", round((perf_counter() - start) * 1000, 2), "ms;", ids[:5])
@@ -94,3 +94,8 @@ if __name__ == "__main__":
 	components = strongly_connected_components(graph2)
 	for component in components:
 		print([vertices[i] for i in component])
+
+	# A cycle longer than the recursion limit is one component.
+	n = 100000
+	cycle = AdjacencyListGraph.from_edge_list(n, [(i, (i + 1) % n) for i in range(n)])
+	print(len(strongly_connected_components(cycle)) == 1)
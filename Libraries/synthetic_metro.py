@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# synthetic_metro.py
+
+"""Generate synthetic metro networks that look like the London Underground.
+
+Each line is a random walk across a square plane that keeps roughly to its
+heading, so that lines are long paths that cross each other.  When a line comes
+within interchange_radius of a station of another line, it runs through that
+station instead of a new one, making an interchange, as long as the station
+has room for two more connections under max_degree.  Every line after the
+first starts at a station of an earlier line, so the network is connected.
+Travel times between consecutive stations are whole minutes drawn with the
+frequencies in data.csv, mostly 2 with some 3, 4, and 1, and the distance
+between the stations is proportional to the time.  The plane grows with the
+number of stations, so that the fraction of interchanges stays about the same
+from hundreds of stations to millions."""
+
+import csv
+import numpy as np
+from adjacency_list_graph import AdjacencyListGraph
+
+# Travel times in minutes and their frequencies in data.csv.
+MINUTES = [1, 2, 3, 4, 5]
+MINUTES_FREQUENCIES = [0.09, 0.57, 0.23, 0.09, 0.02]
+
+# Pieces of generated station names.
+_PREFIXES = ["", "North ", "South ", "East ", "West ", "Upper ", "Lower ", "Old ", "New "]
+_ROOTS = ["Ac", "Bal", "Bar", "Bel", "Bram", "Cam", "Chal", "Clap", "Dal", "Ed", "Elm", "Fin",
+		  "Gol", "Ham", "Hat", "Hol", "Ken", "King", "Lam", "Lew", "Mar", "Mill", "Mor", "Ox",
+		  "Pad", "Pen", "Put", "Rav", "Rich", "Shep", "Stan", "Stock", "Tot", "Wal", "Wem", "Wil"]
+_SUFFIXES = ["ton", "ham", "wick", "bury", "field", "wood", "gate", " Cross", " Park", " Green",
+			 "ford", "ley", "don", "well", " Hill", " Common"]
+
+
+def station_name(i):
+	"""Return the generated name of station i.  Distinct numbers give distinct names."""
+	combinations = len(_PREFIXES) * len(_ROOTS) * len(_SUFFIXES)
+	j = i % combinations
+	name = _PREFIXES[j // (len(_ROOTS) * len(_SUFFIXES))] + _ROOTS[j // len(_SUFFIXES) % len(_ROOTS)] + \
+		_SUFFIXES[j % len(_SUFFIXES)]
+	return name if i < combinations else name + " " + str(i // combinations + 1)
+
+
+def _line_route(rng, start, length, side, turn):
+	"""Return the coordinates of a line of the given number of stations from start,
+	and the travel times between them.  The heading drifts by a normally distributed
+	angle at each hop, and the route folds back into the square [0, side] x [0, side]
+	at its edges."""
+	times = rng.choice(MINUTES, size=length - 1, p=MINUTES_FREQUENCIES)
+	hops = times * rng.uniform(0.4, 0.6, size=length - 1)  # 2 minutes is about 1 unit
+	heading = rng.uniform(0, 2 * np.pi) + np.cumsum(rng.normal(0, turn, size=length - 1))
+	x = start[0] + np.concatenate([[0], np.cumsum(hops * np.cos(heading))])
+	y = start[1] + np.concatenate([[0], np.cumsum(hops * np.sin(heading))])
+	fold = lambda z: side - np.abs(np.mod(z, 2 * side) - side)  # reflect at 0 and side
+	return fold(x), fold(y), times
+
+
+def generate_metro_connections(num_lines, stations_per_line, seed=None, interchange_radius=0.35,
+							   max_degree=6, turn=0.3, density=1.0):
+	"""Generate the stations and connections of a synthetic metro network.
+
+	Arguments:
+	num_lines -- number of lines
+	stations_per_line -- number of stops on each line, counting interchanges but, after the
+	first line, not the station it starts from
+	seed -- seed for numpy.random.default_rng, or a numpy.random.Generator
+	interchange_radius -- distance, where a 2-minute hop is about 1, within which a line runs
+	through an existing station of another line instead of a new one
+	max_degree -- most connections at any station
+	turn -- standard deviation, in radians, of the change of heading at each hop
+	density -- stations per unit of area, setting the size of the plane
+
+	Returns:
+	stations -- list of station names, so that vertex i is stations[i]
+	connections -- list of (line, station1, station2, minutes) tuples, as
+	london_underground.read_connections returns
+	positions -- card_V x 2 NumPy array of the coordinates of the stations
+	"""
+	rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+	side = np.sqrt(num_lines * stations_per_line / density)
+	cell_size = interchange_radius
+	grid = {}  # dictionary from grid cells to the stations in them
+	positions = []
+	line_of = []  # the first line through each station
+	degree = []
+	connections = []
+
+	for line in range(num_lines):
+		line_name = "Line " + str(line + 1)
+		if line == 0:
+			previous = None
+			x, y, times = _line_route(rng, rng.uniform(0, side, size=2), stations_per_line, side, turn)
+		else:
+			# Start at a random station of an earlier line with room for one more connection.
+			# Most stations have room, so a few random draws almost always find one; if they
+			# do not, choose among those that have room.
+			for _ in range(100):
+				previous = int(rng.integers(len(positions)))
+				if degree[previous] < max_degree:
+					break
+			else:
+				open_stations = np.flatnonzero(np.array(degree) < max_degree)
+				if len(open_stations) == 0:
+					raise RuntimeError("Every station has max_degree connections, so line " + str(line + 1) +
+									   " has nowhere to start.")
+				previous = int(rng.choice(open_stations))
+			x, y, times = _line_route(rng, positions[previous], stations_per_line + 1, side, turn)
+			x, y = x[1:], y[1:]
+		on_line = {previous}
+		for i in range(stations_per_line):
+			cx, cy = int(x[i] // cell_size), int(y[i] // cell_size)
+			# Nearest station of another line within the radius with room for two more connections.
+			station = None
+			best = interchange_radius ** 2
+			for cell in [(cx + dx, cy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]:
+				for s in grid.get(cell, ()):
+					squared = (positions[s][0] - x[i]) ** 2 + (positions[s][1] - y[i]) ** 2
+					if squared <= best and s not in on_line and line_of[s] != line and degree[s] <= max_degree - 2:
+						station = s
+						best = squared
+			if station is None:
+				station = len(positions)
+				positions.append((x[i], y[i]))
+				line_of.append(line)
+				degree.append(0)
+				grid.setdefault((cx, cy), []).append(station)
+			on_line.add(station)
+			if previous is not None:
+				connections.append((line_name, previous, station, int(times[i - 1 if line == 0 else i])))
+				degree[previous] += 1
+				degree[station] += 1
+			previous = station
+
+	stations = [station_name(i) for i in range(len(positions))]
+	connections = [(line, stations[a], stations[b], minutes) for line, a, b, minutes in connections]
+	return stations, connections, np.array(positions)
+
+
+def generate_metro_network(num_lines, stations_per_line, seed=None, **options):
+	"""Generate a synthetic metro network as an undirected, weighted graph.
+
+	Arguments:
+	num_lines -- number of lines
+	stations_per_line -- number of stops on each line
+	seed -- seed for numpy.random.default_rng, or a numpy.random.Generator
+	options -- further keyword arguments for generate_metro_connections
+
+	Returns:
+	stations -- list of station names, so that vertex i is stations[i]
+	G -- the graph, with travel times in minutes as edge weights, built like
+	london_underground.load_london_underground builds the real one
+	"""
+	stations, connections, positions = generate_metro_connections(num_lines, stations_per_line, seed, **options)
+	index = {name: i for i, name in enumerate(stations)}
+	edges = ((index[a], index[b], minutes) for line, a, b, minutes in connections)
+	G = AdjacencyListGraph.from_edge_list(len(stations), edges, False, True, on_duplicate="min")
+	return stations, G
+
+
+def write_connections(filename, connections):
+	"""Write connections to a CSV file laid out like data.csv, so that
+	london_underground.load_london_underground can read it."""
+	with open(filename, "w", newline="", encoding="utf-8") as f:
+		writer = csv.writer(f)
+		writer.writerow(["Line", "From", "To", "Minutes"])
+		writer.writerows(connections)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import os
+	import tempfile
+	from collections import Counter
+	from time import perf_counter
+	from connected_components import connected_components
+	from london_underground import load_london_underground
+
+	def describe(stations, G):
+		degrees = [len(list(G.get_adj_list(u))) for u in range(G.get_card_V())]
+		weights = Counter(edge.get_weight() for u in range(G.get_card_V()) for edge in G.get_adj_list(u))
+		return (str(len(stations)) + " stations, " + str(G.get_card_E()) + " connections, " +
+				str(sum(d > 2 for d in degrees)) + " interchanges, max degree " + str(max(degrees)) +
+				", components " + str(connected_components(G, "array").get_count()) +
+				", minutes " + str(sorted(weights.items())[:6]))
+
+	print("London:   ", describe(*load_london_underground()))
+	print("Synthetic:", describe(*generate_metro_network(11, 30, seed=1)))
+
+	# The same seed gives the same network, which load_london_underground reads back.
+	stations, connections, positions = generate_metro_connections(11, 30, seed=1)
+	filename = os.path.join(tempfile.mkdtemp(), "metro.csv")
+	write_connections(filename, connections)
+	stations2, G2 = load_london_underground(filename)
+	stations1, G1 = generate_metro_network(11, 30, seed=1)
+	print(sorted(stations1) == stations2, G1.get_card_E() == G2.get_card_E())
+	print(len(set(station_name(i) for i in range(100000))) == 100000)
+
+	for num_lines, stations_per_line in [(100, 100), (400, 250)]:
+		start = perf_counter()
+		stations, G = generate_metro_network(num_lines, stations_per_line, seed=2)
+		print(round(perf_counter() - start, 2), "seconds:", describe(stations, G))
+
+	# A line that cannot start anywhere is an error, not an endless search.
+	try:
+		generate_metro_connections(3, 1, seed=1, max_degree=1)
+	except RuntimeError as e:
+		print(e)
@@ -30,16 +30,11 @@
 #                                                                       #
 #########################################################################
 
+from collections import deque
 from dll_sentinel import DLLSentinel
 from dfs import dfs
 
 
-def finish(u):
-	"""Prepend onto the linked list as each vertex is finished."""
-	global ordered_list
-	ordered_list.prepend(u)
-
-
 def topological_sort(G):
 	"""Topologically sort a directed acyclic graph.
 
@@ -49,14 +44,52 @@ def topological_sort(G):
 	Returns:
 	A linked list giving the topologically sorted order of the vertices.
 	"""
-	global ordered_list
 	if not G.is_directed():
 		raise RuntimeError("Graph must be directed.")
 	ordered_list = DLLSentinel()
-	dfs(G, None, None, finish)  # no start_dfs_tree or discovery_func
+	# Prepend onto the linked list as each vertex is finished.
+	dfs(G, None, None, ordered_list.prepend)  # no start_dfs_tree or discovery_func
 	return ordered_list
 
 
+def topological_order(G):
+	"""Generate the vertices of a directed acyclic graph in topologically sorted order,
+	with Kahn's algorithm.
+
+	Each vertex is yielded as soon as all the vertices with edges into it have been
+	yielded, so that a caller can start work on the first vertices before the rest
+	of the order is known, or stop early.
+
+	Input:
+	G -- a dag, represented by adjacency lists.
+
+	Yields:
+	The vertices in topologically sorted order.  Raises a RuntimeError after the
+	last vertex it can yield if G contains a cycle.
+	"""
+	if not G.is_directed():
+		raise RuntimeError("Graph must be directed.")
+	card_V = G.get_card_V()
+	in_degree = [0] * card_V
+	for u in range(card_V):
+		for edge in G.get_adj_list(u):
+			in_degree[edge.get_v()] += 1
+
+	ready = deque(u for u in range(card_V) if in_degree[u] == 0)
+	yielded = 0
+	while len(ready) > 0:
+		u = ready.popleft()
+		yield u
+		yielded += 1
+		for edge in G.get_adj_list(u):  # remove u's edges
+			v = edge.get_v()
+			in_degree[v] -= 1
+			if in_degree[v] == 0:
+				ready.append(v)
+	if yielded < card_V:
+		raise RuntimeError("Graph contains a cycle.")
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -86,6 +119,26 @@ if __name__ == "__main__":
 		print(clothing[data])
 	print()
 
+	# Kahn's algorithm gives an order in which every edge goes forward.
+	position = {u: i for i, u in enumerate(topological_order(graph2))}
+	print([clothing[u] for u in sorted(position, key=position.get)])
+	print(all(position[u] < position[v] for u, v in graph2.get_edge_list()))
+
+	# A cycle is reported after the vertices before it.
+	graph4 = AdjacencyListGraph.from_edge_list(4, [(0, 1), (1, 2), (2, 3), (3, 1)])
+	order = []
+	try:
+		for u in topological_order(graph4):
+			order.append(u)
+	except RuntimeError as e:
+		print(order, e)
+
+	# A path longer than the recursion limit.
+	n = 100000
+	path = AdjacencyListGraph.from_edge_list(n, [(i, i + 1) for i in range(n - 1)])
+	print(list(topological_sort(path).iterator()) == list(range(n)) == list(topological_order(path)))
+	print()
+
 	# Undirected. 
 	graph3 = AdjacencyListGraph(10, False)
 	graph3.insert_edge(1, 2)
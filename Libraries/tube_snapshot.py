@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# tube_snapshot.py
+
+"""Compile a tube network once into a binary snapshot, and load it back in milliseconds.
+
+compile_snapshot reads data.csv (or the .xlsx spreadsheet) with
+london_underground, builds the graph exactly as load_london_underground does,
+and writes one file holding
+
+- the station table: the names, sorted, as UTF-8 bytes with an array of offsets,
+  so that vertex i is station i,
+- the line table, stored the same way,
+- the graph in CSR form: offsets, targets, and weights, each undirected edge
+  stored in both directions with the smallest time of its connections,
+- the connection table: line, stations, and minutes of every row that gives a
+  connection, for tasks that need the lines.
+
+The file starts with the magic bytes TUBESNAP, a version number, and a JSON
+header giving the type, shape, and position of each array.  Each array starts on
+a 64-byte boundary, so that load_snapshot maps the file with numpy.memmap and
+views the arrays in place, without parsing or copying anything.  load_network
+compiles the snapshot the first time and whenever the source file is newer."""
+
+import json
+import os
+import struct
+import tempfile
+import numpy as np
+from csr_graph import CSRGraph
+from london_underground import DATA_FILE, read_connections
+from adjacency_list_graph import AdjacencyListGraph
+from station_registry import LONDON_ALIASES, StationRegistry
+
+MAGIC = b"TUBESNAP"
+VERSION = 1
+ALIGNMENT = 64
+SNAPSHOT_EXTENSION = ".tube"
+
+
+def _string_table(strings):
+	"""Return the UTF-8 bytes of strings, concatenated, and the offsets of each one."""
+	encoded = [s.encode("utf-8") for s in strings]
+	offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+	np.cumsum([len(b) for b in encoded], out=offsets[1:])
+	return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode(data, offsets, i):
+	"""Return string i of a string table."""
+	return bytes(data[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+
+def compile_snapshot(source=DATA_FILE, filename=None):
+	"""Compile the network in source into a snapshot file.
+
+	Arguments:
+	source -- data.csv, or a file in the same layout, or an .xlsx spreadsheet
+	filename -- the snapshot file to write.  Defaults to source with the extension .tube.
+
+	Returns:
+	The name of the snapshot file
+	"""
+	if filename is None:
+		filename = os.path.splitext(source)[0] + SNAPSHOT_EXTENSION
+	connections = read_connections(source)
+	stations = sorted({c[1] for c in connections} | {c[2] for c in connections})
+	lines = sorted({c[0] for c in connections})
+	station_index = {name: i for i, name in enumerate(stations)}
+	line_index = {name: i for i, name in enumerate(lines)}
+	edges = ((station_index[a], station_index[b], minutes) for line, a, b, minutes in connections if a != b)
+	csr = AdjacencyListGraph.from_edge_list(len(stations), edges, False, True, on_duplicate="min").to_csr()
+
+	station_data, station_offsets = _string_table(stations)
+	line_data, line_offsets = _string_table(lines)
+	minutes = [c[3] for c in connections]
+	arrays = {
+		"station_data": station_data, "station_offsets": station_offsets,
+		"line_data": line_data, "line_offsets": line_offsets,
+		"offsets": csr.get_offsets(), "targets": csr.get_targets(), "weights": csr.get_weights(),
+		"connection_lines": np.array([line_index[c[0]] for c in connections], dtype=np.int32),
+		"connection_stations": np.array([[station_index[c[1]], station_index[c[2]]] for c in connections],
+										dtype=np.int32).reshape(-1, 2),
+		"connection_minutes": np.array(minutes, dtype=np.int64 if all(isinstance(m, int) for m in minutes)
+									   else np.float64),
+	}
+
+	# Lay out the arrays after the header, each on a 64-byte boundary.
+	header = {"card_V": len(stations), "card_E": csr.get_card_E(), "arrays": {}}
+	position = 0
+	for name, array in arrays.items():
+		header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": position}
+		position += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+	header_bytes = json.dumps(header).encode("utf-8")
+	start = -(-(len(MAGIC) + 8 + len(header_bytes)) // ALIGNMENT) * ALIGNMENT
+
+	# Write a temporary file beside the snapshot and rename it into place, so that a
+	# process compiling the same snapshot at the same time never sees half a file.
+	descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)),
+											 suffix=SNAPSHOT_EXTENSION + ".tmp")
+	try:
+		with os.fdopen(descriptor, "wb") as f:
+			f.write(MAGIC + struct.pack("<II", VERSION, len(header_bytes)) + header_bytes)
+			for name, array in arrays.items():
+				f.seek(start + header["arrays"][name]["offset"])
+				f.write(np.ascontiguousarray(array).tobytes())
+			f.truncate(start + position)
+		# mkstemp makes the file readable by its owner only; give it the mode open would.
+		umask = os.umask(0)
+		os.umask(umask)
+		os.chmod(temporary, 0o666 & ~umask)
+		os.replace(temporary, filename)
+	except BaseException:
+		os.remove(temporary)
+		raise
+	return filename
+
+
+class TubeSnapshot:
+
+	def __init__(self, filename):
+		"""Map a snapshot file written by compile_snapshot into memory.
+
+		Arguments:
+		filename -- the snapshot file
+		"""
+		with open(filename, "rb") as f:
+			prefix = f.read(len(MAGIC) + 8)
+			if len(prefix) < len(MAGIC) + 8 or prefix[:len(MAGIC)] != MAGIC:
+				raise RuntimeError(filename + " is not a tube snapshot.")
+			version, header_length = struct.unpack("<II", prefix[len(MAGIC):])
+			if version != VERSION:
+				raise RuntimeError(filename + " is a version " + str(version) + " snapshot, not version " +
+								   str(VERSION) + ".")
+			header = json.loads(f.read(header_length).decode("utf-8"))
+		start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+		self.filename = filename
+		self.memory = np.memmap(filename, dtype=np.uint8, mode="r")
+		self.arrays = {}
+		for name, layout in header["arrays"].items():
+			dtype = np.dtype(layout["dtype"])
+			count = int(np.prod(layout["shape"]))
+			offset = start + layout["offset"]
+			self.arrays[name] = self.memory[offset:offset + count * dtype.itemsize].view(dtype).reshape(layout["shape"])
+		self.card_V = header["card_V"]
+		self.card_E = header["card_E"]
+		self.stations = None  # decoded on first use
+		self.lines = None
+
+	def get_filename(self):
+		"""Return the name of the snapshot file."""
+		return self.filename
+
+	def get_card_V(self):
+		"""Return the number of stations."""
+		return self.card_V
+
+	def get_station(self, i):
+		"""Return the name of station i."""
+		return _decode(self.arrays["station_data"], self.arrays["station_offsets"], i)
+
+	def get_stations(self):
+		"""Return the sorted list of station names, so that vertex i is stations[i]."""
+		if self.stations is None:
+			self.stations = [self.get_station(i) for i in range(self.card_V)]
+		return self.stations
+
+	def get_registry(self, aliases=LONDON_ALIASES):
+		"""Return a StationRegistry of the stations, in which station i has id i, with
+		the given aliases for names in the snapshot.  Aliases of other names are left out."""
+		stations = self.get_stations()
+		registry = StationRegistry(stations)
+		names = set(stations)
+		for alias, name in aliases.items():
+			if name in names:
+				registry.add_alias(alias, name)
+		return registry
+
+	def get_lines(self):
+		"""Return the sorted list of line names."""
+		if self.lines is None:
+			offsets = self.arrays["line_offsets"]
+			self.lines = [_decode(self.arrays["line_data"], offsets, i) for i in range(len(offsets) - 1)]
+		return self.lines
+
+	def get_csr(self):
+		"""Return the undirected, weighted graph as a CSRGraph over the mapped arrays."""
+		return CSRGraph(self.card_V, self.arrays["offsets"], self.arrays["targets"], self.arrays["weights"],
+						False, self.card_E)
+
+	def get_graph(self):
+		"""Return the graph as an AdjacencyListGraph, which algorithms may modify."""
+		return self.get_csr().to_adjacency_list_graph()
+
+	def get_connections(self):
+		"""Return the list of (line, station1, station2, minutes) tuples, as
+		london_underground.read_connections returns."""
+		stations, lines = self.get_stations(), self.get_lines()
+		return [(lines[line], stations[a], stations[b], minutes)
+				for line, (a, b), minutes in zip(self.arrays["connection_lines"].tolist(),
+												 self.arrays["connection_stations"].tolist(),
+												 self.arrays["connection_minutes"].tolist())]
+
+
+def load_snapshot(filename):
+	"""Return the TubeSnapshot in filename."""
+	return TubeSnapshot(filename)
+
+
+def load_network(source=DATA_FILE, filename=None):
+	"""Return the TubeSnapshot of source, compiling it first if the snapshot file is
+	missing, older than source, or from another version.
+
+	Arguments:
+	source -- data.csv, or a file in the same layout, or an .xlsx spreadsheet
+	filename -- the snapshot file.  Defaults to source with the extension .tube.
+	"""
+	if filename is None:
+		filename = os.path.splitext(source)[0] + SNAPSHOT_EXTENSION
+	if os.path.exists(filename) and os.path.getmtime(filename) >= os.path.getmtime(source):
+		try:
+			return load_snapshot(filename)
+		except RuntimeError:
+			pass  # not a snapshot of this version: compile it again
+	return load_snapshot(compile_snapshot(source, filename))
+
+
+# Testing
+if __name__ == "__main__":
+
+	from time import perf_counter
+	from dijkstra import dijkstra
+	from london_underground import load_london_underground
+	from synthetic_metro import generate_metro_connections, write_connections
+
+	directory = tempfile.mkdtemp()
+	filename = os.path.join(directory, "data.tube")
+
+	start = perf_counter()
+	compile_snapshot(DATA_FILE, filename)
+	print("Compiled in", round((perf_counter() - start) * 1000, 2), "ms,", os.path.getsize(filename), "bytes, mode",
+		  oct(os.stat(filename).st_mode & 0o777))
+	start = perf_counter()
+	snapshot = load_network(DATA_FILE, filename)
+	load_time = perf_counter() - start
+	start = perf_counter()
+	load_london_underground()
+	print("Loaded in", round(load_time * 1000, 2), "ms; parsing data.csv takes",
+		  round((perf_counter() - start) * 1000, 2), "ms")
+
+	# The snapshot holds the same network as load_london_underground.
+	stations, G = load_london_underground()
+	H = snapshot.get_graph()
+	print(snapshot.get_stations() == stations, H.get_card_E() == G.get_card_E(),
+		  all(sorted(str(e) for e in H.get_adj_list(u)) == sorted(str(e) for e in G.get_adj_list(u))
+			  for u in range(G.get_card_V())))
+	print(sorted(snapshot.get_connections()) == sorted(read_connections()), snapshot.get_lines())
+	s, t = stations.index("Wimbledon"), stations.index("Stratford")
+	print(dijkstra(snapshot.get_csr(), s, t)[0][t] == dijkstra(G, s, t)[0][t])
+
+	# A snapshot that is not one is rejected.
+	with open(os.path.join(directory, "bad.tube"), "wb") as f:
+		f.write(b"not a snapshot")
+	try:
+		load_snapshot(os.path.join(directory, "bad.tube"))
+	except RuntimeError as e:
+		print(e)
+
+	# A large synthetic network.
+	stations, connections, positions = generate_metro_connections(200, 500, seed=1)
+	source = os.path.join(directory, "metro.csv")
+	write_connections(source, connections)
+	start = perf_counter()
+	large = load_network(source)
+	print("Compiled", large.get_card_V(), "stations in", round(perf_counter() - start, 2), "s")
+	start = perf_counter()
+	large = load_network(source)
+	csr = large.get_csr()
+	print("Loaded in", round((perf_counter() - start) * 1000, 2), "ms:", csr.get_card_V(), "stations,",
+		  csr.get_card_E(), "connections;", large.get_station(12345))
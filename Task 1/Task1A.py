@@ -1,6 +1,5 @@
 import sys
 import os
-import pandas as pd
 
 # Path for the Libraries folder
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -11,6 +10,8 @@ sys.path.insert(0, libraries_path)
 # Import Algorithms (CLRS Library)
 from chained_hashtable import ChainedHashTable
 from dll_sentinel import DLLSentinel
+from tube_snapshot import load_network
+from fuzzy_station_index import FuzzyStationIndex
 
 # 1. SMALL ARTIFICIAL DATASET (5 STATIONS)
 print("Simple Dataset Example (A–E)")
@@ -28,34 +29,24 @@ print(f"\nStatus check for '{query_station}': {status}")
 
 # 2. USING REAL LONDON UNDERGROUND DATA
 print("\nUsing London Underground Data.xlsx")
-# Load Excel file
-import os
-base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-file_path = os.path.join(base_dir, "data.csv")
-df = pd.read_csv(file_path)
-
-# Automatically pick the first text-like column
-station_col = None
-for col in df.columns:
-    if df[col].dtype == object:
-        station_col = col
-        break
-
-# Extract unique station names, clean formatting
-stations = df[station_col].astype(str).str.strip().dropna().unique().tolist()
-stations = [s for s in stations if s and not s.lower().startswith('nan')]
+# Load the compiled network snapshot (compiled from data.csv on first use)
+network = load_network()
+stations = network.get_stations()
 
 print(f"Total stations loaded: {len(stations)}")
 
-# Build hashtable with all station names (lowercased for uniformity)
-ht_london = ChainedHashTable(len(stations) * 2)
-for s in stations:
-    ht_london.insert(s.lower())
+# Fuzzy index over every station name and alias. Its fast path is a ChainedHashTable
+# keyed by the registry's lookup key, which ignores case, punctuation, and spacing
+fuzzy = FuzzyStationIndex(network.get_registry())
 
 # Perform example queries
-queries = ['Victoria', 'Paddinton', 'NotARealStation']
+queries = ['Victoria', 'kings cross st pancras', "King's Cross", 'Paddinton', 'NotARealStation']
 for q in queries:
-    result = "Operational" if ht_london.search(q.lower()) else "Not Found"
+    result = "Operational" if fuzzy.search_exact(q) is not None else "Not Found"
+    if result == "Not Found":
+        suggestions = [name for name, _, _ in fuzzy.search(q, k=3, max_distance=2)]
+        if suggestions:
+            result += f" (did you mean: {', '.join(suggestions)}?)"
     print(f"Query: '{q}' → {result}")
 
 print("\n=== End of Task 1(a) ===")
\ No newline at end of file
@@ -1,6 +1,5 @@
 import sys
 import os
-import pandas as pd
 import random
 import time
 import matplotlib.pyplot as plt
@@ -14,6 +13,7 @@ sys.path.insert(0, libraries_path)
 
 from chained_hashtable import ChainedHashTable
 from dll_sentinel import DLLSentinel
+from tube_snapshot import load_network
 
 # 1. EMPIRICAL PERFORMANCE MEASUREMENT
 
@@ -67,20 +67,8 @@ print(f"\nPerformance plot saved to: {plot_path}")
 
 print("\nApplication with London Underground Data")
 
-# Load CSV or Excel file
-data_path = os.path.join(base_dir, "data.csv")
-df = pd.read_csv(data_path)
-
-# Automatically detect first string-type column
-station_col = None
-for col in df.columns:
-    if df[col].dtype == object:
-        station_col = col
-        break
-
-# Extract & clean station names
-stations = df[station_col].astype(str).str.strip().dropna().unique().tolist()
-stations = [s for s in stations if s and not s.lower().startswith('nan')]
+# Load the compiled network snapshot (compiled from data.csv on first use)
+stations = load_network().get_stations()
 print(f"Total stations loaded: {len(stations)}")
 
 # Build Hash Table with all station names (lowercase for consistency)
@@ -2,9 +2,11 @@ import os, sys
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 libraries_path = os.path.join(base_dir, "Libraries", "clrsPython")
 sys.path.insert(0, libraries_path)
+sys.path.append(os.path.join(base_dir, "Libraries"))  # for the station registry
 # Import Algorithm (CLRS)
 from adjacency_list_graph import AdjacencyListGraph
 from bfs import bfs
+from station_registry import StationRegistry
 
 # Simple Dataset (5 Stations)
 graph_dict = {
@@ -15,14 +17,8 @@ graph_dict = {
     'E': ['D']            # E connects to D
 }
 
-# List of station names
-stations = list(graph_dict.keys())
-
-# Map station names → numeric node IDs for the CLRS library
-name_to_id = {name: idx for idx, name in enumerate(stations)}
-
-# Reverse map: node IDs → station names
-id_to_name = {idx: name for name, idx in name_to_id.items()}
+# Shared mapping between station names and numeric node IDs for the CLRS library
+registry = StationRegistry(graph_dict.keys())
 
 # Build CLRS Graph (undirected)
 def build_clrs_graph(graph_dict):
@@ -31,9 +27,8 @@ def build_clrs_graph(graph_dict):
 
     # Add edges to the CLRS graph
     for u in graph_dict:
-        u_id = name_to_id[u]
-        for v in graph_dict[u]:
-            v_id = name_to_id[v]
+        u_id = registry.get_id(u)
+        for v_id in registry.get_ids(graph_dict[u]):
 
             # Insert the edge if it is not already present
             if not G.has_edge(u_id, v_id):
@@ -48,8 +43,7 @@ def fewest_stops_path_clrs(graph_dict, start, goal):
     G = build_clrs_graph(graph_dict)
 
     # Convert names → integer IDs
-    start_id = name_to_id[start]
-    goal_id = name_to_id[goal]
+    start_id, goal_id = registry.get_ids([start, goal])
 
     # Run CLRS BFS (returns: dist[], pi[])
     # dist[i] = shortest distance (#edges) from start
@@ -68,7 +62,7 @@ def fewest_stops_path_clrs(graph_dict, start, goal):
         return None, None
 
     # Convert numeric node IDs → station names
-    path_names = [id_to_name[i] for i in path_ids]
+    path_names = [registry.get_name(i) for i in path_ids]
 
     # Number of stops = number of edges = path length - 1
     return path_names, len(path_ids) - 1
@@ -1,27 +1,26 @@
 import os, sys, random, time
-import pandas as pd
 import matplotlib.pyplot as plt
-from collections import defaultdict
 
 # IMPORT CLRS LIBRARY
 base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # Path to the local CLRS Python implementation
-libraries_path = os.path.join(base_dir, "Libraries", "clrsPython")
+libraries_path = os.path.join(base_dir, "Libraries")
 # Add CLRS library path to Python import system
 sys.path.insert(0, libraries_path)
-# Import CLRS-style graph + BFS implementation
+# Import CLRS-style graph + CSR BFS implementation
 from adjacency_list_graph import AdjacencyListGraph
-from bfs import bfs
+from direction_optimizing_bfs import fewest_stops_path
+from tube_snapshot import load_network
+from station_registry import StationRegistry
 
 # BUILDING CLRS GRAPH FROM ADJACENCY DICTIONARY
-def build_clrs_graph_from_dict(graph_dict, name_to_id):
-    n = len(name_to_id)
+def build_clrs_graph_from_dict(graph_dict, registry):
+    n = len(registry)
     G = AdjacencyListGraph(n, directed=False, weighted=False)
 
     for u in graph_dict:
-        u_id = name_to_id[u]
-        for v in graph_dict[u]:
-            v_id = name_to_id[v]
+        u_id = registry.get_id(u)
+        for v_id in registry.get_ids(graph_dict[u]):
 
             # Skip invalid self-loop (CLRS graph does not support)
             if u_id == v_id:
@@ -34,35 +33,19 @@ def build_clrs_graph_from_dict(graph_dict, name_to_id):
     return G
 
 
-def fewest_stops_path_clrs(graph_dict, start, goal):
-    # Create consistent integer ID mapping
-    stations = list(graph_dict.keys())
-    name_to_id = {name: idx for idx, name in enumerate(stations)}
-    id_to_name = {idx: name for name, idx in name_to_id.items()}
+def fewest_stops_journey(G, registry, start, goal):
+    # Lookup integer IDs in the shared station registry
+    start_id, goal_id = registry.get_ids([start, goal])
 
-    # Build CLRS graph
-    G = build_clrs_graph_from_dict(graph_dict, name_to_id)
+    # Direction-optimizing BFS over the CSR graph, stopping once goal is reached
+    path_ids = fewest_stops_path(G, start_id, goal_id)
 
-    # Lookup integer IDs
-    start_id = name_to_id[start]
-    goal_id = name_to_id[goal]
-
-    # BFS returns (dist[], pi[])
-    dist, pi = bfs(G, start_id)
-
-    # Reconstruct path from goal → root using predecessor list
-    path_ids = []
-    current = goal_id
-    while current is not None:
-        path_ids.insert(0, current)
-        current = pi[current]
-
-    # If root is not the start node → unreachable
-    if path_ids[0] != start_id:
+    # No path → unreachable
+    if path_ids is None:
         return None, None
 
     # Convert integer nodes → station names
-    path_names = [id_to_name[i] for i in path_ids]
+    path_names = [registry.get_name(i) for i in path_ids]
     stops = len(path_ids) - 1
 
     return path_names, stops
@@ -94,8 +77,11 @@ for n in sizes:
     # Create random synthetic network
     graph_dict = generate_artificial_graph_dict(n)
 
-    # Convert integer nodes → strings (because fewest_stops_path_clrs expects names)
+    # Convert integer nodes → strings (because fewest_stops_journey expects names),
+    # and build the registry and CSR graph once for all pairs
     graph_dict_named = {str(k): [str(v) for v in graph_dict[k]] for k in graph_dict}
+    registry = StationRegistry(graph_dict_named)
+    G = build_clrs_graph_from_dict(graph_dict_named, registry).to_csr()
 
     # Generate 10 random (start, goal) pairs to average runtime
     pairs = [(str(random.randint(0, n - 1)),
@@ -105,7 +91,7 @@ for n in sizes:
     total = 0
     for s, g in pairs:
         start_t = time.time()
-        fewest_stops_path_clrs(graph_dict_named, s, g)
+        fewest_stops_journey(G, registry, s, g)
         total += time.time() - start_t
 
     # Average BFS runtime for this graph size
@@ -126,48 +112,24 @@ plt.show()
 # PART 2 — APPLICATION WITH REAL LONDON UNDERGROUND DATA
 print("\n=== Application with London Underground Data ===")
 
-# Load data.csv (should contain: line, station1, station2)
-data_path = os.path.join(base_dir, "data.csv")
-df = pd.read_csv(data_path)
-
-# graph_real is adjacency list of station → connected stations
-graph_real = defaultdict(list)
-
-# Build the network by parsing each row
-for _, row in df.iterrows():
-
-    # Extract line and station names reliably using positional indexing
-    line = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else ""
-    station1 = str(row.iloc[1]).strip() if pd.notna(row.iloc[1]) else ""
-    station2 = str(row.iloc[2]).strip() if pd.notna(row.iloc[2]) else ""
-
-    # Ensure valid station names (avoid NaNs, blanks, and self-loops)
-    if (station1 and station2 and
-            station1.lower() != "nan" and station2.lower() != "nan" and
-            station1 != station2):
-
-        # Add undirected edge: station1 ↔ station2
-        if station2 not in graph_real[station1]:
-            graph_real[station1].append(station2)
-        if station1 not in graph_real[station2]:
-            graph_real[station2].append(station1)
-
-# Remove empty stations and malformed nodes
-graph_real = {k: v for k, v in graph_real.items() if k and v}
+# Load the compiled network snapshot (compiled from data.csv on first use)
+network = load_network()
+registry = network.get_registry()  # shared station name <-> id mapping
+csr = network.get_csr()
 
-print(f"Processed {len(graph_real)} stations")
-print(f"Sample stations: {list(graph_real.keys())[:10]}")
+print(f"Processed {len(registry)} stations")
+print(f"Sample stations: {registry.get_names()[:10]}")
 
 # EXAMPLE JOURNEYS
 
 # Example 1 — Very close stations
-p1, s1 = fewest_stops_path_clrs(graph_real, "Covent Garden", "Leicester Square")
+p1, s1 = fewest_stops_journey(csr, registry, "Covent Garden", "Leicester Square")
 print("\nJourney 1: Covent Garden → Leicester Square")
 print("Path:", p1)
 print("Stops:", s1)
 
 # Example 2 — Long-distance journey across network
-p2, s2 = fewest_stops_path_clrs(graph_real, "Wimbledon", "Stratford")
+p2, s2 = fewest_stops_journey(csr, registry, "Wimbledon", "Stratford")
 print("\nJourney 2: Wimbledon → Stratford")
 print("Path:", p2)
 print("Stops:", s2)
\ No newline at end of file
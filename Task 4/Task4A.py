@@ -9,9 +9,11 @@ sys.path.insert(0, libraries_path)
 # Import CLRS MST functions
 from mst import kruskal, get_total_weight, print_undirected_edges
 from adjacency_list_graph import AdjacencyListGraph
+from station_registry import StationRegistry
 
 # Simple dataset: 5 stations with weighted connections
 stations = ['A', 'B', 'C', 'D', 'E']
+registry = StationRegistry(stations)  # shared station name <-> id mapping
 edges = [
     ('A', 'B', 4),
     ('A', 'C', 2),
@@ -23,13 +25,13 @@ edges = [
 ]
 
 # Build undirected weighted graph
-G = AdjacencyListGraph(len(stations), False, True)
+G = AdjacencyListGraph(len(registry), False, True)
 for u, v, w in edges:
-    G.insert_edge(stations.index(u), stations.index(v), w)
+    G.insert_edge(*registry.get_ids([u, v]), w)
 
 # Display original network
 print("Original network:")
-print(G.strmap(lambda i: stations[i]))
+print(G.strmap(registry.get_name))
 print()
 
 # Apply Kruskal's algorithm to find MST
@@ -37,7 +39,7 @@ mst_graph = kruskal(G)
 
 # Display MST (core backbone)
 print("Core Network Backbone (Minimum Spanning Tree via Kruskal):")
-print_undirected_edges(mst_graph, stations)
+print_undirected_edges(mst_graph, registry.get_names())
 
 # Calculate total weight
 total_weight = get_total_weight(mst_graph)
@@ -1,4 +1,3 @@
-import pandas as pd
 import time
 import matplotlib.pyplot as plt
 import os
@@ -11,8 +10,10 @@ sys.path.insert(0, libraries_path)
 
 # Import CLRS functions
 from generate_random_graph import generate_random_graph
-from mst import kruskal, get_total_weight, print_undirected_edges
+from mst import fast_kruskal, get_total_weight, print_undirected_edges
 from adjacency_list_graph import AdjacencyListGraph
+from tube_snapshot import load_network
+from closure_evaluator import evaluate_closures
 
 # PART 1: EMPIRICAL PERFORMANCE MEASUREMENT
 def measure_mst_times():
@@ -29,7 +30,7 @@ def measure_mst_times():
         total_time = 0
         for _ in range(runs):
             start = time.perf_counter()
-            kruskal(G)
+            fast_kruskal(G)
             end = time.perf_counter()
             total_time += (end - start)
 
@@ -57,71 +58,61 @@ def plot_results(sizes, avg_times):
     plt.show()
 
 
-# Run empirical tests
+# Run empirical tests, then the London Underground parts
 if __name__ == "__main__":
+    # PART 1
     sizes, avg_times = measure_mst_times()
     plot_results(sizes, avg_times)
 
-# PART 2: APPLICATION WITH LONDON UNDERGROUND DATA
-# Load London Underground data
-FILEPATH = os.path.join(base_dir, "data.csv")
-df = pd.read_csv(FILEPATH, header=None, skiprows=1, usecols=[1, 2, 3])
-df.columns = ["StationA", "StationB", "Time"]
-
-# Clean data: remove NaN, strip whitespace
-df = df.dropna(subset=["StationA", "StationB", "Time"])
-df["StationA"] = df["StationA"].astype(str).str.strip()
-df["StationB"] = df["StationB"].astype(str).str.strip()
-df["Time"] = pd.to_numeric(df["Time"], errors="coerce")
-df = df[df["Time"].notna()]
-
-# Simplify: keep only minimum time for duplicate connections
-edge_map = {}
-for a, b, w in zip(df["StationA"], df["StationB"], df["Time"]):
-    key = (a, b) if a <= b else (b, a)  # Normalize edge order
-    w = float(w)
-    if key not in edge_map or w < edge_map[key]:
-        edge_map[key] = w
-
-edges = [(a, b, w) for (a, b), w in edge_map.items()]
-
-# Build graph with all unique stations
-stations = sorted({u for u, v, _ in edges} | {v for u, v, _ in edges})
-idx = {name: i for i, name in enumerate(stations)}  # Map station name to index
-
-G = AdjacencyListGraph(len(stations), False, True)
-for u_name, v_name, w in edges:
-    u, v = idx[u_name], idx[v_name]
-    if u != v:  # Skip self-loops
-        G.insert_edge(u, v, float(w))
-
-# Compute MST using Kruskal's algorithm
-mst_graph = kruskal(G)
-
-# Display MST results
-print("Core Network Backbone (Minimum Spanning Tree via Kruskal):")
-print_undirected_edges(mst_graph, stations)
-
-total_weight = get_total_weight(mst_graph)
-print(f"\nTotal journey time of core network backbone = {total_weight} minutes")
-
-# IDENTIFY REDUNDANT (CLOSABLE) CONNECTIONS
-
-# Original edges (all connections)
-orig_edges = {(min(idx[a], idx[b]), max(idx[a], idx[b])) for a, b, _ in edges}
-
-# MST edges (essential connections)
-mst_edges = set()
-for u in range(mst_graph.get_card_V()):
-    for e in mst_graph.get_adj_list(u):
-        v = e.get_v()
-        if u < v:  # Only count each edge once (undirected)
-            mst_edges.add((u, v))
-
-# Closable edges = original - MST
-closable_edges = orig_edges - mst_edges
-
-print(f'\nnumber of closables edges: {len(closable_edges)} Examples:', end='')
-for (u, v) in list(closable_edges)[:10]:
-    print(f"({stations[u]} - {stations[v]})", end=',')
-print()
\ No newline at end of file
+    # PART 2: APPLICATION WITH LONDON UNDERGROUND DATA
+    # Load London Underground data
+    # Compiled network snapshot (compiled from data.csv on first use): duplicate
+    # connections keep their minimum time, and self-loops are skipped
+    network = load_network()
+    stations = network.get_stations()
+    G = network.get_graph()
+
+    # Compute MST using Kruskal's algorithm
+    mst_graph = fast_kruskal(G)
+
+    # Display MST results
+    print("Core Network Backbone (Minimum Spanning Tree via Kruskal):")
+    print_undirected_edges(mst_graph, stations)
+
+    total_weight = get_total_weight(mst_graph)
+    print(f"\nTotal journey time of core network backbone = {total_weight} minutes")
+
+    # IDENTIFY REDUNDANT (CLOSABLE) CONNECTIONS
+
+    # Original edges (all connections)
+    orig_edges = set(G.get_edge_list())
+
+    # MST edges (essential connections)
+    mst_edges = set()
+    for u in range(mst_graph.get_card_V()):
+        for e in mst_graph.get_adj_list(u):
+            v = e.get_v()
+            if u < v:  # Only count each edge once (undirected)
+                mst_edges.add((u, v))
+
+    # Closable edges = original - MST
+    closable_edges = orig_edges - mst_edges
+
+    print(f'\nnumber of closables edges: {len(closable_edges)} Examples:', end='')
+    for (u, v) in list(closable_edges)[:10]:
+        print(f"({stations[u]} - {stations[v]})", end=',')
+    print()
+
+    # PART 3: IMPACT OF EACH CLOSABLE CONNECTION ON JOURNEY TIMES
+    # Evaluated on one worker process per available CPU, which map the graph from the
+    # snapshot file; results are printed as they finish.
+    print("\nImpact of closing each closable connection:")
+    impacts = []
+    for result in evaluate_closures(network, sorted(closable_edges), processes=None):
+        u, v = result["edge"]
+        impacts.append(result)
+        print(f"({stations[u]} - {stations[v]}): mean increase {result['mean_increase']:.4f} min, "
+              f"max increase {result['max_increase']} min, {result['disconnected_pairs']} disconnected pairs")
+
+    worst = max(impacts, key=lambda r: r["mean_increase"])
+    print(f"\nMost disruptive closable connection: ({stations[worst['edge'][0]]} - {stations[worst['edge'][1]]})")